@@ -240,6 +240,7 @@ setup(
 
         "test": [
             "pytest>=3.6.0,!=3.9.0,!=3.9.1,!=3.9.2",
+            "pytest-benchmark",
             "pretend",
             "iso8601",
             "pytz",
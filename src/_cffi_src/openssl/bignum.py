@@ -5,6 +5,7 @@
 from __future__ import absolute_import, division, print_function
 
 INCLUDES = """
+#include <limits.h>
 #include <openssl/bn.h>
 """
 
@@ -79,7 +80,39 @@ int BN_generate_prime_ex(BIGNUM *, int, int, const BIGNUM *,
                          const BIGNUM *, BN_GENCB *);
 int BN_is_prime_ex(const BIGNUM *, int, BN_CTX *, BN_GENCB *);
 const int BN_prime_checks_for_size(int);
+
+int Cryptography_BN_bin2bn_many(const unsigned char *, const size_t *,
+                                size_t, BIGNUM **);
 """
 
 CUSTOMIZATIONS = """
+/* Converts count big-endian integers, stored one after another in data, to
+   new BIGNUMs. On failure nothing is left allocated. */
+int Cryptography_BN_bin2bn_many(const unsigned char *data,
+                                const size_t *lens, size_t count,
+                                BIGNUM **out) {
+    size_t i;
+
+    for (i = 0; i < count; i++) {
+        out[i] = NULL;
+        if (lens[i] > INT_MAX) {
+            break;
+        }
+        out[i] = BN_bin2bn(data, (int)lens[i], NULL);
+        if (out[i] == NULL) {
+            break;
+        }
+        data += lens[i];
+    }
+    if (i == count) {
+        return 1;
+    }
+
+    while (i > 0) {
+        i--;
+        BN_clear_free(out[i]);
+        out[i] = NULL;
+    }
+    return 0;
+}
 """
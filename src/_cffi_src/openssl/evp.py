@@ -58,6 +58,8 @@ int EVP_DigestInit_ex(EVP_MD_CTX *, const EVP_MD *, ENGINE *);
 int EVP_DigestUpdate(EVP_MD_CTX *, const void *, size_t);
 int EVP_DigestFinal_ex(EVP_MD_CTX *, unsigned char *, unsigned int *);
 int EVP_DigestFinalXOF(EVP_MD_CTX *, unsigned char *, size_t);
+int EVP_Digest(const void *, size_t, unsigned char *, unsigned int *,
+               const EVP_MD *, ENGINE *);
 const EVP_MD *EVP_get_digestbyname(const char *);
 
 EVP_PKEY *EVP_PKEY_new(void);
@@ -127,6 +129,53 @@ int Cryptography_EVP_PKEY_id(const EVP_PKEY *);
    without worrying about what OpenSSL we're running against. */
 EVP_MD_CTX *Cryptography_EVP_MD_CTX_new(void);
 void Cryptography_EVP_MD_CTX_free(EVP_MD_CTX *);
+
+/* Seal or open a batch of messages with one keyed AEAD context, so that
+   callers don't pay the Python/cffi call overhead for each message. */
+int Cryptography_EVP_AEAD_encrypt_batch(EVP_CIPHER_CTX *, int,
+                                        const unsigned char *, int,
+                                        const unsigned char *, const int *,
+                                        const unsigned char *, const int *,
+                                        int, unsigned char *);
+int Cryptography_EVP_AEAD_decrypt_batch(EVP_CIPHER_CTX *, int,
+                                        const unsigned char *, int,
+                                        const unsigned char *, const int *,
+                                        const unsigned char *, const int *,
+                                        int, unsigned char *, int *);
+/* Encrypt or decrypt consecutive XTS data units with one keyed context,
+   re-initialising it with the next tweak for every unit. */
+int Cryptography_EVP_Cipher_xts_units(EVP_CIPHER_CTX *, const unsigned char *,
+                                      int, const unsigned char *, size_t,
+                                      unsigned char *);
+/* Hash a batch of concatenated messages, writing the digests one after
+   another. */
+int Cryptography_EVP_Digest_batch(const EVP_MD *, int, const unsigned char *,
+                                  const size_t *, unsigned char *,
+                                  unsigned int);
+/* Digest count blocks, each a copy of the template context followed by a
+   big-endian 32-bit counter starting at 1 and then the suffix, writing the
+   digests one after another. The template is left untouched. */
+int Cryptography_EVP_MD_counter_digest(EVP_MD_CTX *, const unsigned char *,
+                                       size_t, uint32_t, unsigned char *,
+                                       unsigned int);
+/* Sign or verify with a copy of a configured context, leaving the original
+   untouched so that it can be shared between threads. */
+int Cryptography_EVP_PKEY_sign_dup(EVP_PKEY_CTX *, unsigned char *, size_t *,
+                                   const unsigned char *, size_t);
+int Cryptography_EVP_PKEY_verify_dup(EVP_PKEY_CTX *, const unsigned char *,
+                                     size_t, const unsigned char *, size_t);
+/* Verify a batch of concatenated signatures against concatenated digests,
+   each with a copy of a configured context, setting results[i] to 1 for
+   every valid signature and 0 otherwise. */
+int Cryptography_EVP_PKEY_verify_batch(EVP_PKEY_CTX *, int,
+                                       const unsigned char *, const size_t *,
+                                       const unsigned char *, const size_t *,
+                                       unsigned char *);
+/* The same for one-shot EVP_DigestVerify with a key such as Ed25519. */
+int Cryptography_EVP_DigestVerify_batch(EVP_PKEY *, int,
+                                        const unsigned char *, const size_t *,
+                                        const unsigned char *, const size_t *,
+                                        unsigned char *);
 /* Added in 1.1.1 */
 int EVP_DigestSign(EVP_MD_CTX *, unsigned char *, size_t *,
                    const unsigned char *, size_t);
@@ -275,4 +324,259 @@ static const long Cryptography_HAS_EVP_DIGESTFINAL_XOF = 1;
 #ifndef EVP_PKEY_POLY1305
 #define EVP_PKEY_POLY1305 NID_poly1305
 #endif
+
+/* The nonces are concatenated (each nonce_len bytes long), as are the
+   messages and the associated data, with their lengths in the matching
+   arrays. The output for each message (ciphertext followed by the tag) is
+   written straight after the output for the previous one. Returns 1 on
+   success and 0 if any OpenSSL call failed. */
+int Cryptography_EVP_AEAD_encrypt_batch(EVP_CIPHER_CTX *ctx, int count,
+                                        const unsigned char *nonces,
+                                        int nonce_len,
+                                        const unsigned char *data,
+                                        const int *data_lens,
+                                        const unsigned char *aad,
+                                        const int *aad_lens,
+                                        int tag_len, unsigned char *out) {
+    int i, outlen;
+
+    for (i = 0; i < count; i++) {
+        if (EVP_CipherInit_ex(ctx, NULL, NULL, NULL, nonces, 1) != 1 ||
+            EVP_CipherUpdate(ctx, NULL, &outlen, aad, aad_lens[i]) != 1 ||
+            EVP_CipherUpdate(ctx, out, &outlen, data, data_lens[i]) != 1 ||
+            outlen != data_lens[i] ||
+            EVP_CipherFinal_ex(ctx, NULL, &outlen) != 1 ||
+            EVP_CIPHER_CTX_ctrl(ctx, EVP_CTRL_AEAD_GET_TAG, tag_len,
+                                out + data_lens[i]) != 1) {
+            return 0;
+        }
+        nonces += nonce_len;
+        aad += aad_lens[i];
+        data += data_lens[i];
+        out += data_lens[i] + tag_len;
+    }
+    return 1;
+}
+
+/* As above, but each entry in data is a ciphertext followed by its tag and
+   only the plaintext is written to out. ok[i] is set to 1 if message i was
+   authentic and 0 otherwise, in which case its plaintext is zeroed. Returns
+   the number of authentic messages. */
+int Cryptography_EVP_AEAD_decrypt_batch(EVP_CIPHER_CTX *ctx, int count,
+                                        const unsigned char *nonces,
+                                        int nonce_len,
+                                        const unsigned char *data,
+                                        const int *data_lens,
+                                        const unsigned char *aad,
+                                        const int *aad_lens,
+                                        int tag_len, unsigned char *out,
+                                        int *ok) {
+    int i, outlen, ct_len, authentic = 0;
+
+    for (i = 0; i < count; i++) {
+        ct_len = data_lens[i] - tag_len;
+        ok[i] = (
+            ct_len >= 0 &&
+            EVP_CIPHER_CTX_ctrl(ctx, EVP_CTRL_AEAD_SET_TAG, tag_len,
+                                (unsigned char *)data + ct_len) == 1 &&
+            EVP_CipherInit_ex(ctx, NULL, NULL, NULL, nonces, 0) == 1 &&
+            EVP_CipherUpdate(ctx, NULL, &outlen, aad, aad_lens[i]) == 1 &&
+            EVP_CipherUpdate(ctx, out, &outlen, data, ct_len) == 1 &&
+            EVP_CipherFinal_ex(ctx, NULL, &outlen) == 1
+        );
+        if (ct_len < 0) {
+            ct_len = 0;
+        }
+        if (ok[i]) {
+            authentic++;
+        } else {
+            memset(out, 0, ct_len);
+        }
+        nonces += nonce_len;
+        aad += aad_lens[i];
+        data += data_lens[i];
+        out += ct_len;
+    }
+    return authentic;
+}
+
+/* The data is split into units of unit_size bytes (the last one may be
+   shorter). The first unit uses tweak and each following unit the previous
+   tweak plus one, read as a little-endian 128-bit integer as in IEEE 1619.
+   Returns 1 on success and 0 if any OpenSSL call failed. */
+int Cryptography_EVP_Cipher_xts_units(EVP_CIPHER_CTX *ctx,
+                                      const unsigned char *tweak,
+                                      int unit_size, const unsigned char *in,
+                                      size_t len, unsigned char *out) {
+    unsigned char iv[16];
+    int i, n, outlen;
+
+    memcpy(iv, tweak, sizeof(iv));
+    while (len > 0) {
+        n = len < (size_t)unit_size ? (int)len : unit_size;
+        if (EVP_CipherInit_ex(ctx, NULL, NULL, NULL, iv, -1) != 1 ||
+            EVP_CipherUpdate(ctx, out, &outlen, in, n) != 1 ||
+            outlen != n) {
+            return 0;
+        }
+        in += n;
+        out += n;
+        len -= n;
+        for (i = 0; i < (int)sizeof(iv); i++) {
+            if (++iv[i] != 0) {
+                break;
+            }
+        }
+    }
+    return 1;
+}
+
+int Cryptography_EVP_Digest_batch(const EVP_MD *md, int count,
+                                  const unsigned char *data,
+                                  const size_t *data_lens,
+                                  unsigned char *out, unsigned int md_size) {
+    EVP_MD_CTX *ctx = Cryptography_EVP_MD_CTX_new();
+    unsigned int outlen;
+    int i, ok = 1;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    for (i = 0; i < count; i++) {
+        if (EVP_DigestInit_ex(ctx, md, NULL) != 1 ||
+            EVP_DigestUpdate(ctx, data, data_lens[i]) != 1 ||
+            EVP_DigestFinal_ex(ctx, out, &outlen) != 1 ||
+            outlen != md_size) {
+            ok = 0;
+            break;
+        }
+        data += data_lens[i];
+        out += md_size;
+    }
+    Cryptography_EVP_MD_CTX_free(ctx);
+    return ok;
+}
+
+int Cryptography_EVP_MD_counter_digest(EVP_MD_CTX *template,
+                                       const unsigned char *suffix,
+                                       size_t suffix_len, uint32_t count,
+                                       unsigned char *out,
+                                       unsigned int md_size) {
+    EVP_MD_CTX *ctx = Cryptography_EVP_MD_CTX_new();
+    unsigned char counter[4];
+    unsigned int outlen;
+    uint32_t i, n;
+    int ok = 1;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    for (i = 0; i < count; i++) {
+        n = i + 1;
+        counter[0] = (unsigned char)(n >> 24);
+        counter[1] = (unsigned char)(n >> 16);
+        counter[2] = (unsigned char)(n >> 8);
+        counter[3] = (unsigned char)n;
+        if (EVP_MD_CTX_copy_ex(ctx, template) != 1 ||
+            EVP_DigestUpdate(ctx, counter, sizeof(counter)) != 1 ||
+            EVP_DigestUpdate(ctx, suffix, suffix_len) != 1 ||
+            EVP_DigestFinal_ex(ctx, out, &outlen) != 1 ||
+            outlen != md_size) {
+            ok = 0;
+            break;
+        }
+        out += md_size;
+    }
+    Cryptography_EVP_MD_CTX_free(ctx);
+    return ok;
+}
+
+int Cryptography_EVP_PKEY_sign_dup(EVP_PKEY_CTX *template, unsigned char *sig,
+                                   size_t *siglen, const unsigned char *tbs,
+                                   size_t tbslen) {
+    EVP_PKEY_CTX *ctx = EVP_PKEY_CTX_dup(template);
+    int res;
+
+    if (ctx == NULL) {
+        return -1;
+    }
+    res = EVP_PKEY_sign(ctx, sig, siglen, tbs, tbslen);
+    EVP_PKEY_CTX_free(ctx);
+    return res;
+}
+
+int Cryptography_EVP_PKEY_verify_dup(EVP_PKEY_CTX *template,
+                                     const unsigned char *sig, size_t siglen,
+                                     const unsigned char *tbs, size_t tbslen) {
+    EVP_PKEY_CTX *ctx = EVP_PKEY_CTX_dup(template);
+    int res;
+
+    if (ctx == NULL) {
+        return -1;
+    }
+    res = EVP_PKEY_verify(ctx, sig, siglen, tbs, tbslen);
+    EVP_PKEY_CTX_free(ctx);
+    return res;
+}
+
+int Cryptography_EVP_PKEY_verify_batch(EVP_PKEY_CTX *template, int count,
+                                       const unsigned char *sigs,
+                                       const size_t *sig_lens,
+                                       const unsigned char *tbs,
+                                       const size_t *tbs_lens,
+                                       unsigned char *results) {
+    EVP_PKEY_CTX *ctx;
+    int i;
+
+    for (i = 0; i < count; i++) {
+        ctx = EVP_PKEY_CTX_dup(template);
+        if (ctx == NULL) {
+            return 0;
+        }
+        /* Malformed signatures can make EVP_PKEY_verify return a negative
+           value; they are invalid like any other. */
+        results[i] = (
+            EVP_PKEY_verify(ctx, sigs, sig_lens[i], tbs, tbs_lens[i]) == 1
+        );
+        EVP_PKEY_CTX_free(ctx);
+        if (!results[i]) {
+            ERR_clear_error();
+        }
+        sigs += sig_lens[i];
+        tbs += tbs_lens[i];
+    }
+    return 1;
+}
+
+int Cryptography_EVP_DigestVerify_batch(EVP_PKEY *pkey, int count,
+                                        const unsigned char *sigs,
+                                        const size_t *sig_lens,
+                                        const unsigned char *data,
+                                        const size_t *data_lens,
+                                        unsigned char *results) {
+    EVP_MD_CTX *ctx = Cryptography_EVP_MD_CTX_new();
+    int i, ok = 1;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    for (i = 0; i < count; i++) {
+        /* One-shot algorithms such as Ed25519 need a fresh initialisation
+           for every message. */
+        if (EVP_DigestVerifyInit(ctx, NULL, NULL, NULL, pkey) != 1) {
+            ok = 0;
+            break;
+        }
+        results[i] = (
+            EVP_DigestVerify(ctx, sigs, sig_lens[i], data, data_lens[i]) == 1
+        );
+        if (!results[i]) {
+            ERR_clear_error();
+        }
+        sigs += sig_lens[i];
+        data += data_lens[i];
+    }
+    Cryptography_EVP_MD_CTX_free(ctx);
+    return ok;
+}
 """
@@ -20,6 +20,14 @@ int HMAC_CTX_copy(HMAC_CTX *, HMAC_CTX *);
 
 HMAC_CTX *Cryptography_HMAC_CTX_new(void);
 void Cryptography_HMAC_CTX_free(HMAC_CTX *ctx);
+/* MAC a batch of concatenated messages with an already keyed context,
+   writing the tags one after another. */
+int Cryptography_HMAC_batch(HMAC_CTX *, int, const unsigned char *,
+                            const size_t *, unsigned char *, unsigned int);
+/* MAC a message with a copy of a keyed context, leaving the original
+   untouched so that it can be shared between threads. */
+int Cryptography_HMAC_copy_digest(HMAC_CTX *, const unsigned char *, size_t,
+                                  unsigned char *, unsigned int *);
 """
 
 CUSTOMIZATIONS = """
@@ -45,4 +53,44 @@ void Cryptography_HMAC_CTX_free(HMAC_CTX *ctx) {
     }
 #endif
 }
+
+
+int Cryptography_HMAC_batch(HMAC_CTX *ctx, int count,
+                            const unsigned char *data,
+                            const size_t *data_lens,
+                            unsigned char *out, unsigned int md_size) {
+    unsigned int outlen;
+    int i;
+
+    for (i = 0; i < count; i++) {
+        /* Passing a NULL key and digest resets ctx to use the same key. */
+        if (HMAC_Init_ex(ctx, NULL, 0, NULL, NULL) != 1 ||
+            HMAC_Update(ctx, data, data_lens[i]) != 1 ||
+            HMAC_Final(ctx, out, &outlen) != 1 ||
+            outlen != md_size) {
+            return 0;
+        }
+        data += data_lens[i];
+        out += md_size;
+    }
+    return 1;
+}
+
+int Cryptography_HMAC_copy_digest(HMAC_CTX *template,
+                                  const unsigned char *data, size_t data_len,
+                                  unsigned char *out, unsigned int *outlen) {
+    HMAC_CTX *ctx = Cryptography_HMAC_CTX_new();
+    int ok;
+
+    if (ctx == NULL) {
+        return 0;
+    }
+    ok = (
+        HMAC_CTX_copy(ctx, template) == 1 &&
+        HMAC_Update(ctx, data, data_len) == 1 &&
+        HMAC_Final(ctx, out, outlen) == 1
+    );
+    Cryptography_HMAC_CTX_free(ctx);
+    return ok;
+}
 """
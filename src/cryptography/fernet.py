@@ -8,12 +8,13 @@ import base64
 import binascii
 import os
 import struct
+import tempfile
 import time
 
 import six
 
 from cryptography import utils
-from cryptography.exceptions import InvalidSignature
+from cryptography.exceptions import AlreadyFinalized, InvalidSignature
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import hashes, padding
 from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
@@ -25,6 +26,8 @@ class InvalidToken(Exception):
 
 
 _MAX_CLOCK_SKEW = 60
+_STREAM_CHUNK_SIZE = 64 * 1024
+_PADDING = padding.PKCS7(algorithms.AES.block_size)
 
 
 class Fernet(object):
@@ -41,6 +44,11 @@ class Fernet(object):
         self._signing_key = key[:16]
         self._encryption_key = key[16:]
         self._backend = backend
+        # The HMAC key schedule and AES key validation only depend on the
+        # key, so they are done once here. Each token works on a copy of the
+        # keyed HMAC.
+        self._hmac = HMAC(self._signing_key, hashes.SHA256(), backend=backend)
+        self._algorithm = algorithms.AES(self._encryption_key)
 
     @classmethod
     def generate_key(cls):
@@ -54,10 +62,10 @@ class Fernet(object):
     def _encrypt_from_parts(self, data, current_time, iv):
         utils._check_bytes("data", data)
 
-        padder = padding.PKCS7(algorithms.AES.block_size).padder()
+        padder = _PADDING.padder()
         padded_data = padder.update(data) + padder.finalize()
         encryptor = Cipher(
-            algorithms.AES(self._encryption_key), modes.CBC(iv), self._backend
+            self._algorithm, modes.CBC(iv), self._backend
         ).encryptor()
         ciphertext = encryptor.update(padded_data) + encryptor.finalize()
 
@@ -65,14 +73,105 @@ class Fernet(object):
             b"\x80" + struct.pack(">Q", current_time) + iv + ciphertext
         )
 
-        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
+        h = self._hmac.copy()
         h.update(basic_parts)
         hmac = h.finalize()
         return base64.urlsafe_b64encode(basic_parts + hmac)
 
+    def encrypt_many(self, data):
+        data = list(data)
+        current_time = int(time.time())
+        ivs = os.urandom(16 * len(data))
+        return [
+            self._encrypt_from_parts(d, current_time, ivs[i * 16:i * 16 + 16])
+            for i, d in enumerate(data)
+        ]
+
+    def encryptor(self):
+        current_time = int(time.time())
+        iv = os.urandom(16)
+        return self._encryptor_from_parts(current_time, iv)
+
+    def _encryptor_from_parts(self, current_time, iv):
+        return _FernetEncryptionContext(self, current_time, iv)
+
+    def encrypt_file(self, src, dst, chunk_size=_STREAM_CHUNK_SIZE):
+        encryptor = self.encryptor()
+        while True:
+            data = src.read(chunk_size)
+            if not data:
+                break
+            dst.write(encryptor.update(data))
+        dst.write(encryptor.finalize())
+
     def decrypt(self, token, ttl=None):
         timestamp, data = Fernet._get_unverified_token_data(token)
-        return self._decrypt_data(data, timestamp, ttl)
+        return self._decrypt_data(data, timestamp, _get_time_info(ttl))
+
+    def decrypt_many(self, tokens, ttl=None):
+        time_info = _get_time_info(ttl)
+        results = []
+        for token in tokens:
+            try:
+                timestamp, data = Fernet._get_unverified_token_data(token)
+                results.append(self._decrypt_data(data, timestamp, time_info))
+            except InvalidToken as e:
+                results.append(e)
+        return results
+
+    def decrypt_file(self, src, dst, ttl=None, chunk_size=_STREAM_CHUNK_SIZE):
+        # Fernet never releases unauthenticated plaintext. src is read once,
+        # copying the ciphertext into a staging file while the HMAC is
+        # checked; only the staged copy, which can't change under us, is then
+        # decrypted into dst.
+        time_info = _get_time_info(ttl)
+        with tempfile.SpooledTemporaryFile(max_size=chunk_size) as staging:
+            iv = self._verify_token_stream(src, time_info, chunk_size, staging)
+            staging.seek(0)
+            decryptor = Cipher(
+                self._algorithm, modes.CBC(iv), self._backend
+            ).decryptor()
+            unpadder = _PADDING.unpadder()
+            try:
+                while True:
+                    data = staging.read(chunk_size)
+                    if not data:
+                        break
+                    dst.write(unpadder.update(decryptor.update(data)))
+                dst.write(unpadder.update(decryptor.finalize()))
+                dst.write(unpadder.finalize())
+            except ValueError:
+                raise InvalidToken
+
+    def _verify_token_stream(self, src, time_info, chunk_size, staging):
+        reader = _TokenStreamReader(src, chunk_size)
+        header = b""
+        h = self._hmac.copy()
+        iv = None
+        for chunk in reader:
+            if iv is None:
+                header += chunk
+                if len(header) < 25:
+                    continue
+                if six.indexbytes(header, 0) != 0x80:
+                    raise InvalidToken
+                timestamp, = struct.unpack(">Q", header[1:9])
+                _check_timestamp(timestamp, time_info)
+                h.update(header[:25])
+                iv = header[9:25]
+                chunk = header[25:]
+
+            h.update(chunk)
+            staging.write(chunk)
+
+        if iv is None:
+            raise InvalidToken
+
+        try:
+            h.verify(reader.signature)
+        except InvalidSignature:
+            raise InvalidToken
+        return iv
 
     def extract_timestamp(self, token):
         timestamp, data = Fernet._get_unverified_token_data(token)
@@ -98,35 +197,28 @@ class Fernet(object):
         return timestamp, data
 
     def _verify_signature(self, data):
-        h = HMAC(self._signing_key, hashes.SHA256(), backend=self._backend)
+        h = self._hmac.copy()
         h.update(data[:-32])
         try:
             h.verify(data[-32:])
         except InvalidSignature:
             raise InvalidToken
 
-    def _decrypt_data(self, data, timestamp, ttl):
-        current_time = int(time.time())
-        if ttl is not None:
-            if timestamp + ttl < current_time:
-                raise InvalidToken
-
-            if current_time + _MAX_CLOCK_SKEW < timestamp:
-                raise InvalidToken
-
+    def _decrypt_data(self, data, timestamp, time_info):
+        _check_timestamp(timestamp, time_info)
         self._verify_signature(data)
 
         iv = data[9:25]
         ciphertext = data[25:-32]
         decryptor = Cipher(
-            algorithms.AES(self._encryption_key), modes.CBC(iv), self._backend
+            self._algorithm, modes.CBC(iv), self._backend
         ).decryptor()
         plaintext_padded = decryptor.update(ciphertext)
         try:
             plaintext_padded += decryptor.finalize()
         except ValueError:
             raise InvalidToken
-        unpadder = padding.PKCS7(algorithms.AES.block_size).unpadder()
+        unpadder = _PADDING.unpadder()
 
         unpadded = unpadder.update(plaintext_padded)
         try:
@@ -136,6 +228,99 @@ class Fernet(object):
         return unpadded
 
 
+def _get_time_info(ttl):
+    if ttl is None:
+        return None
+    return ttl, int(time.time())
+
+
+def _check_timestamp(timestamp, time_info):
+    if time_info is not None:
+        ttl, current_time = time_info
+        if timestamp + ttl < current_time:
+            raise InvalidToken
+
+        if current_time + _MAX_CLOCK_SKEW < timestamp:
+            raise InvalidToken
+
+
+class _FernetEncryptionContext(object):
+    def __init__(self, fernet, current_time, iv):
+        self._padder = _PADDING.padder()
+        self._encryptor = Cipher(
+            fernet._algorithm, modes.CBC(iv), fernet._backend
+        ).encryptor()
+        self._hmac = fernet._hmac.copy()
+        # Raw token bytes which have not been base64 encoded yet because
+        # they do not fill a whole 3 byte base64 group.
+        self._pending = b"\x80" + struct.pack(">Q", current_time) + iv
+        self._hmac.update(self._pending)
+
+    def update(self, data):
+        if self._hmac is None:
+            raise AlreadyFinalized("Context was already finalized.")
+        utils._check_bytes("data", data)
+
+        ciphertext = self._encryptor.update(self._padder.update(data))
+        self._hmac.update(ciphertext)
+        data = self._pending + ciphertext
+        boundary = len(data) - len(data) % 3
+        self._pending = data[boundary:]
+        return base64.urlsafe_b64encode(data[:boundary])
+
+    def finalize(self):
+        if self._hmac is None:
+            raise AlreadyFinalized("Context was already finalized.")
+
+        ciphertext = self._encryptor.update(self._padder.finalize())
+        ciphertext += self._encryptor.finalize()
+        self._hmac.update(ciphertext)
+        data = self._pending + ciphertext + self._hmac.finalize()
+        self._hmac = self._pending = None
+        return base64.urlsafe_b64encode(data)
+
+
+class _TokenStreamReader(object):
+    """
+    Iterates over the decoded contents of a base64 encoded token read from a
+    file object, holding back the trailing 32 byte HMAC. Once iteration is
+    complete the HMAC is available as ``signature``.
+    """
+
+    def __init__(self, fileobj, chunk_size):
+        self._fileobj = fileobj
+        self._chunk_size = chunk_size
+        self.signature = None
+
+    def __iter__(self):
+        leftover = b""
+        held = b""
+        while True:
+            encoded = self._fileobj.read(self._chunk_size)
+            if not encoded:
+                break
+            utils._check_bytes("token", encoded)
+            encoded = leftover + encoded
+            boundary = len(encoded) - len(encoded) % 4
+            leftover = encoded[boundary:]
+            held += _b64decode_chunk(encoded[:boundary])
+            if len(held) > 32:
+                yield held[:-32]
+                held = held[-32:]
+
+        held += _b64decode_chunk(leftover)
+        if len(held) < 32:
+            raise InvalidToken
+        self.signature = held
+
+
+def _b64decode_chunk(data):
+    try:
+        return base64.urlsafe_b64decode(data)
+    except (TypeError, binascii.Error):
+        raise InvalidToken
+
+
 class MultiFernet(object):
     def __init__(self, fernets):
         fernets = list(fernets)
@@ -144,28 +329,75 @@ class MultiFernet(object):
                 "MultiFernet requires at least one Fernet instance"
             )
         self._fernets = fernets
+        # Tokens can't be matched to a key without checking their HMAC, so
+        # the key which most recently verified a token is tried first. Runs
+        # of tokens made with the same key then cost a single HMAC each,
+        # however many keys are in rotation.
+        self._last_index = 0
 
     def encrypt(self, msg):
         return self._fernets[0].encrypt(msg)
 
+    def encrypt_many(self, msgs):
+        return self._fernets[0].encrypt_many(msgs)
+
     def rotate(self, msg):
         timestamp, data = Fernet._get_unverified_token_data(msg)
-        for f in self._fernets:
-            try:
-                p = f._decrypt_data(data, timestamp, None)
-                break
-            except InvalidToken:
-                pass
-        else:
-            raise InvalidToken
-
+        p = self._decrypt_data(data, timestamp, None)
         iv = os.urandom(16)
         return self._fernets[0]._encrypt_from_parts(p, timestamp, iv)
 
+    def rotate_many(self, msgs):
+        msgs = list(msgs)
+        ivs = os.urandom(16 * len(msgs))
+        results = []
+        for i, msg in enumerate(msgs):
+            try:
+                timestamp, data = Fernet._get_unverified_token_data(msg)
+                p = self._decrypt_data(data, timestamp, None)
+            except InvalidToken as e:
+                results.append(e)
+                continue
+            results.append(self._fernets[0]._encrypt_from_parts(
+                p, timestamp, ivs[i * 16:i * 16 + 16]
+            ))
+        return results
+
     def decrypt(self, msg, ttl=None):
-        for f in self._fernets:
+        timestamp, data = Fernet._get_unverified_token_data(msg)
+        return self._decrypt_data(data, timestamp, _get_time_info(ttl))
+
+    def decrypt_many(self, msgs, ttl=None):
+        time_info = _get_time_info(ttl)
+        results = []
+        for msg in msgs:
             try:
-                return f.decrypt(msg, ttl)
+                timestamp, data = Fernet._get_unverified_token_data(msg)
+                results.append(self._decrypt_data(data, timestamp, time_info))
+            except InvalidToken as e:
+                results.append(e)
+        return results
+
+    def _decrypt_data(self, data, timestamp, time_info):
+        # An expired token is invalid under every key, so don't bother
+        # computing any HMACs for it.
+        _check_timestamp(timestamp, time_info)
+
+        last_index = self._last_index
+        try:
+            return self._fernets[last_index]._decrypt_data(
+                data, timestamp, None
+            )
+        except InvalidToken:
+            pass
+
+        for i, f in enumerate(self._fernets):
+            if i == last_index:
+                continue
+            try:
+                p = f._decrypt_data(data, timestamp, None)
             except InvalidToken:
-                pass
+                continue
+            self._last_index = i
+            return p
         raise InvalidToken
@@ -10,6 +10,10 @@ from cryptography.exceptions import InvalidTag
 _ENCRYPT = 1
 _DECRYPT = 0
 
+# EVP_CIPHER lookups by name, cached because the AEAD ciphers are looked up
+# every time a new key is used.
+_EVP_CIPHERS = {}
+
 
 def _aead_cipher_name(cipher):
     from cryptography.hazmat.primitives.ciphers.aead import (
@@ -24,9 +28,18 @@ def _aead_cipher_name(cipher):
         return "aes-{}-gcm".format(len(cipher._key) * 8).encode("ascii")
 
 
-def _aead_setup(backend, cipher_name, key, nonce, tag, tag_len, operation):
-    evp_cipher = backend._lib.EVP_get_cipherbyname(cipher_name)
-    backend.openssl_assert(evp_cipher != backend._ffi.NULL)
+def _evp_cipher_by_name(backend, cipher_name):
+    evp_cipher = _EVP_CIPHERS.get(cipher_name)
+    if evp_cipher is None:
+        evp_cipher = backend._lib.EVP_get_cipherbyname(cipher_name)
+        backend.openssl_assert(evp_cipher != backend._ffi.NULL)
+        _EVP_CIPHERS[cipher_name] = evp_cipher
+    return evp_cipher
+
+
+def _aead_create_ctx(backend, cipher_name, key, nonce_len, tag_len,
+                     operation):
+    evp_cipher = _evp_cipher_by_name(backend, cipher_name)
     ctx = backend._lib.EVP_CIPHER_CTX_new()
     ctx = backend._ffi.gc(ctx, backend._lib.EVP_CIPHER_CTX_free)
     res = backend._lib.EVP_CipherInit_ex(
@@ -39,34 +52,68 @@ def _aead_setup(backend, cipher_name, key, nonce, tag, tag_len, operation):
     backend.openssl_assert(res != 0)
     res = backend._lib.EVP_CIPHER_CTX_set_key_length(ctx, len(key))
     backend.openssl_assert(res != 0)
+    # CCM bakes the nonce and tag lengths into its state when the key is
+    # set, so they have to be set first.
     res = backend._lib.EVP_CIPHER_CTX_ctrl(
-        ctx, backend._lib.EVP_CTRL_AEAD_SET_IVLEN, len(nonce),
+        ctx, backend._lib.EVP_CTRL_AEAD_SET_IVLEN, nonce_len,
         backend._ffi.NULL
     )
     backend.openssl_assert(res != 0)
-    if operation == _DECRYPT:
+    if cipher_name.endswith(b"-ccm"):
         res = backend._lib.EVP_CIPHER_CTX_ctrl(
-            ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, len(tag), tag
+            ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, tag_len, backend._ffi.NULL
         )
         backend.openssl_assert(res != 0)
-    elif cipher_name.endswith(b"-ccm"):
+
+    key_ptr = backend._ffi.from_buffer(key)
+    res = backend._lib.EVP_CipherInit_ex(
+        ctx,
+        backend._ffi.NULL,
+        backend._ffi.NULL,
+        key_ptr,
+        backend._ffi.NULL,
+        int(operation == _ENCRYPT)
+    )
+    backend.openssl_assert(res != 0)
+    return ctx
+
+
+def _aead_acquire_ctx(backend, cipher, nonce_len, tag_len, operation):
+    # Keyed contexts are cached on the cipher object so that the key
+    # schedule runs once rather than on every call. A context can only be
+    # used by one call at a time, so each thread takes one from the pool
+    # (list.pop and list.append are atomic) and returns it when done.
+    pool = cipher._ctx_pool.setdefault((operation, nonce_len), [])
+    try:
+        return pool.pop()
+    except IndexError:
+        return _aead_create_ctx(
+            backend, _aead_cipher_name(cipher), cipher._key, nonce_len,
+            tag_len, operation
+        )
+
+
+def _aead_release_ctx(cipher, nonce_len, operation, ctx):
+    cipher._ctx_pool[operation, nonce_len].append(ctx)
+
+
+def _aead_setup(backend, ctx, nonce, tag, operation):
+    if operation == _DECRYPT:
         res = backend._lib.EVP_CIPHER_CTX_ctrl(
-            ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, tag_len, backend._ffi.NULL
+            ctx, backend._lib.EVP_CTRL_AEAD_SET_TAG, len(tag), tag
         )
         backend.openssl_assert(res != 0)
 
     nonce_ptr = backend._ffi.from_buffer(nonce)
-    key_ptr = backend._ffi.from_buffer(key)
     res = backend._lib.EVP_CipherInit_ex(
         ctx,
         backend._ffi.NULL,
         backend._ffi.NULL,
-        key_ptr,
+        backend._ffi.NULL,
         nonce_ptr,
         int(operation == _ENCRYPT)
     )
     backend.openssl_assert(res != 0)
-    return ctx
 
 
 def _set_length(backend, ctx, data_len):
@@ -89,51 +136,127 @@ def _process_aad(backend, ctx, associated_data):
     backend.openssl_assert(res != 0)
 
 
-def _process_data(backend, ctx, data):
+def _process_data(backend, ctx, data, out):
     outlen = backend._ffi.new("int *")
-    buf = backend._ffi.new("unsigned char[]", len(data))
-    res = backend._lib.EVP_CipherUpdate(ctx, buf, outlen, data, len(data))
+    res = backend._lib.EVP_CipherUpdate(ctx, out, outlen, data, len(data))
     backend.openssl_assert(res != 0)
-    return backend._ffi.buffer(buf, outlen[0])[:]
+    return outlen[0]
+
+
+def _writable_buffer(backend, buf, required):
+    if memoryview(buf).readonly:
+        raise TypeError("buffer must be writable")
+    if len(buf) < required:
+        raise ValueError(
+            "buffer must be at least {} bytes for this "
+            "payload".format(required)
+        )
+    return backend._ffi.cast(
+        "unsigned char *", backend._ffi.from_buffer(buf)
+    )
 
 
 def _encrypt(backend, cipher, nonce, data, associated_data, tag_length):
-    from cryptography.hazmat.primitives.ciphers.aead import AESCCM
-    cipher_name = _aead_cipher_name(cipher)
-    ctx = _aead_setup(
-        backend, cipher_name, cipher._key, nonce, None, tag_length, _ENCRYPT
+    buf = backend._ffi.new("unsigned char[]", len(data) + tag_length)
+    _encrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, buf
+    )
+    return backend._ffi.buffer(buf)[:]
+
+
+def _encrypt_into(backend, cipher, nonce, data, associated_data, tag_length,
+                  buf):
+    out = _writable_buffer(backend, buf, len(data) + tag_length)
+    return _encrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, out
+    )
+
+
+def _encrypt_to_ptr(backend, cipher, nonce, data, associated_data,
+                    tag_length, out):
+    ctx = _aead_acquire_ctx(
+        backend, cipher, len(nonce), tag_length, _ENCRYPT
     )
+    written = _encrypt_with_ctx(
+        backend, ctx, cipher, nonce, data, associated_data, tag_length, out
+    )
+    _aead_release_ctx(cipher, len(nonce), _ENCRYPT, ctx)
+    return written
+
+
+def _encrypt_with_ctx(backend, ctx, cipher, nonce, data, associated_data,
+                      tag_length, out):
+    from cryptography.hazmat.primitives.ciphers.aead import AESCCM
+    _aead_setup(backend, ctx, nonce, None, _ENCRYPT)
     # CCM requires us to pass the length of the data before processing anything
     # However calling this with any other AEAD results in an error
     if isinstance(cipher, AESCCM):
         _set_length(backend, ctx, len(data))
 
     _process_aad(backend, ctx, associated_data)
-    processed_data = _process_data(backend, ctx, data)
+    processed = _process_data(backend, ctx, data, out)
+    backend.openssl_assert(processed == len(data))
     outlen = backend._ffi.new("int *")
     res = backend._lib.EVP_CipherFinal_ex(ctx, backend._ffi.NULL, outlen)
     backend.openssl_assert(res != 0)
     backend.openssl_assert(outlen[0] == 0)
-    tag_buf = backend._ffi.new("unsigned char[]", tag_length)
+    # The tag is written directly after the ciphertext.
     res = backend._lib.EVP_CIPHER_CTX_ctrl(
-        ctx, backend._lib.EVP_CTRL_AEAD_GET_TAG, tag_length, tag_buf
+        ctx, backend._lib.EVP_CTRL_AEAD_GET_TAG, tag_length, out + processed
     )
     backend.openssl_assert(res != 0)
-    tag = backend._ffi.buffer(tag_buf)[:]
-
-    return processed_data + tag
+    return processed + tag_length
 
 
 def _decrypt(backend, cipher, nonce, data, associated_data, tag_length):
-    from cryptography.hazmat.primitives.ciphers.aead import AESCCM
     if len(data) < tag_length:
         raise InvalidTag
+    buf = backend._ffi.new("unsigned char[]", len(data) - tag_length)
+    written = _decrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, buf
+    )
+    return backend._ffi.buffer(buf, written)[:]
+
+
+def _decrypt_into(backend, cipher, nonce, data, associated_data, tag_length,
+                  buf):
+    if len(data) < tag_length:
+        raise InvalidTag
+    out = _writable_buffer(backend, buf, len(data) - tag_length)
+    return _decrypt_to_ptr(
+        backend, cipher, nonce, data, associated_data, tag_length, out
+    )
+
+
+def _decrypt_to_ptr(backend, cipher, nonce, data, associated_data,
+                    tag_length, out):
+    ctx = _aead_acquire_ctx(
+        backend, cipher, len(nonce), tag_length, _DECRYPT
+    )
+    try:
+        written = _decrypt_with_ctx(
+            backend, ctx, cipher, nonce, data, associated_data, tag_length,
+            out
+        )
+    except InvalidTag:
+        # Don't leave unauthenticated plaintext in the output buffer. The
+        # context is reset by the next _aead_setup, so it is still fit for
+        # reuse after a failed tag check.
+        backend._ffi.memmove(
+            out, b"\x00" * (len(data) - tag_length), len(data) - tag_length
+        )
+        _aead_release_ctx(cipher, len(nonce), _DECRYPT, ctx)
+        raise
+    _aead_release_ctx(cipher, len(nonce), _DECRYPT, ctx)
+    return written
+
+
+def _decrypt_with_ctx(backend, ctx, cipher, nonce, data, associated_data,
+                      tag_length, out):
+    from cryptography.hazmat.primitives.ciphers.aead import AESCCM
     tag = data[-tag_length:]
     data = data[:-tag_length]
-    cipher_name = _aead_cipher_name(cipher)
-    ctx = _aead_setup(
-        backend, cipher_name, cipher._key, nonce, tag, tag_length, _DECRYPT
-    )
+    _aead_setup(backend, ctx, nonce, tag, _DECRYPT)
     # CCM requires us to pass the length of the data before processing anything
     # However calling this with any other AEAD results in an error
     if isinstance(cipher, AESCCM):
@@ -144,19 +267,78 @@ def _decrypt(backend, cipher, nonce, data, associated_data, tag_length):
     # raised in Update and Final is irrelevant.
     if isinstance(cipher, AESCCM):
         outlen = backend._ffi.new("int *")
-        buf = backend._ffi.new("unsigned char[]", len(data))
-        res = backend._lib.EVP_CipherUpdate(ctx, buf, outlen, data, len(data))
+        res = backend._lib.EVP_CipherUpdate(ctx, out, outlen, data, len(data))
         if res != 1:
             backend._consume_errors()
             raise InvalidTag
 
-        processed_data = backend._ffi.buffer(buf, outlen[0])[:]
+        processed = outlen[0]
     else:
-        processed_data = _process_data(backend, ctx, data)
+        processed = _process_data(backend, ctx, data, out)
         outlen = backend._ffi.new("int *")
         res = backend._lib.EVP_CipherFinal_ex(ctx, backend._ffi.NULL, outlen)
         if res == 0:
             backend._consume_errors()
             raise InvalidTag
 
-    return processed_data
+    return processed
+
+
+def _batch_lengths(backend, items):
+    lengths = [len(item) for item in items]
+    return lengths, backend._ffi.new("int[]", lengths)
+
+
+def _encrypt_batch(backend, cipher, nonces, data, associated_data,
+                   tag_length):
+    if not data:
+        return []
+
+    lengths, data_lens = _batch_lengths(backend, data)
+    _, aad_lens = _batch_lengths(backend, associated_data)
+    out_lengths = [length + tag_length for length in lengths]
+    buf = backend._ffi.new("unsigned char[]", sum(out_lengths))
+    nonce_len = len(nonces[0])
+    ctx = _aead_acquire_ctx(backend, cipher, nonce_len, tag_length, _ENCRYPT)
+    res = backend._lib.Cryptography_EVP_AEAD_encrypt_batch(
+        ctx, len(data), b"".join(nonces), nonce_len, b"".join(data),
+        data_lens, b"".join(associated_data), aad_lens, tag_length, buf
+    )
+    backend.openssl_assert(res == 1)
+    _aead_release_ctx(cipher, nonce_len, _ENCRYPT, ctx)
+    return _split_buffer(backend, buf, out_lengths)
+
+
+def _decrypt_batch(backend, cipher, nonces, data, associated_data,
+                   tag_length):
+    if not data:
+        return []
+
+    lengths, data_lens = _batch_lengths(backend, data)
+    _, aad_lens = _batch_lengths(backend, associated_data)
+    out_lengths = [max(length - tag_length, 0) for length in lengths]
+    buf = backend._ffi.new("unsigned char[]", max(sum(out_lengths), 1))
+    ok = backend._ffi.new("int[]", len(data))
+    nonce_len = len(nonces[0])
+    ctx = _aead_acquire_ctx(backend, cipher, nonce_len, tag_length, _DECRYPT)
+    authentic = backend._lib.Cryptography_EVP_AEAD_decrypt_batch(
+        ctx, len(data), b"".join(nonces), nonce_len, b"".join(data),
+        data_lens, b"".join(associated_data), aad_lens, tag_length, buf, ok
+    )
+    if authentic != len(data):
+        backend._consume_errors()
+    _aead_release_ctx(cipher, nonce_len, _DECRYPT, ctx)
+    return [
+        plaintext if ok[i] else InvalidTag()
+        for i, plaintext in enumerate(_split_buffer(backend, buf, out_lengths))
+    ]
+
+
+def _split_buffer(backend, buf, lengths):
+    data = backend._ffi.buffer(buf)[:]
+    results = []
+    offset = 0
+    for length in lengths:
+        results.append(data[offset:offset + length])
+        offset += length
+    return results
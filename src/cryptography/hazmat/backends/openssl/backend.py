@@ -127,6 +127,9 @@ class Backend(object):
 
         self._cipher_registry = {}
         self._register_default_ciphers()
+        # EVP_MD lookups, cached because every hash, HMAC and signature
+        # operation starts with one.
+        self._evp_md_cache = {}
         self.activate_osrandom_engine()
         self._dh_types = [self._lib.EVP_PKEY_DH]
         if self._lib.Cryptography_HAS_EVP_PKEY_DHX:
@@ -206,7 +209,31 @@ class Backend(object):
     def create_hmac_ctx(self, key, algorithm):
         return _HMACContext(self, key, algorithm)
 
+    def hmac_digest_many(self, key, algorithm, data):
+        ctx = _HMACContext(self, key, algorithm)
+        buf, lengths = self._concatenate_buffers(data)
+        out = self._ffi.new(
+            "unsigned char[]", max(len(lengths) * algorithm.digest_size, 1)
+        )
+        res = self._lib.Cryptography_HMAC_batch(
+            ctx._ctx, len(lengths), buf, lengths, out, algorithm.digest_size
+        )
+        self.openssl_assert(res == 1)
+        return self._ffi.buffer(out, len(lengths) * algorithm.digest_size)[:]
+
+    def _concatenate_buffers(self, data):
+        # The batch functions take their input as one buffer and an array of
+        # lengths, so that only one cffi call is needed however many buffers
+        # there are.
+        lengths = self._ffi.new("size_t[]", [len(d) for d in data])
+        return b"".join(data), lengths
+
     def _evp_md_from_algorithm(self, algorithm):
+        key = (type(algorithm), algorithm.name, algorithm.digest_size)
+        evp_md = self._evp_md_cache.get(key)
+        if evp_md is not None:
+            return evp_md
+
         if algorithm.name == "blake2b" or algorithm.name == "blake2s":
             alg = "{}{}".format(
                 algorithm.name, algorithm.digest_size * 8
@@ -215,6 +242,8 @@ class Backend(object):
             alg = algorithm.name.encode("ascii")
 
         evp_md = self._lib.EVP_get_digestbyname(alg)
+        if evp_md != self._ffi.NULL:
+            self._evp_md_cache[key] = evp_md
         return evp_md
 
     def _evp_md_non_null_from_algorithm(self, algorithm):
@@ -232,6 +261,51 @@ class Backend(object):
     def create_hash_ctx(self, algorithm):
         return _HashContext(self, algorithm)
 
+    def hash_digest(self, algorithm, data):
+        if isinstance(algorithm, hashes.ExtendableOutputFunction):
+            # EVP_Digest can't produce a caller-chosen output length.
+            ctx = _HashContext(self, algorithm)
+            ctx.update(data)
+            return ctx.finalize()
+
+        evp_md = self._evp_md_from_algorithm(algorithm)
+        if evp_md == self._ffi.NULL:
+            raise UnsupportedAlgorithm(
+                "{} is not a supported hash on this backend.".format(
+                    algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+        buf = self._ffi.new("unsigned char[]", self._lib.EVP_MAX_MD_SIZE)
+        outlen = self._ffi.new("unsigned int *")
+        res = self._lib.EVP_Digest(
+            self._ffi.from_buffer(data), len(data), buf, outlen, evp_md,
+            self._ffi.NULL
+        )
+        self.openssl_assert(res != 0)
+        self.openssl_assert(outlen[0] == algorithm.digest_size)
+        return self._ffi.buffer(buf)[:outlen[0]]
+
+    def hash_digest_many(self, algorithm, data):
+        if isinstance(algorithm, hashes.ExtendableOutputFunction):
+            return b"".join(self.hash_digest(algorithm, d) for d in data)
+
+        evp_md = self._evp_md_from_algorithm(algorithm)
+        if evp_md == self._ffi.NULL:
+            raise UnsupportedAlgorithm(
+                "{} is not a supported hash on this backend.".format(
+                    algorithm.name),
+                _Reasons.UNSUPPORTED_HASH
+            )
+        buf, lengths = self._concatenate_buffers(data)
+        out = self._ffi.new(
+            "unsigned char[]", max(len(lengths) * algorithm.digest_size, 1)
+        )
+        res = self._lib.Cryptography_EVP_Digest_batch(
+            evp_md, len(lengths), buf, lengths, out, algorithm.digest_size
+        )
+        self.openssl_assert(res == 1)
+        return self._ffi.buffer(out, len(lengths) * algorithm.digest_size)[:]
+
     def cipher_supported(self, cipher, mode):
         try:
             adapter = self._cipher_registry[type(cipher), type(mode)]
@@ -391,6 +465,32 @@ class Backend(object):
             self.openssl_assert(bn_ptr[0] != self._ffi.NULL)
             return bn_ptr[0]
 
+    def _ints_to_bns(self, *nums):
+        """
+        Converts several python integers to BIGNUMs with one call into
+        OpenSSL. None is converted to NULL. As with _int_to_bn the returned
+        BIGNUMs will not be garbage collected.
+        """
+        values = [num for num in nums if num is not None]
+        if six.PY2:
+            bns = [self._int_to_bn(num) for num in values]
+        else:
+            buf, lengths = self._concatenate_buffers([
+                num.to_bytes(num.bit_length() // 8 + 1, "big")
+                for num in values
+            ])
+            bn_array = self._ffi.new("BIGNUM *[]", len(values))
+            res = self._lib.Cryptography_BN_bin2bn_many(
+                buf, lengths, len(values), bn_array
+            )
+            self.openssl_assert(res == 1)
+            bns = list(bn_array)
+
+        bns.reverse()
+        return [
+            self._ffi.NULL if num is None else bns.pop() for num in nums
+        ]
+
     def generate_rsa_private_key(self, public_exponent, key_size):
         rsa._verify_rsa_parameters(public_exponent, key_size)
 
@@ -427,14 +527,10 @@ class Backend(object):
         rsa_cdata = self._lib.RSA_new()
         self.openssl_assert(rsa_cdata != self._ffi.NULL)
         rsa_cdata = self._ffi.gc(rsa_cdata, self._lib.RSA_free)
-        p = self._int_to_bn(numbers.p)
-        q = self._int_to_bn(numbers.q)
-        d = self._int_to_bn(numbers.d)
-        dmp1 = self._int_to_bn(numbers.dmp1)
-        dmq1 = self._int_to_bn(numbers.dmq1)
-        iqmp = self._int_to_bn(numbers.iqmp)
-        e = self._int_to_bn(numbers.public_numbers.e)
-        n = self._int_to_bn(numbers.public_numbers.n)
+        p, q, d, dmp1, dmq1, iqmp, e, n = self._ints_to_bns(
+            numbers.p, numbers.q, numbers.d, numbers.dmp1, numbers.dmq1,
+            numbers.iqmp, numbers.public_numbers.e, numbers.public_numbers.n
+        )
         res = self._lib.RSA_set0_factors(rsa_cdata, p, q)
         self.openssl_assert(res == 1)
         res = self._lib.RSA_set0_key(rsa_cdata, n, e, d)
@@ -452,8 +548,7 @@ class Backend(object):
         rsa_cdata = self._lib.RSA_new()
         self.openssl_assert(rsa_cdata != self._ffi.NULL)
         rsa_cdata = self._ffi.gc(rsa_cdata, self._lib.RSA_free)
-        e = self._int_to_bn(numbers.e)
-        n = self._int_to_bn(numbers.n)
+        e, n = self._ints_to_bns(numbers.e, numbers.n)
         res = self._lib.RSA_set0_key(rsa_cdata, n, e, self._ffi.NULL)
         self.openssl_assert(res == 1)
         evp_pkey = self._rsa_cdata_to_evp_pkey(rsa_cdata)
@@ -670,11 +765,10 @@ class Backend(object):
         self.openssl_assert(dsa_cdata != self._ffi.NULL)
         dsa_cdata = self._ffi.gc(dsa_cdata, self._lib.DSA_free)
 
-        p = self._int_to_bn(parameter_numbers.p)
-        q = self._int_to_bn(parameter_numbers.q)
-        g = self._int_to_bn(parameter_numbers.g)
-        pub_key = self._int_to_bn(numbers.public_numbers.y)
-        priv_key = self._int_to_bn(numbers.x)
+        p, q, g, pub_key, priv_key = self._ints_to_bns(
+            parameter_numbers.p, parameter_numbers.q, parameter_numbers.g,
+            numbers.public_numbers.y, numbers.x
+        )
         self._dsa_cdata_set_values(dsa_cdata, p, q, g, pub_key, priv_key)
 
         evp_pkey = self._dsa_cdata_to_evp_pkey(dsa_cdata)
@@ -687,10 +781,10 @@ class Backend(object):
         self.openssl_assert(dsa_cdata != self._ffi.NULL)
         dsa_cdata = self._ffi.gc(dsa_cdata, self._lib.DSA_free)
 
-        p = self._int_to_bn(numbers.parameter_numbers.p)
-        q = self._int_to_bn(numbers.parameter_numbers.q)
-        g = self._int_to_bn(numbers.parameter_numbers.g)
-        pub_key = self._int_to_bn(numbers.y)
+        p, q, g, pub_key = self._ints_to_bns(
+            numbers.parameter_numbers.p, numbers.parameter_numbers.q,
+            numbers.parameter_numbers.g, numbers.y
+        )
         priv_key = self._ffi.NULL
         self._dsa_cdata_set_values(dsa_cdata, p, q, g, pub_key, priv_key)
 
@@ -704,9 +798,7 @@ class Backend(object):
         self.openssl_assert(dsa_cdata != self._ffi.NULL)
         dsa_cdata = self._ffi.gc(dsa_cdata, self._lib.DSA_free)
 
-        p = self._int_to_bn(numbers.p)
-        q = self._int_to_bn(numbers.q)
-        g = self._int_to_bn(numbers.g)
+        p, q, g = self._ints_to_bns(numbers.p, numbers.q, numbers.g)
         res = self._lib.DSA_set0_pqg(dsa_cdata, p, q, g)
         self.openssl_assert(res == 1)
 
@@ -1738,8 +1830,9 @@ class Backend(object):
                 "Invalid EC key. Both x and y must be non-negative."
             )
 
-        x = self._ffi.gc(self._int_to_bn(x), self._lib.BN_free)
-        y = self._ffi.gc(self._int_to_bn(y), self._lib.BN_free)
+        x, y = self._ints_to_bns(x, y)
+        x = self._ffi.gc(x, self._lib.BN_free)
+        y = self._ffi.gc(y, self._lib.BN_free)
         res = self._lib.EC_KEY_set_public_key_affine_coordinates(ctx, x, y)
         if res != 1:
             self._consume_errors()
@@ -2048,16 +2141,10 @@ class Backend(object):
         self.openssl_assert(dh_cdata != self._ffi.NULL)
         dh_cdata = self._ffi.gc(dh_cdata, self._lib.DH_free)
 
-        p = self._int_to_bn(parameter_numbers.p)
-        g = self._int_to_bn(parameter_numbers.g)
-
-        if parameter_numbers.q is not None:
-            q = self._int_to_bn(parameter_numbers.q)
-        else:
-            q = self._ffi.NULL
-
-        pub_key = self._int_to_bn(numbers.public_numbers.y)
-        priv_key = self._int_to_bn(numbers.x)
+        p, g, q, pub_key, priv_key = self._ints_to_bns(
+            parameter_numbers.p, parameter_numbers.g, parameter_numbers.q,
+            numbers.public_numbers.y, numbers.x
+        )
 
         res = self._lib.DH_set0_pqg(dh_cdata, p, q, g)
         self.openssl_assert(res == 1)
@@ -2096,15 +2183,10 @@ class Backend(object):
 
         parameter_numbers = numbers.parameter_numbers
 
-        p = self._int_to_bn(parameter_numbers.p)
-        g = self._int_to_bn(parameter_numbers.g)
-
-        if parameter_numbers.q is not None:
-            q = self._int_to_bn(parameter_numbers.q)
-        else:
-            q = self._ffi.NULL
-
-        pub_key = self._int_to_bn(numbers.y)
+        p, g, q, pub_key = self._ints_to_bns(
+            parameter_numbers.p, parameter_numbers.g, parameter_numbers.q,
+            numbers.y
+        )
 
         res = self._lib.DH_set0_pqg(dh_cdata, p, q, g)
         self.openssl_assert(res == 1)
@@ -2121,13 +2203,7 @@ class Backend(object):
         self.openssl_assert(dh_cdata != self._ffi.NULL)
         dh_cdata = self._ffi.gc(dh_cdata, self._lib.DH_free)
 
-        p = self._int_to_bn(numbers.p)
-        g = self._int_to_bn(numbers.g)
-
-        if numbers.q is not None:
-            q = self._int_to_bn(numbers.q)
-        else:
-            q = self._ffi.NULL
+        p, g, q = self._ints_to_bns(numbers.p, numbers.g, numbers.q)
 
         res = self._lib.DH_set0_pqg(dh_cdata, p, q, g)
         self.openssl_assert(res == 1)
@@ -2139,13 +2215,7 @@ class Backend(object):
         self.openssl_assert(dh_cdata != self._ffi.NULL)
         dh_cdata = self._ffi.gc(dh_cdata, self._lib.DH_free)
 
-        p = self._int_to_bn(p)
-        g = self._int_to_bn(g)
-
-        if q is not None:
-            q = self._int_to_bn(q)
-        else:
-            q = self._ffi.NULL
+        p, g, q = self._ints_to_bns(p, g, q)
 
         res = self._lib.DH_set0_pqg(dh_cdata, p, q, g)
         self.openssl_assert(res == 1)
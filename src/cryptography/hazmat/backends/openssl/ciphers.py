@@ -122,7 +122,9 @@ class _CipherContext(object):
     def update(self, data):
         buf = bytearray(len(data) + self._block_size_bytes - 1)
         n = self.update_into(data, buf)
-        return bytes(buf[:n])
+        # Slicing a memoryview avoids copying the output twice while holding
+        # the GIL.
+        return memoryview(buf)[:n].tobytes()
 
     def update_into(self, data, buf):
         if len(buf) < (len(data) + self._block_size_bytes - 1):
@@ -142,6 +144,18 @@ class _CipherContext(object):
         self._backend.openssl_assert(res != 0)
         return outlen[0]
 
+    def _update_xts_units(self, tweak, unit_size, data, buf):
+        # Processes consecutive data units, numbered from tweak, in a single
+        # call so that the per-unit work doesn't hold the GIL.
+        res = self._backend._lib.Cryptography_EVP_Cipher_xts_units(
+            self._ctx, tweak, unit_size,
+            self._backend._ffi.from_buffer(data), len(data),
+            self._backend._ffi.cast(
+                "unsigned char *", self._backend._ffi.from_buffer(buf)
+            )
+        )
+        self._backend.openssl_assert(res == 1)
+
     def finalize(self):
         # OpenSSL 1.0.1 on Ubuntu 12.04 (and possibly other distributions)
         # appears to have a bug where you must make at least one call to update
@@ -9,8 +9,8 @@ from cryptography.exceptions import (
     InvalidSignature, UnsupportedAlgorithm, _Reasons
 )
 from cryptography.hazmat.backends.openssl.utils import (
-    _calculate_digest_and_algorithm, _check_not_prehashed,
-    _warn_sign_verify_deprecated
+    _calculate_digest_and_algorithm, _calculate_digests, _check_not_prehashed,
+    _evp_pkey_verify_batch, _verify_batch, _warn_sign_verify_deprecated
 )
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.asymmetric import (
@@ -350,3 +350,25 @@ class _EllipticCurvePublicKey(object):
             self._backend, data, signature_algorithm._algorithm
         )
         _ecdsa_sig_verify(self._backend, self, signature, data)
+
+    def verify_batch(self, items, signature_algorithm, max_workers=1):
+        _check_signature_algorithm(signature_algorithm)
+        pkey_ctx = self._backend._lib.EVP_PKEY_CTX_new(
+            self._evp_pkey, self._backend._ffi.NULL
+        )
+        self._backend.openssl_assert(pkey_ctx != self._backend._ffi.NULL)
+        pkey_ctx = self._backend._ffi.gc(
+            pkey_ctx, self._backend._lib.EVP_PKEY_CTX_free
+        )
+        res = self._backend._lib.EVP_PKEY_verify_init(pkey_ctx)
+        self._backend.openssl_assert(res == 1)
+
+        def verify_chunk(signatures, data):
+            digests, _ = _calculate_digests(
+                self._backend, data, signature_algorithm._algorithm
+            )
+            return _evp_pkey_verify_batch(
+                self._backend, pkey_ctx, signatures, digests
+            )
+
+        return _verify_batch(items, max_workers, verify_chunk)
@@ -5,6 +5,7 @@
 from __future__ import absolute_import, division, print_function
 
 from cryptography import exceptions, utils
+from cryptography.hazmat.backends.openssl.utils import _verify_batch
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.ed25519 import (
     Ed25519PrivateKey, Ed25519PublicKey, _ED25519_KEY_SIZE, _ED25519_SIG_SIZE
@@ -73,6 +74,22 @@ class _Ed25519PublicKey(object):
             self._backend._consume_errors()
             raise exceptions.InvalidSignature
 
+    def verify_batch(self, items, max_workers=1):
+        return _verify_batch(items, max_workers, self._verify_chunk)
+
+    def _verify_chunk(self, signatures, data):
+        sig_buf, sig_lens = self._backend._concatenate_buffers(signatures)
+        data_buf, data_lens = self._backend._concatenate_buffers(data)
+        results = self._backend._ffi.new(
+            "unsigned char[]", max(len(signatures), 1)
+        )
+        res = self._backend._lib.Cryptography_EVP_DigestVerify_batch(
+            self._evp_pkey, len(signatures), sig_buf, sig_lens, data_buf,
+            data_lens, results
+        )
+        self._backend.openssl_assert(res == 1)
+        return [bool(result) for result in results[0:len(signatures)]]
+
 
 @utils.register_interface(Ed25519PrivateKey)
 class _Ed25519PrivateKey(object):
@@ -4,6 +4,7 @@
 
 from __future__ import absolute_import, division, print_function
 
+import struct
 
 from cryptography import utils
 from cryptography.exceptions import UnsupportedAlgorithm, _Reasons
@@ -68,6 +69,29 @@ class _HashContext(object):
             )
             return self._backend._ffi.buffer(buf)[:outlen[0]]
 
+    def _counter_digest(self, suffix, count):
+        # Digests count copies of this context, each followed by a
+        # big-endian 32-bit counter starting at 1 and then suffix, without
+        # modifying this context. This is the block function shared by the
+        # X9.63 and NIST SP 800-56A hash KDFs.
+        if isinstance(self.algorithm, hashes.ExtendableOutputFunction):
+            output = []
+            for counter in range(1, count + 1):
+                ctx = self.copy()
+                ctx.update(struct.pack(">I", counter))
+                ctx.update(suffix)
+                output.append(ctx.finalize())
+            return b"".join(output)
+
+        outlen = count * self.algorithm.digest_size
+        buf = self._backend._ffi.new("unsigned char[]", max(outlen, 1))
+        res = self._backend._lib.Cryptography_EVP_MD_counter_digest(
+            self._ctx, self._backend._ffi.from_buffer(suffix), len(suffix),
+            count, buf, self.algorithm.digest_size
+        )
+        self._backend.openssl_assert(res != 0)
+        return self._backend._ffi.buffer(buf, outlen)[:]
+
     def _finalize_xof(self):
         buf = self._backend._ffi.new("unsigned char[]",
                                      self.algorithm.digest_size)
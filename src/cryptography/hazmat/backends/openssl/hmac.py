@@ -68,6 +68,20 @@ class _HMACContext(object):
         self._backend.openssl_assert(outlen[0] == self.algorithm.digest_size)
         return self._backend._ffi.buffer(buf)[:outlen[0]]
 
+    def _copy_digest(self, data):
+        # Equivalent to copy(), update(data) and finalize() in one call into
+        # OpenSSL, without modifying this context.
+        buf = self._backend._ffi.new("unsigned char[]",
+                                     self._backend._lib.EVP_MAX_MD_SIZE)
+        outlen = self._backend._ffi.new("unsigned int *")
+        res = self._backend._lib.Cryptography_HMAC_copy_digest(
+            self._ctx, self._backend._ffi.from_buffer(data), len(data), buf,
+            outlen
+        )
+        self._backend.openssl_assert(res != 0)
+        self._backend.openssl_assert(outlen[0] == self.algorithm.digest_size)
+        return self._backend._ffi.buffer(buf)[:outlen[0]]
+
     def verify(self, signature):
         digest = self.finalize()
         if not constant_time.bytes_eq(digest, signature):
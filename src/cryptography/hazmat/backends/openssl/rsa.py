@@ -11,8 +11,8 @@ from cryptography.exceptions import (
     InvalidSignature, UnsupportedAlgorithm, _Reasons
 )
 from cryptography.hazmat.backends.openssl.utils import (
-    _calculate_digest_and_algorithm, _check_not_prehashed,
-    _warn_sign_verify_deprecated
+    _calculate_digest_and_algorithm, _calculate_digests, _check_not_prehashed,
+    _evp_pkey_verify_batch, _verify_batch, _warn_sign_verify_deprecated
 )
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric import (
@@ -24,6 +24,7 @@ from cryptography.hazmat.primitives.asymmetric.padding import (
 from cryptography.hazmat.primitives.asymmetric.rsa import (
     RSAPrivateKeyWithSerialization, RSAPublicKeyWithSerialization
 )
+from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
 
 
 def _get_rsa_pss_salt_length(pss, key, hash_algorithm):
@@ -236,25 +237,29 @@ def _rsa_sig_sign(backend, padding, algorithm, private_key, data):
     res = backend._lib.EVP_PKEY_sign(
         pkey_ctx, buf, buflen, data, len(data))
     if res != 1:
-        errors = backend._consume_errors()
-        backend.openssl_assert(errors[0].lib == backend._lib.ERR_LIB_RSA)
-        if (
-            errors[0].reason ==
-            backend._lib.RSA_R_DATA_TOO_LARGE_FOR_KEY_SIZE
-        ):
-            reason = ("Salt length too long for key size. Try using "
-                      "MAX_LENGTH instead.")
-        else:
-            backend.openssl_assert(
-                errors[0].reason ==
-                backend._lib.RSA_R_DIGEST_TOO_BIG_FOR_RSA_KEY
-            )
-            reason = "Digest too large for key size. Use a larger key."
-        raise ValueError(reason)
+        _handle_rsa_sig_sign_error(backend)
 
     return backend._ffi.buffer(buf)[:]
 
 
+def _handle_rsa_sig_sign_error(backend):
+    errors = backend._consume_errors()
+    backend.openssl_assert(errors[0].lib == backend._lib.ERR_LIB_RSA)
+    if (
+        errors[0].reason ==
+        backend._lib.RSA_R_DATA_TOO_LARGE_FOR_KEY_SIZE
+    ):
+        reason = ("Salt length too long for key size. Try using "
+                  "MAX_LENGTH instead.")
+    else:
+        backend.openssl_assert(
+            errors[0].reason ==
+            backend._lib.RSA_R_DIGEST_TOO_BIG_FOR_RSA_KEY
+        )
+        reason = "Digest too large for key size. Use a larger key."
+    raise ValueError(reason)
+
+
 def _rsa_sig_verify(backend, padding, algorithm, public_key, signature, data):
     pkey_ctx = _rsa_sig_setup(
         backend, padding, algorithm, public_key, data,
@@ -329,6 +334,95 @@ class _RSAVerificationContext(object):
         )
 
 
+def _prepared_digest(backend, algorithm, prehashed, data):
+    if not prehashed:
+        utils._check_byteslike("data", data)
+        return backend.hash_digest(algorithm, data)
+
+    if len(data) != algorithm.digest_size:
+        raise ValueError(
+            "The provided data must be the same length as the hash "
+            "algorithm's digest size."
+        )
+    return data
+
+
+@utils.register_interface(rsa.RSAPreparedSigner)
+class _RSAPreparedSigner(object):
+    def __init__(self, backend, private_key, padding, algorithm):
+        self._backend = backend
+        self._private_key = private_key
+        self._prehashed = isinstance(algorithm, Prehashed)
+        if self._prehashed:
+            algorithm = algorithm._algorithm
+        self._algorithm = algorithm
+        # A configured context that is never used directly, only duplicated
+        # for each signature.
+        self._pkey_ctx = _rsa_sig_setup(
+            backend, padding, algorithm, private_key, None,
+            backend._lib.EVP_PKEY_sign_init
+        )
+        self._sig_size = backend._lib.EVP_PKEY_size(private_key._evp_pkey)
+
+    def sign(self, data):
+        data = _prepared_digest(
+            self._backend, self._algorithm, self._prehashed, data
+        )
+        buflen = self._backend._ffi.new("size_t *", self._sig_size)
+        buf = self._backend._ffi.new("unsigned char[]", self._sig_size)
+        res = self._backend._lib.Cryptography_EVP_PKEY_sign_dup(
+            self._pkey_ctx, buf, buflen, data, len(data)
+        )
+        if res != 1:
+            _handle_rsa_sig_sign_error(self._backend)
+
+        return self._backend._ffi.buffer(buf)[:buflen[0]]
+
+
+@utils.register_interface(rsa.RSAPreparedVerifier)
+class _RSAPreparedVerifier(object):
+    def __init__(self, backend, public_key, padding, algorithm):
+        self._backend = backend
+        self._public_key = public_key
+        self._signature_algorithm = algorithm
+        self._prehashed = isinstance(algorithm, Prehashed)
+        if self._prehashed:
+            algorithm = algorithm._algorithm
+        self._algorithm = algorithm
+        # A configured context that is never used directly, only duplicated
+        # for each verification.
+        self._pkey_ctx = _rsa_sig_setup(
+            backend, padding, algorithm, public_key, None,
+            backend._lib.EVP_PKEY_verify_init
+        )
+
+    def verify(self, signature, data):
+        utils._check_bytes("signature", signature)
+        data = _prepared_digest(
+            self._backend, self._algorithm, self._prehashed, data
+        )
+        res = self._backend._lib.Cryptography_EVP_PKEY_verify_dup(
+            self._pkey_ctx, signature, len(signature), data, len(data)
+        )
+        # As in _rsa_sig_verify, negative results are errors rather than
+        # signature failures.
+        self._backend.openssl_assert(res >= 0)
+        if res == 0:
+            self._backend._consume_errors()
+            raise InvalidSignature
+
+    def verify_batch(self, items, max_workers=1):
+        return _verify_batch(items, max_workers, self._verify_chunk)
+
+    def _verify_chunk(self, signatures, data):
+        digests, _ = _calculate_digests(
+            self._backend, data, self._signature_algorithm
+        )
+        return _evp_pkey_verify_batch(
+            self._backend, self._pkey_ctx, signatures, digests
+        )
+
+
 @utils.register_interface(RSAPrivateKeyWithSerialization)
 class _RSAPrivateKey(object):
     def __init__(self, backend, rsa_cdata, evp_pkey):
@@ -417,6 +511,9 @@ class _RSAPrivateKey(object):
         )
         return _rsa_sig_sign(self._backend, padding, algorithm, self, data)
 
+    def prepare_signer(self, padding, algorithm):
+        return _RSAPreparedSigner(self._backend, self, padding, algorithm)
+
 
 @utils.register_interface(RSAPublicKeyWithSerialization)
 class _RSAPublicKey(object):
@@ -476,3 +573,11 @@ class _RSAPublicKey(object):
         return _rsa_sig_verify(
             self._backend, padding, algorithm, self, signature, data
         )
+
+    def prepare_verifier(self, padding, algorithm):
+        return _RSAPreparedVerifier(self._backend, self, padding, algorithm)
+
+    def verify_batch(self, items, padding, algorithm, max_workers=1):
+        return self.prepare_verifier(padding, algorithm).verify_batch(
+            items, max_workers
+        )
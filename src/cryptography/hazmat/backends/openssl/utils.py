@@ -6,6 +6,8 @@ from __future__ import absolute_import, division, print_function
 
 import warnings
 
+import six
+
 from cryptography import utils
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.asymmetric.utils import Prehashed
@@ -37,9 +39,9 @@ def _evp_pkey_derive(backend, evp_pkey, peer_public_key):
 
 def _calculate_digest_and_algorithm(backend, data, algorithm):
     if not isinstance(algorithm, Prehashed):
-        hash_ctx = hashes.Hash(algorithm, backend)
-        hash_ctx.update(data)
-        data = hash_ctx.finalize()
+        # A one-shot digest keeps the Python work done with the GIL held
+        # small next to the signature operation itself.
+        data = hashes.digest(algorithm, data, backend)
     else:
         algorithm = algorithm._algorithm
 
@@ -52,6 +54,73 @@ def _calculate_digest_and_algorithm(backend, data, algorithm):
     return (data, algorithm)
 
 
+def _calculate_digests(backend, data, algorithm):
+    # The batch counterpart of _calculate_digest_and_algorithm.
+    if not isinstance(algorithm, Prehashed):
+        if not data:
+            return data, algorithm
+        digests = backend.hash_digest_many(algorithm, data)
+        size = algorithm.digest_size
+        return [
+            digests[i:i + size] for i in six.moves.range(0, len(digests), size)
+        ], algorithm
+
+    algorithm = algorithm._algorithm
+    for digest in data:
+        if len(digest) != algorithm.digest_size:
+            raise ValueError(
+                "The provided data must be the same length as the hash "
+                "algorithm's digest size."
+            )
+
+    return data, algorithm
+
+
+def _verify_batch(items, max_workers, verify_chunk):
+    """
+    Splits (signature, data) pairs into one chunk per worker and returns the
+    concatenated results of verify_chunk(signatures, data) for each chunk.
+    """
+    max_workers = utils._check_max_workers(max_workers)
+
+    signatures = []
+    data = []
+    for signature, message in items:
+        utils._check_bytes("signature", signature)
+        utils._check_byteslike("data", message)
+        signatures.append(signature)
+        data.append(message)
+
+    workers = min(max_workers, len(signatures))
+    if workers <= 1:
+        return verify_chunk(signatures, data)
+
+    size = -(-len(signatures) // workers)
+    starts = list(six.moves.range(0, len(signatures), size))
+
+    def verify(start):
+        return verify_chunk(
+            signatures[start:start + size], data[start:start + size]
+        )
+
+    return [
+        result for results in utils._thread_map(verify, starts, workers)
+        for result in results
+    ]
+
+
+def _evp_pkey_verify_batch(backend, pkey_ctx, signatures, data):
+    sig_buf, sig_lens = backend._concatenate_buffers(signatures)
+    data_buf, data_lens = backend._concatenate_buffers(data)
+    results = backend._ffi.new("unsigned char[]", max(len(signatures), 1))
+    res = backend._lib.Cryptography_EVP_PKEY_verify_batch(
+        pkey_ctx, len(signatures), sig_buf, sig_lens, data_buf, data_lens,
+        results
+    )
+    backend.openssl_assert(res == 1)
+    return [bool(result) for result in results[0:len(signatures)]]
+
+
 def _check_not_prehashed(signature_algorithm):
     if isinstance(signature_algorithm, Prehashed):
         raise TypeError(
@@ -11,6 +11,7 @@ import six
 
 from cryptography import utils
 from cryptography.hazmat._oid import ObjectIdentifier
+from cryptography.hazmat.primitives.asymmetric.utils import _verify_each
 
 
 class EllipticCurveOID(object):
@@ -152,6 +153,18 @@ class EllipticCurvePublicKey(object):
         Verifies the signature of the data.
         """
 
+    def verify_batch(self, items, signature_algorithm, max_workers=1):
+        """
+        Verifies a list of (signature, data) pairs, returning a list of
+        booleans.
+        """
+        return _verify_each(
+            lambda signature, data: self.verify(
+                signature, data, signature_algorithm
+            ),
+            items, max_workers
+        )
+
     @classmethod
     def from_encoded_point(cls, curve, data):
         utils._check_bytes("data", data)
@@ -9,6 +9,7 @@ import abc
 import six
 
 from cryptography.exceptions import UnsupportedAlgorithm, _Reasons
+from cryptography.hazmat.primitives.asymmetric.utils import _verify_each
 
 
 _ED25519_KEY_SIZE = 32
@@ -40,6 +41,13 @@ class Ed25519PublicKey(object):
         Verify the signature.
         """
 
+    def verify_batch(self, items, max_workers=1):
+        """
+        Verify a list of (signature, data) pairs, returning a list of
+        booleans.
+        """
+        return _verify_each(self.verify, items, max_workers)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class Ed25519PrivateKey(object):
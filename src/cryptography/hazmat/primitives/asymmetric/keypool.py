@@ -0,0 +1,176 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import collections
+import threading
+import time
+import warnings
+
+import six
+
+from cryptography import utils
+from cryptography.exceptions import AlreadyFinalized
+
+
+class KeyPool(object):
+    def __init__(self, generate, size, max_workers=1, on_refill=None,
+                 on_get=None):
+        if not callable(generate):
+            raise TypeError("generate must be callable")
+
+        if not isinstance(size, six.integer_types):
+            raise TypeError("size must be an integer")
+        if size < 1:
+            raise ValueError("size must be at least 1")
+
+        max_workers = utils._check_max_workers(max_workers)
+
+        if on_refill is not None and not callable(on_refill):
+            raise TypeError("on_refill must be callable")
+        if on_get is not None and not callable(on_get):
+            raise TypeError("on_get must be callable")
+
+        self._generate = generate
+        self._size = size
+        self._max_workers = max_workers
+        self._on_refill = on_refill
+        self._on_get = on_get
+
+        self._keys = collections.deque()
+        self._pending = 0
+        self._generated = 0
+        self._hits = 0
+        self._misses = 0
+        self._hook_errors = 0
+        self._error = None
+        self._closed = False
+        self._changed = threading.Condition()
+
+        self._workers = [
+            threading.Thread(target=self._refill) for _ in range(max_workers)
+        ]
+        for worker in self._workers:
+            # Keygen can take seconds, so never hold up interpreter exit.
+            worker.daemon = True
+            worker.start()
+
+    size = utils.read_only_property("_size")
+    max_workers = utils.read_only_property("_max_workers")
+    generated = utils.read_only_property("_generated")
+    hits = utils.read_only_property("_hits")
+    misses = utils.read_only_property("_misses")
+    hook_errors = utils.read_only_property("_hook_errors")
+
+    @property
+    def available(self):
+        with self._changed:
+            return len(self._keys)
+
+    def get(self):
+        with self._changed:
+            if self._closed:
+                raise AlreadyFinalized("This key pool has been closed.")
+            hit = bool(self._keys)
+            if hit:
+                key = self._keys.popleft()
+                self._hits += 1
+            else:
+                self._misses += 1
+            self._changed.notify_all()
+
+        if not hit:
+            # Generating here is never slower than waiting for a worker
+            # that may only just have started on its key.
+            key = self._generate()
+
+        if self._on_get is not None:
+            self._on_get(self, hit)
+        return key
+
+    def fill(self, timeout=None):
+        if timeout is not None:
+            deadline = time.time() + timeout
+        with self._changed:
+            while len(self._keys) < self._size:
+                if self._error is not None:
+                    raise self._error
+                if self._closed:
+                    return False
+                if timeout is None:
+                    self._changed.wait()
+                    continue
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._changed.wait(remaining)
+            return True
+
+    def close(self):
+        with self._changed:
+            self._closed = True
+            # Drop the references to the private keys that were never used.
+            self._keys.clear()
+            self._changed.notify_all()
+        for worker in self._workers:
+            # close() may be called from the on_refill hook, which runs on a
+            # worker thread that can't join itself.
+            if worker is not threading.current_thread():
+                worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _refill(self):
+        while True:
+            with self._changed:
+                while (
+                    not self._closed and self._error is None and
+                    len(self._keys) + self._pending >= self._size
+                ):
+                    self._changed.wait()
+                if self._closed or self._error is not None:
+                    return
+                self._pending += 1
+
+            try:
+                key = self._generate()
+            except Exception as e:
+                with self._changed:
+                    self._pending -= 1
+                self._stop(e)
+                return
+
+            with self._changed:
+                self._pending -= 1
+                if self._closed:
+                    return
+                self._keys.append(key)
+                self._generated += 1
+                self._changed.notify_all()
+
+            if self._on_refill is not None:
+                try:
+                    self._on_refill(self)
+                except Exception as e:
+                    # The key is already in the pool, so a broken metrics
+                    # hook is no reason to stop refilling it.
+                    with self._changed:
+                        self._hook_errors += 1
+                    warnings.warn(
+                        "on_refill raised {!r}".format(e), RuntimeWarning
+                    )
+
+    def _stop(self, error):
+        # Stop refilling and wake anyone waiting in fill() so that they raise
+        # the error. get() goes on generating keys itself once the pool is
+        # empty.
+        with self._changed:
+            if self._error is None:
+                self._error = error
+            self._changed.notify_all()
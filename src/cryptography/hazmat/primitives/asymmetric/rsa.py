@@ -16,6 +16,7 @@ import six
 from cryptography import utils
 from cryptography.exceptions import UnsupportedAlgorithm, _Reasons
 from cryptography.hazmat.backends.interfaces import RSABackend
+from cryptography.hazmat.primitives.asymmetric.utils import _verify_each
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -50,6 +51,13 @@ class RSAPrivateKey(object):
         Signs the data.
         """
 
+    def prepare_signer(self, padding, algorithm):
+        """
+        Returns an RSAPreparedSigner for signing many messages with the same
+        padding and algorithm.
+        """
+        return _RSAKeyPreparedSigner(self, padding, algorithm)
+
 
 @six.add_metaclass(abc.ABCMeta)
 class RSAPrivateKeyWithSerialization(RSAPrivateKey):
@@ -104,10 +112,80 @@ class RSAPublicKey(object):
         Verifies the signature of the data.
         """
 
+    def verify_batch(self, items, padding, algorithm, max_workers=1):
+        """
+        Verifies a list of (signature, data) pairs, returning a list of
+        booleans.
+        """
+        return self.prepare_verifier(padding, algorithm).verify_batch(
+            items, max_workers
+        )
+
+    def prepare_verifier(self, padding, algorithm):
+        """
+        Returns an RSAPreparedVerifier for verifying many signatures with the
+        same padding and algorithm.
+        """
+        return _RSAKeyPreparedVerifier(self, padding, algorithm)
+
 
 RSAPublicKeyWithSerialization = RSAPublicKey
 
 
+@six.add_metaclass(abc.ABCMeta)
+class RSAPreparedSigner(object):
+    @abc.abstractmethod
+    def sign(self, data):
+        """
+        Signs the data.
+        """
+
+
+@six.add_metaclass(abc.ABCMeta)
+class RSAPreparedVerifier(object):
+    @abc.abstractmethod
+    def verify(self, signature, data):
+        """
+        Verifies the signature of the data.
+        """
+
+    @abc.abstractmethod
+    def verify_batch(self, items, max_workers=1):
+        """
+        Verifies a list of (signature, data) pairs, returning a list of
+        booleans.
+        """
+
+
+# The defaults for keys that don't prepare signing or verification
+# themselves, which call the key for every message.
+@utils.register_interface(RSAPreparedSigner)
+class _RSAKeyPreparedSigner(object):
+    def __init__(self, private_key, padding, algorithm):
+        self._private_key = private_key
+        self._padding = padding
+        self._algorithm = algorithm
+
+    def sign(self, data):
+        return self._private_key.sign(data, self._padding, self._algorithm)
+
+
+@utils.register_interface(RSAPreparedVerifier)
+class _RSAKeyPreparedVerifier(object):
+    def __init__(self, public_key, padding, algorithm):
+        self._public_key = public_key
+        self._padding = padding
+        self._algorithm = algorithm
+
+    def verify(self, signature, data):
+        self._public_key.verify(
+            signature, data, self._padding, self._algorithm
+        )
+
+    def verify_batch(self, items, max_workers=1):
+        return _verify_each(self.verify, items, max_workers)
+
+
 def generate_private_key(public_exponent, key_size, backend):
     if not isinstance(backend, RSABackend):
         raise UnsupportedAlgorithm(
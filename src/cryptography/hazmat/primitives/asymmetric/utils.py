@@ -5,6 +5,7 @@
 from __future__ import absolute_import, division, print_function
 
 from cryptography import utils
+from cryptography.exceptions import InvalidSignature
 from cryptography.hazmat._der import (
     DERReader, INTEGER, SEQUENCE, encode_der, encode_der_integer
 )
@@ -35,3 +36,19 @@ class Prehashed(object):
         self._digest_size = algorithm.digest_size
 
     digest_size = utils.read_only_property("_digest_size")
+
+
+def _verify_each(verify, items, max_workers):
+    # The default verify_batch for keys that don't provide their own: each
+    # (signature, data) pair is checked with verify(signature, data).
+    max_workers = utils._check_max_workers(max_workers)
+
+    def verify_one(item):
+        signature, data = item
+        try:
+            verify(signature, data)
+        except InvalidSignature:
+            return False
+        return True
+
+    return utils._thread_map(verify_one, list(items), max_workers)
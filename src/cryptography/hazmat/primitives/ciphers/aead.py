@@ -5,10 +5,15 @@
 from __future__ import absolute_import, division, print_function
 
 import os
+import struct
+
+import six
 
 from cryptography import exceptions, utils
 from cryptography.hazmat.backends.openssl import aead
 from cryptography.hazmat.backends.openssl.backend import backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 
 class ChaCha20Poly1305(object):
@@ -26,6 +31,7 @@ class ChaCha20Poly1305(object):
             raise ValueError("ChaCha20Poly1305 key must be 32 bytes.")
 
         self._key = key
+        self._ctx_pool = {}
 
     @classmethod
     def generate_key(cls):
@@ -46,6 +52,14 @@ class ChaCha20Poly1305(object):
             backend, self, nonce, data, associated_data, 16
         )
 
+    def encrypt_into(self, nonce, data, associated_data, buf):
+        associated_data = _check_into_params(
+            self, nonce, data, associated_data, True
+        )
+        return aead._encrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
     def decrypt(self, nonce, data, associated_data):
         if associated_data is None:
             associated_data = b""
@@ -55,6 +69,30 @@ class ChaCha20Poly1305(object):
             backend, self, nonce, data, associated_data, 16
         )
 
+    def decrypt_into(self, nonce, data, associated_data, buf):
+        associated_data = _check_into_params(
+            self, nonce, data, associated_data, False
+        )
+        return aead._decrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
+    def encrypt_batch(self, nonces, data, associated_data):
+        nonces, data, associated_data = _check_batch_params(
+            self, nonces, data, associated_data, True
+        )
+        return aead._encrypt_batch(
+            backend, self, nonces, data, associated_data, 16
+        )
+
+    def decrypt_batch(self, nonces, data, associated_data):
+        nonces, data, associated_data = _check_batch_params(
+            self, nonces, data, associated_data, False
+        )
+        return aead._decrypt_batch(
+            backend, self, nonces, data, associated_data, 16
+        )
+
     def _check_params(self, nonce, data, associated_data):
         utils._check_byteslike("nonce", nonce)
         utils._check_bytes("data", data)
@@ -72,6 +110,7 @@ class AESCCM(object):
             raise ValueError("AESCCM key must be 128, 192, or 256 bits.")
 
         self._key = key
+        self._ctx_pool = {}
         if not isinstance(tag_length, int):
             raise TypeError("tag_length must be an integer")
 
@@ -112,6 +151,16 @@ class AESCCM(object):
             backend, self, nonce, data, associated_data, self._tag_length
         )
 
+    def encrypt_into(self, nonce, data, associated_data, buf):
+        associated_data = _check_into_params(
+            self, nonce, data, associated_data, True
+        )
+        self._validate_lengths(nonce, len(data))
+        return aead._encrypt_into(
+            backend, self, nonce, data, associated_data, self._tag_length,
+            buf
+        )
+
     def decrypt(self, nonce, data, associated_data):
         if associated_data is None:
             associated_data = b""
@@ -121,6 +170,15 @@ class AESCCM(object):
             backend, self, nonce, data, associated_data, self._tag_length
         )
 
+    def decrypt_into(self, nonce, data, associated_data, buf):
+        associated_data = _check_into_params(
+            self, nonce, data, associated_data, False
+        )
+        return aead._decrypt_into(
+            backend, self, nonce, data, associated_data, self._tag_length,
+            buf
+        )
+
     def _validate_lengths(self, nonce, data_len):
         # For information about computing this, see
         # https://tools.ietf.org/html/rfc3610#section-2.1
@@ -145,6 +203,7 @@ class AESGCM(object):
             raise ValueError("AESGCM key must be 128, 192, or 256 bits.")
 
         self._key = key
+        self._ctx_pool = {}
 
     @classmethod
     def generate_key(cls, bit_length):
@@ -171,6 +230,14 @@ class AESGCM(object):
             backend, self, nonce, data, associated_data, 16
         )
 
+    def encrypt_into(self, nonce, data, associated_data, buf):
+        associated_data = _check_into_params(
+            self, nonce, data, associated_data, True
+        )
+        return aead._encrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
     def decrypt(self, nonce, data, associated_data):
         if associated_data is None:
             associated_data = b""
@@ -180,9 +247,315 @@ class AESGCM(object):
             backend, self, nonce, data, associated_data, 16
         )
 
+    def decrypt_into(self, nonce, data, associated_data, buf):
+        associated_data = _check_into_params(
+            self, nonce, data, associated_data, False
+        )
+        return aead._decrypt_into(
+            backend, self, nonce, data, associated_data, 16, buf
+        )
+
+    def encrypt_batch(self, nonces, data, associated_data):
+        nonces, data, associated_data = _check_batch_params(
+            self, nonces, data, associated_data, True
+        )
+        return aead._encrypt_batch(
+            backend, self, nonces, data, associated_data, 16
+        )
+
+    def decrypt_batch(self, nonces, data, associated_data):
+        nonces, data, associated_data = _check_batch_params(
+            self, nonces, data, associated_data, False
+        )
+        return aead._decrypt_batch(
+            backend, self, nonces, data, associated_data, 16
+        )
+
     def _check_params(self, nonce, data, associated_data):
         utils._check_byteslike("nonce", nonce)
         utils._check_bytes("data", data)
         utils._check_bytes("associated_data", associated_data)
         if len(nonce) == 0:
             raise ValueError("Nonce must be at least 1 byte")
+
+
+class StreamingAEAD(object):
+    # Each segment is sealed under nonce_prefix || counter || last_flag,
+    # following the STREAM construction of Hoang, Reyhanitabar, Rogaway and
+    # Vizar ("Online Authenticated-Encryption and its Nonce-Reuse
+    # Misuse-Resistance"). As in Tink's streaming AEAD, every stream is
+    # sealed under its own key derived with HKDF from a random salt, so
+    # random nonce prefixes colliding across streams do not reuse a nonce.
+    # The stream header is segment_size || salt || nonce_prefix.
+    _SEGMENT_SIZE_LENGTH = 4
+    _SALT_LENGTH = 16
+    _NONCE_PREFIX_LENGTH = 7
+    _HEADER_LENGTH = (
+        _SEGMENT_SIZE_LENGTH + _SALT_LENGTH + _NONCE_PREFIX_LENGTH
+    )
+    _TAG_LENGTH = 16
+    _MAX_SEGMENTS = 2 ** 32
+
+    def __init__(self, aead, segment_size=65536):
+        if not isinstance(aead, (AESGCM, ChaCha20Poly1305)):
+            raise TypeError("aead must be an AESGCM or ChaCha20Poly1305")
+
+        if not isinstance(segment_size, six.integer_types):
+            raise TypeError("segment_size must be an integer")
+
+        if not 1 <= segment_size <= aead._MAX_SIZE:
+            raise ValueError(
+                "segment_size must be between 1 and 2**32 bytes"
+            )
+
+        self._aead = aead
+        self._segment_size = segment_size
+
+    segment_size = utils.read_only_property("_segment_size")
+
+    def encryptor(self, associated_data=None):
+        header = (
+            struct.pack(">I", self._segment_size - 1) +
+            os.urandom(self._SALT_LENGTH + self._NONCE_PREFIX_LENGTH)
+        )
+        return _StreamingAEADEncryptionContext(
+            self, header, _check_associated_data(associated_data)
+        )
+
+    def decryptor(self, associated_data=None):
+        return _StreamingAEADDecryptionContext(
+            self, _check_associated_data(associated_data)
+        )
+
+    def encrypt_file(self, src, dst, associated_data=None):
+        encryptor = self.encryptor(associated_data)
+        while True:
+            data = src.read(self._segment_size)
+            if not data:
+                break
+            dst.write(encryptor.update(data))
+        dst.write(encryptor.finalize())
+
+    def decrypt_file(self, src, dst, associated_data=None):
+        decryptor = self.decryptor(associated_data)
+        while True:
+            data = src.read(self._segment_size + self._TAG_LENGTH)
+            if not data:
+                break
+            dst.write(decryptor.update(data))
+        dst.write(decryptor.finalize())
+
+    def decrypt_segment(self, src, index, associated_data=None):
+        associated_data = _check_associated_data(associated_data)
+        if not isinstance(index, six.integer_types):
+            raise TypeError("index must be an integer")
+
+        src.seek(0, os.SEEK_END)
+        body_length = src.tell() - self._HEADER_LENGTH
+        segment_length = self._segment_size + self._TAG_LENGTH
+        segment_count = (body_length + segment_length - 1) // segment_length
+        if not 0 <= index < segment_count:
+            raise IndexError("segment index out of range")
+
+        src.seek(0)
+        header = src.read(self._HEADER_LENGTH)
+        utils._check_bytes("header", header)
+        stream_aead, nonce_prefix = self._open_stream(header)
+        src.seek(self._HEADER_LENGTH + index * segment_length)
+        segment = src.read(segment_length)
+        utils._check_bytes("segment", segment)
+        return self._decrypt_segment(
+            stream_aead, nonce_prefix, index, index == segment_count - 1,
+            segment, associated_data
+        )
+
+    def _open_stream(self, header):
+        # The segment size is part of the header and of the HKDF info, so a
+        # stream can't be read back with a different segment_size.
+        segment_size_bytes = header[:self._SEGMENT_SIZE_LENGTH]
+        if segment_size_bytes != struct.pack(">I", self._segment_size - 1):
+            raise exceptions.InvalidTag
+
+        salt = header[
+            self._SEGMENT_SIZE_LENGTH:
+            self._SEGMENT_SIZE_LENGTH + self._SALT_LENGTH
+        ]
+        key = HKDF(
+            hashes.SHA256(), len(self._aead._key), salt,
+            b"cryptography StreamingAEAD" + segment_size_bytes, backend
+        ).derive(self._aead._key)
+        return type(self._aead)(key), header[-self._NONCE_PREFIX_LENGTH:]
+
+    def _segment_nonce(self, nonce_prefix, index, last):
+        if index >= self._MAX_SEGMENTS:
+            raise ValueError("Too many segments for one stream")
+        return nonce_prefix + struct.pack(">IB", index, last)
+
+    def _encrypt_segment(self, stream_aead, nonce_prefix, index, last, data,
+                         associated_data):
+        return stream_aead.encrypt(
+            self._segment_nonce(nonce_prefix, index, last), data,
+            associated_data
+        )
+
+    def _decrypt_segment(self, stream_aead, nonce_prefix, index, last, data,
+                         associated_data):
+        return stream_aead.decrypt(
+            self._segment_nonce(nonce_prefix, index, last), data,
+            associated_data
+        )
+
+
+def _check_associated_data(associated_data):
+    if associated_data is None:
+        return b""
+    utils._check_bytes("associated_data", associated_data)
+    return associated_data
+
+
+def _check_into_params(cipher, nonce, data, associated_data, encrypting):
+    if associated_data is None:
+        associated_data = b""
+
+    if encrypting and (
+        len(data) > cipher._MAX_SIZE or len(associated_data) > cipher._MAX_SIZE
+    ):
+        # This is OverflowError to match what cffi would raise
+        raise OverflowError(
+            "Data or associated data too long. Max 2**32 bytes"
+        )
+
+    cipher._check_params(nonce, data, associated_data)
+    return associated_data
+
+
+def _check_batch_params(cipher, nonces, data, associated_data, encrypting):
+    nonces = list(nonces)
+    data = list(data)
+    if associated_data is None:
+        associated_data = [b""] * len(data)
+    else:
+        associated_data = [
+            b"" if ad is None else ad for ad in associated_data
+        ]
+
+    if not len(nonces) == len(data) == len(associated_data):
+        raise ValueError(
+            "nonces, data and associated_data must have the same length"
+        )
+
+    for nonce, item, ad in zip(nonces, data, associated_data):
+        if encrypting and (
+            len(item) > cipher._MAX_SIZE or len(ad) > cipher._MAX_SIZE
+        ):
+            # This is OverflowError to match what cffi would raise
+            raise OverflowError(
+                "Data or associated data too long. Max 2**32 bytes"
+            )
+
+        cipher._check_params(nonce, item, ad)
+        if len(nonce) != len(nonces[0]):
+            raise ValueError("All nonces in a batch must be the same length")
+
+    return nonces, data, associated_data
+
+
+class _StreamingAEADEncryptionContext(object):
+    def __init__(self, stream, header, associated_data):
+        self._stream = stream
+        self._aead, self._nonce_prefix = stream._open_stream(header)
+        self._associated_data = associated_data
+        self._index = 0
+        # Data is held back until more arrives, as the final segment must be
+        # sealed with the last segment flag set.
+        self._buffer = b""
+        self._header = header
+
+    def update(self, data):
+        if self._buffer is None:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+        utils._check_bytes("data", data)
+
+        segment_size = self._stream.segment_size
+        data = self._buffer + data
+        output = [self._header]
+        self._header = b""
+        offset = 0
+        while len(data) - offset > segment_size:
+            output.append(self._stream._encrypt_segment(
+                self._aead, self._nonce_prefix, self._index, False,
+                data[offset:offset + segment_size], self._associated_data
+            ))
+            self._index += 1
+            offset += segment_size
+
+        self._buffer = data[offset:]
+        return b"".join(output)
+
+    def finalize(self):
+        if self._buffer is None:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+
+        output = self._header + self._stream._encrypt_segment(
+            self._aead, self._nonce_prefix, self._index, True, self._buffer,
+            self._associated_data
+        )
+        self._buffer = None
+        return output
+
+
+class _StreamingAEADDecryptionContext(object):
+    def __init__(self, stream, associated_data):
+        self._stream = stream
+        self._associated_data = associated_data
+        self._aead = None
+        self._nonce_prefix = None
+        self._index = 0
+        self._buffer = b""
+
+    def update(self, data):
+        if self._buffer is None:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+        utils._check_bytes("data", data)
+
+        data = self._buffer + data
+        offset = 0
+        if self._aead is None:
+            header_length = self._stream._HEADER_LENGTH
+            if len(data) < header_length:
+                self._buffer = data
+                return b""
+            self._aead, self._nonce_prefix = self._stream._open_stream(
+                data[:header_length]
+            )
+            offset = header_length
+
+        segment_length = (
+            self._stream.segment_size + self._stream._TAG_LENGTH
+        )
+        output = []
+        while len(data) - offset > segment_length:
+            output.append(self._stream._decrypt_segment(
+                self._aead, self._nonce_prefix, self._index, False,
+                data[offset:offset + segment_length], self._associated_data
+            ))
+            self._index += 1
+            offset += segment_length
+
+        self._buffer = data[offset:]
+        return b"".join(output)
+
+    def finalize(self):
+        if self._buffer is None:
+            raise exceptions.AlreadyFinalized("Context was already finalized.")
+
+        # A stream always ends with a segment flagged as the last one, so a
+        # truncated stream fails here.
+        if self._aead is None:
+            raise exceptions.InvalidTag
+        output = self._stream._decrypt_segment(
+            self._aead, self._nonce_prefix, self._index, True, self._buffer,
+            self._associated_data
+        )
+        self._buffer = None
+        return output
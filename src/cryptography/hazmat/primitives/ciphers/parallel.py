@@ -0,0 +1,152 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+
+import six
+
+from cryptography import utils
+from cryptography.hazmat.primitives.ciphers import modes
+from cryptography.hazmat.primitives.ciphers.base import Cipher
+
+
+# Work is handed to the thread pool in tasks of roughly this many bytes, which
+# is large enough that the time spent in OpenSSL (where the GIL is released)
+# dwarfs the per-task overhead in Python.
+_TASK_SIZE = 1024 * 1024
+
+
+class ParallelCipher(object):
+    def __init__(self, algorithm, mode, backend, data_unit_size=None,
+                 max_workers=None):
+        if isinstance(mode, modes.CTR):
+            if data_unit_size is not None:
+                raise ValueError("data_unit_size is only used with XTS")
+            # Every task but the last must cover whole counter blocks.
+            unit_size = algorithm.block_size // 8
+        elif isinstance(mode, modes.XTS):
+            if not isinstance(data_unit_size, six.integer_types):
+                raise TypeError("data_unit_size must be an integer")
+            if data_unit_size < 16:
+                raise ValueError("data_unit_size must be at least 16 bytes")
+            unit_size = data_unit_size
+        else:
+            raise TypeError("mode must be CTR or XTS")
+
+        max_workers = utils._check_max_workers(max_workers)
+
+        # Checks the key and mode before any work is started.
+        Cipher(algorithm, mode, backend)
+
+        self._algorithm = algorithm
+        self._mode = mode
+        self._backend = backend
+        self._unit_size = unit_size
+        self._task_size = max(_TASK_SIZE // unit_size, 1) * unit_size
+        self._max_workers = max_workers
+
+    def encrypt(self, data):
+        buf = bytearray(len(data))
+        self.encrypt_into(data, buf)
+        return bytes(buf)
+
+    def decrypt(self, data):
+        buf = bytearray(len(data))
+        self.decrypt_into(data, buf)
+        return bytes(buf)
+
+    def encrypt_into(self, data, buf):
+        return self._process_into(data, buf, True)
+
+    def decrypt_into(self, data, buf):
+        return self._process_into(data, buf, False)
+
+    def _process_into(self, data, buf, encrypt):
+        utils._check_byteslike("data", data)
+        if len(buf) < len(data):
+            raise ValueError(
+                "buffer must be at least {} bytes for this "
+                "payload".format(len(data))
+            )
+
+        if isinstance(self._mode, modes.XTS) and 0 < (
+            len(data) % self._unit_size
+        ) < 16:
+            raise ValueError(
+                "The final data unit must be at least 16 bytes long"
+            )
+
+        data = memoryview(data)
+        buf = memoryview(buf)
+        offsets = list(six.moves.range(0, len(data), self._task_size))
+
+        def process(offset):
+            self._process_task(data, buf, offset, encrypt)
+
+        utils._thread_map(process, offsets, self._max_workers)
+        return len(data)
+
+    def _counter_at(self, offset):
+        # OpenSSL treats the whole nonce as a big-endian counter that is
+        # incremented once per block.
+        width = len(self._mode.nonce)
+        counter = utils.int_from_bytes(
+            bytes(bytearray(self._mode.nonce)), "big"
+        ) + offset // width
+        return utils.int_to_bytes(counter % 2 ** (8 * width), width)
+
+    def _tweak_at(self, index):
+        # Data units are numbered from the tweak, read as a little-endian
+        # integer as in IEEE 1619.
+        tweak = utils.int_from_bytes(
+            bytes(bytearray(self._mode.tweak))[::-1], "big"
+        ) + index
+        return utils.int_to_bytes(tweak % 2 ** 128, 16)[::-1]
+
+    def _process_task(self, data, buf, offset, encrypt):
+        end = min(offset + self._task_size, len(data))
+        if isinstance(self._mode, modes.CTR):
+            self._process_unit(
+                data, buf, offset, end, modes.CTR(self._counter_at(offset)),
+                encrypt
+            )
+            return
+
+        tweak = self._tweak_at(offset // self._unit_size)
+        ctx = self._create_ctx(modes.XTS(tweak), encrypt)
+        update_xts_units = getattr(ctx, "_update_xts_units", None)
+        if update_xts_units is not None:
+            update_xts_units(
+                tweak, self._unit_size, data[offset:end], buf[offset:end]
+            )
+            return
+
+        index = offset // self._unit_size
+        for start in six.moves.range(offset, end, self._unit_size):
+            self._process_unit(
+                data, buf, start, min(start + self._unit_size, end),
+                modes.XTS(self._tweak_at(index)), encrypt
+            )
+            index += 1
+
+    def _create_ctx(self, mode, encrypt):
+        if encrypt:
+            return self._backend.create_symmetric_encryption_ctx(
+                self._algorithm, mode
+            )
+        else:
+            return self._backend.create_symmetric_decryption_ctx(
+                self._algorithm, mode
+            )
+
+    def _process_unit(self, data, buf, start, end, mode, encrypt):
+        ctx = self._create_ctx(mode, encrypt)
+        # update_into wants block_size - 1 bytes of slack after the output,
+        # which is only missing at the very end of buf.
+        if len(buf) - end >= self._algorithm.block_size // 8 - 1:
+            ctx.update_into(data[start:end], buf[start:])
+        else:
+            buf[start:end] = ctx.update(data[start:end])
+        ctx.finalize()
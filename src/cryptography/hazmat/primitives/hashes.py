@@ -5,6 +5,8 @@
 from __future__ import absolute_import, division, print_function
 
 import abc
+import mmap
+import os
 
 import six
 
@@ -107,6 +109,94 @@ class Hash(object):
         return digest
 
 
+def digest(algorithm, data, backend):
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+    utils._check_byteslike("data", data)
+
+    hash_digest = getattr(backend, "hash_digest", None)
+    if hash_digest is not None:
+        return hash_digest(algorithm, data)
+
+    # Backends without a one-shot digest go through a hash context.
+    h = Hash(algorithm, backend)
+    h.update(data)
+    return h.finalize()
+
+
+def digest_many(algorithm, data, backend):
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+    data = list(data)
+    for item in data:
+        utils._check_byteslike("data", item)
+
+    hash_digest_many = getattr(backend, "hash_digest_many", None)
+    if hash_digest_many is not None:
+        return hash_digest_many(algorithm, data)
+
+    return b"".join(digest(algorithm, item, backend) for item in data)
+
+
+def hash_file(algorithm, src, backend, chunk_size=65536):
+    if not isinstance(chunk_size, six.integer_types):
+        raise TypeError("chunk_size must be an integer")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    h = Hash(algorithm, backend)
+    if hasattr(src, "read"):
+        _hash_fileobj(h, src, chunk_size)
+    else:
+        with open(src, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                # mmap can't map an empty file, and there may be nothing to
+                # map anyway if this isn't a regular file.
+                _hash_fileobj(h, f, chunk_size)
+            else:
+                # Hashing the mapping in one update avoids copying the file
+                # through Python objects at all.
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                try:
+                    h.update(mapped)
+                finally:
+                    mapped.close()
+    return h.finalize()
+
+
+def _hash_fileobj(h, f, chunk_size):
+    buf = bytearray(chunk_size)
+    view = memoryview(buf)
+    while True:
+        n = f.readinto(buf)
+        if not n:
+            break
+        h.update(view[:n])
+
+
+def hash_files(algorithm, srcs, backend, chunk_size=65536, max_workers=None):
+    srcs = list(srcs)
+    max_workers = utils._check_max_workers(max_workers)
+
+    def hash_one(src):
+        return hash_file(algorithm, src, backend, chunk_size)
+
+    return utils._thread_map(hash_one, srcs, max_workers)
+
+
 @utils.register_interface(HashAlgorithm)
 class SHA1(object):
     name = "sha1"
@@ -6,10 +6,10 @@ from __future__ import absolute_import, division, print_function
 
 from cryptography import utils
 from cryptography.exceptions import (
-    AlreadyFinalized, UnsupportedAlgorithm, _Reasons
+    AlreadyFinalized, InvalidSignature, UnsupportedAlgorithm, _Reasons
 )
 from cryptography.hazmat.backends.interfaces import HMACBackend
-from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives import constant_time, hashes
 
 
 @utils.register_interface(hashes.HashContext)
@@ -64,3 +64,64 @@ class HMAC(object):
 
         ctx, self._ctx = self._ctx, None
         ctx.verify(signature)
+
+
+class HMACKey(object):
+    def __init__(self, key, algorithm, backend):
+        # Validates the arguments and sets up the key the same way HMAC does.
+        h = HMAC(key, algorithm, backend)
+        self._key = key
+        self._algorithm = algorithm
+        self._backend = backend
+        # A keyed context that is never updated, only copied.
+        self._ctx = h._ctx
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    def new(self):
+        return HMAC(
+            self._key, self._algorithm, self._backend, ctx=self._ctx.copy()
+        )
+
+    def sign(self, data):
+        utils._check_byteslike("data", data)
+        copy_digest = getattr(self._ctx, "_copy_digest", None)
+        if copy_digest is not None:
+            return copy_digest(data)
+
+        ctx = self._ctx.copy()
+        ctx.update(data)
+        return ctx.finalize()
+
+    def verify(self, data, signature):
+        utils._check_bytes("signature", signature)
+        if not constant_time.bytes_eq(self.sign(data), signature):
+            raise InvalidSignature("Signature did not match digest.")
+
+
+def digest_many(key, algorithm, data, backend):
+    if not isinstance(backend, HMACBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HMACBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, hashes.HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+    data = list(data)
+    for item in data:
+        utils._check_byteslike("data", item)
+
+    hmac_digest_many = getattr(backend, "hmac_digest_many", None)
+    if hmac_digest_many is not None:
+        return hmac_digest_many(key, algorithm, data)
+
+    # Backends without batch support key a context once and copy it for
+    # each buffer.
+    keyed = HMAC(key, algorithm, backend)
+    tags = []
+    for item in data:
+        h = keyed.copy()
+        h.update(item)
+        tags.append(h.finalize())
+    return b"".join(tags)
@@ -12,7 +12,7 @@ from cryptography.exceptions import (
 )
 from cryptography.hazmat.backends.interfaces import HMACBackend
 from cryptography.hazmat.backends.interfaces import HashBackend
-from cryptography.hazmat.primitives import constant_time, hashes, hmac
+from cryptography.hazmat.primitives import constant_time, hmac
 from cryptography.hazmat.primitives.kdf import KeyDerivationFunction
 
 
@@ -31,20 +31,32 @@ def _common_args_checks(algorithm, length, otherinfo):
         utils._check_bytes("otherinfo", otherinfo)
 
 
-def _concatkdf_derive(key_material, length, auxfn, otherinfo):
-    utils._check_byteslike("key_material", key_material)
-    output = [b""]
-    outlen = 0
-    counter = 1
+def _otherinfo(otherinfo, default):
+    if otherinfo is None:
+        return default
+
+    utils._check_bytes("otherinfo", otherinfo)
+    return otherinfo
 
-    while (length > outlen):
-        h = auxfn()
+
+def _concatkdf_derive(key_material, length, ctx, otherinfo):
+    utils._check_byteslike("key_material", key_material)
+    # Every block is H(counter || key_material || otherinfo), so each one
+    # starts from a copy of the backend context ctx, which is never updated,
+    # and only the counter differs between blocks.
+    suffix = bytes(key_material) + otherinfo
+    count = -(-length // ctx.algorithm.digest_size)
+
+    counter_digest = getattr(ctx, "_counter_digest", None)
+    if counter_digest is not None:
+        return counter_digest(suffix, count)[:length]
+
+    output = []
+    for counter in range(1, count + 1):
+        h = ctx.copy()
         h.update(_int_to_u32be(counter))
-        h.update(key_material)
-        h.update(otherinfo)
+        h.update(suffix)
         output.append(h.finalize())
-        outlen += len(output[-1])
-        counter += 1
 
     return b"".join(output)[:length]
 
@@ -69,14 +81,17 @@ class ConcatKDFHash(object):
         self._used = False
 
     def _hash(self):
-        return hashes.Hash(self._algorithm, self._backend)
+        return self._backend.create_hash_ctx(self._algorithm)
 
     def derive(self, key_material):
         if self._used:
             raise AlreadyFinalized
         self._used = True
-        return _concatkdf_derive(key_material, self._length,
-                                 self._hash, self._otherinfo)
+        return self.derive_with(key_material)
+
+    def derive_with(self, key_material, otherinfo=None):
+        return _concatkdf_derive(key_material, self._length, self._hash(),
+                                 _otherinfo(otherinfo, self._otherinfo))
 
     def verify(self, key_material, expected_key):
         if not constant_time.bytes_eq(self.derive(key_material), expected_key):
@@ -109,15 +124,17 @@ class ConcatKDFHMAC(object):
         self._backend = backend
         self._used = False
 
-    def _hmac(self):
-        return hmac.HMAC(self._salt, self._algorithm, self._backend)
-
     def derive(self, key_material):
         if self._used:
             raise AlreadyFinalized
         self._used = True
-        return _concatkdf_derive(key_material, self._length,
-                                 self._hmac, self._otherinfo)
+        return self.derive_with(key_material)
+
+    def derive_with(self, key_material, otherinfo=None):
+        # Each round copies a context that was keyed with the salt once.
+        keyed = hmac.HMACKey(self._salt, self._algorithm, self._backend)
+        return _concatkdf_derive(key_material, self._length, keyed._ctx,
+                                 _otherinfo(otherinfo, self._otherinfo))
 
     def verify(self, key_material, expected_key):
         if not constant_time.bytes_eq(self.derive(key_material), expected_key):
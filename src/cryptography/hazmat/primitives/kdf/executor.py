@@ -0,0 +1,143 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import atexit
+import threading
+from multiprocessing.pool import ThreadPool
+
+import six
+
+from cryptography import utils
+from cryptography.exceptions import InvalidKey
+from cryptography.hazmat.primitives import constant_time
+
+
+class KDFExecutor(object):
+    def __init__(self, max_workers=None, memory_limit=None):
+        max_workers = utils._check_max_workers(max_workers)
+
+        if memory_limit is not None:
+            if not isinstance(memory_limit, six.integer_types):
+                raise TypeError("memory_limit must be an integer")
+            if memory_limit < 1:
+                raise ValueError("memory_limit must be at least 1")
+
+        self._max_workers = max_workers
+        self._memory_limit = memory_limit
+        self._memory_in_use = 0
+        self._memory_released = threading.Condition()
+        self._pool = ThreadPool(max_workers)
+
+    max_workers = utils.read_only_property("_max_workers")
+    memory_limit = utils.read_only_property("_memory_limit")
+
+    def shutdown(self):
+        self._pool.close()
+        self._pool.join()
+
+    def _submit(self, memory, fn, *args):
+        if self._memory_limit is not None and memory > self._memory_limit:
+            raise ValueError(
+                "This derivation needs {} bytes of memory, which is more than "
+                "the executor's memory_limit".format(memory)
+            )
+
+        loop = _get_running_loop()
+        future = loop.create_future()
+
+        def done(outcome):
+            # This runs on the pool's result handler thread. If the loop was
+            # closed while the derivation ran there is nobody left to tell,
+            # and letting the error escape would kill the handler thread and
+            # leave every later derivation on this executor unresolved.
+            if loop.is_closed():
+                return
+            try:
+                loop.call_soon_threadsafe(_resolve, future, outcome)
+            except RuntimeError:
+                # The loop was closed after the check above.
+                pass
+
+        self._pool.apply_async(self._call, (memory, fn, args), callback=done)
+        return future
+
+    def _call(self, memory, fn, args):
+        # Workers wait here until the derivation fits in memory_limit, which
+        # holds back memory hungry scrypt calls without rejecting them.
+        with self._memory_released:
+            while (
+                self._memory_limit is not None and
+                self._memory_in_use + memory > self._memory_limit
+            ):
+                self._memory_released.wait()
+            self._memory_in_use += memory
+
+        try:
+            return True, fn(*args)
+        except Exception as e:
+            return False, e
+        finally:
+            with self._memory_released:
+                self._memory_in_use -= memory
+                self._memory_released.notify_all()
+
+
+def _get_running_loop():
+    # asyncio is only available on Python 3.
+    import asyncio
+
+    # get_running_loop was added in Python 3.7. get_event_loop is deprecated
+    # outside a running loop, so only fall back to it where it is needed.
+    get_running_loop = getattr(asyncio, "get_running_loop", None)
+    if get_running_loop is not None:
+        return get_running_loop()
+    return asyncio.get_event_loop()
+
+
+def _resolve(future, outcome):
+    # The caller may have stopped waiting while the derivation was running.
+    if future.cancelled():
+        return
+
+    ok, value = outcome
+    if ok:
+        future.set_result(value)
+    else:
+        future.set_exception(value)
+
+
+_default_executor = None
+_default_executor_lock = threading.Lock()
+
+
+def _get_executor(executor):
+    global _default_executor
+
+    if executor is not None:
+        if not isinstance(executor, KDFExecutor):
+            raise TypeError("executor must be a KDFExecutor instance")
+        return executor
+
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = KDFExecutor()
+            atexit.register(_default_executor.shutdown)
+        return _default_executor
+
+
+def _verify(derive, key_material, expected_key):
+    if not constant_time.bytes_eq(derive(key_material), expected_key):
+        raise InvalidKey("Keys do not match.")
+
+
+def _derive_async(executor, memory, derive, key_material):
+    return _get_executor(executor)._submit(memory, derive, key_material)
+
+
+def _verify_async(executor, memory, derive, key_material, expected_key):
+    return _get_executor(executor)._submit(
+        memory, _verify, derive, key_material, expected_key
+    )
@@ -15,37 +15,94 @@ from cryptography.hazmat.primitives import constant_time, hmac
 from cryptography.hazmat.primitives.kdf import KeyDerivationFunction
 
 
+def _check_backend(backend):
+    if not isinstance(backend, HMACBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HMACBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+
+def _check_salt(algorithm, salt):
+    if salt is None:
+        return b"\x00" * algorithm.digest_size
+
+    utils._check_bytes("salt", salt)
+    return salt
+
+
+def _check_length(algorithm, length):
+    max_length = 255 * algorithm.digest_size
+
+    if length > max_length:
+        raise ValueError(
+            "Can not derive keys larger than {} octets.".format(
+                max_length
+            ))
+
+    return length
+
+
+def _check_info(info):
+    if info is None:
+        return b""
+
+    utils._check_bytes("info", info)
+    return info
+
+
+def _check_outputs(algorithm, outputs):
+    return [
+        (_check_info(info), _check_length(algorithm, length))
+        for info, length in outputs
+    ]
+
+
+def _extract(algorithm, salt, key_material, backend):
+    h = hmac.HMAC(salt, algorithm, backend=backend)
+    h.update(key_material)
+    return h.finalize()
+
+
+def _expand(keyed, info, length):
+    # The PRK is keyed into a single HMAC context up front, which each output
+    # block then copies instead of setting up the key again.
+    output = [b""]
+    counter = 1
+
+    while keyed.algorithm.digest_size * (len(output) - 1) < length:
+        output.append(keyed.sign(output[-1] + info + six.int2byte(counter)))
+        counter += 1
+
+    return b"".join(output)[:length]
+
+
 @utils.register_interface(KeyDerivationFunction)
 class HKDF(object):
     def __init__(self, algorithm, length, salt, info, backend):
-        if not isinstance(backend, HMACBackend):
-            raise UnsupportedAlgorithm(
-                "Backend object does not implement HMACBackend.",
-                _Reasons.BACKEND_MISSING_INTERFACE
-            )
+        _check_backend(backend)
 
         self._algorithm = algorithm
-
-        if salt is None:
-            salt = b"\x00" * self._algorithm.digest_size
-        else:
-            utils._check_bytes("salt", salt)
-
-        self._salt = salt
+        self._salt = _check_salt(algorithm, salt)
 
         self._backend = backend
 
         self._hkdf_expand = HKDFExpand(self._algorithm, length, info, backend)
 
     def _extract(self, key_material):
-        h = hmac.HMAC(self._salt, self._algorithm, backend=self._backend)
-        h.update(key_material)
-        return h.finalize()
+        return _extract(self._algorithm, self._salt, key_material,
+                        self._backend)
 
     def derive(self, key_material):
         utils._check_byteslike("key_material", key_material)
         return self._hkdf_expand.derive(self._extract(key_material))
 
+    def derive_with(self, key_material, info=None):
+        utils._check_byteslike("key_material", key_material)
+        return self._hkdf_expand.derive_with(
+            self._extract(key_material), info
+        )
+
     def verify(self, key_material, expected_key):
         if not constant_time.bytes_eq(self.derive(key_material), expected_key):
             raise InvalidKey
@@ -54,57 +111,48 @@ class HKDF(object):
 @utils.register_interface(KeyDerivationFunction)
 class HKDFExpand(object):
     def __init__(self, algorithm, length, info, backend):
-        if not isinstance(backend, HMACBackend):
-            raise UnsupportedAlgorithm(
-                "Backend object does not implement HMACBackend.",
-                _Reasons.BACKEND_MISSING_INTERFACE
-            )
+        _check_backend(backend)
 
         self._algorithm = algorithm
 
         self._backend = backend
-
-        max_length = 255 * algorithm.digest_size
-
-        if length > max_length:
-            raise ValueError(
-                "Can not derive keys larger than {} octets.".format(
-                    max_length
-                ))
-
-        self._length = length
-
-        if info is None:
-            info = b""
-        else:
-            utils._check_bytes("info", info)
-
-        self._info = info
-
+        self._length = _check_length(algorithm, length)
+        self._info = _check_info(info)
         self._used = False
 
-    def _expand(self, key_material):
-        output = [b""]
-        counter = 1
-
-        while self._algorithm.digest_size * (len(output) - 1) < self._length:
-            h = hmac.HMAC(key_material, self._algorithm, backend=self._backend)
-            h.update(output[-1])
-            h.update(self._info)
-            h.update(six.int2byte(counter))
-            output.append(h.finalize())
-            counter += 1
-
-        return b"".join(output)[:self._length]
-
     def derive(self, key_material):
         utils._check_byteslike("key_material", key_material)
         if self._used:
             raise AlreadyFinalized
 
         self._used = True
-        return self._expand(key_material)
+        return self.derive_with(key_material)
+
+    def derive_with(self, key_material, info=None):
+        utils._check_byteslike("key_material", key_material)
+        info = self._info if info is None else _check_info(info)
+        keyed = hmac.HMACKey(key_material, self._algorithm, self._backend)
+        return _expand(keyed, info, self._length)
 
     def verify(self, key_material, expected_key):
         if not constant_time.bytes_eq(self.derive(key_material), expected_key):
             raise InvalidKey
+
+
+def expand_many(algorithm, key_material, outputs, backend):
+    _check_backend(backend)
+    utils._check_byteslike("key_material", key_material)
+    outputs = _check_outputs(algorithm, outputs)
+    keyed = hmac.HMACKey(key_material, algorithm, backend)
+    return [_expand(keyed, info, length) for info, length in outputs]
+
+
+def derive_many(algorithm, key_material, salt, outputs, backend):
+    _check_backend(backend)
+    utils._check_byteslike("key_material", key_material)
+    salt = _check_salt(algorithm, salt)
+    outputs = _check_outputs(algorithm, outputs)
+    keyed = hmac.HMACKey(
+        _extract(algorithm, salt, key_material, backend), algorithm, backend
+    )
+    return [_expand(keyed, info, length) for info, length in outputs]
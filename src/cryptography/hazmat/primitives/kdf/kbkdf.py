@@ -102,6 +102,23 @@ class KBKDFHMAC(object):
 
         utils._check_byteslike("key_material", key_material)
         self._used = True
+        return self.derive_with(key_material)
+
+    def derive_with(self, key_material, label=None, context=None):
+        utils._check_byteslike("key_material", key_material)
+        if label is None:
+            label = self._label
+        else:
+            utils._check_bytes("label", label)
+
+        if context is None:
+            context = self._context
+        else:
+            utils._check_bytes("context", context)
+
+        if self._fixed_data and (label or context):
+            raise ValueError("When supplying fixed data, "
+                             "label and context are ignored.")
 
         # inverse floor division (equivalent to ceiling)
         rounds = -(-self._length // self._algorithm.digest_size)
@@ -116,29 +133,25 @@ class KBKDFHMAC(object):
         if rounds > pow(2, len(r_bin) * 8) - 1:
             raise ValueError('There are too many iterations.')
 
-        for i in range(1, rounds + 1):
-            h = hmac.HMAC(key_material, self._algorithm, backend=self._backend)
+        keyed = hmac.HMACKey(key_material, self._algorithm, self._backend)
+        fixed = self._generate_fixed_input(label, context)
 
+        for i in range(1, rounds + 1):
             counter = utils.int_to_bytes(i, self._rlen)
             if self._location == CounterLocation.BeforeFixed:
-                h.update(counter)
-
-            h.update(self._generate_fixed_input())
-
-            if self._location == CounterLocation.AfterFixed:
-                h.update(counter)
-
-            output.append(h.finalize())
+                output.append(keyed.sign(counter + fixed))
+            else:
+                output.append(keyed.sign(fixed + counter))
 
         return b''.join(output)[:self._length]
 
-    def _generate_fixed_input(self):
+    def _generate_fixed_input(self, label, context):
         if self._fixed_data and isinstance(self._fixed_data, bytes):
             return self._fixed_data
 
         l_val = utils.int_to_bytes(self._length * 8, self._llen)
 
-        return b"".join([self._label, b"\x00", self._context, l_val])
+        return b"".join([label, b"\x00", context, l_val])
 
     def verify(self, key_material, expected_key):
         if not constant_time.bytes_eq(self.derive(key_material), expected_key):
@@ -0,0 +1,260 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import base64
+import os
+import re
+import timeit
+
+import six
+
+from cryptography import utils
+from cryptography.exceptions import InvalidKey
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+
+# Hashes are serialized in the PHC string format, described at
+# https://github.com/P-H-C/phc-string-format/blob/master/phc-sf-spec.md
+_PHC_RE = re.compile(
+    r"^\$(?P<id>[a-z0-9-]{1,32})"
+    r"\$(?P<params>[a-z0-9-]{1,32}=[a-zA-Z0-9/+.-]+"
+    r"(?:,[a-z0-9-]{1,32}=[a-zA-Z0-9/+.-]+)*)"
+    r"\$(?P<salt>[a-zA-Z0-9/+]+)"
+    r"\$(?P<hash>[a-zA-Z0-9/+]+)$"
+)
+
+# ScryptHasher.tune never picks parameters that need more memory than this
+# for a single hash.
+_SCRYPT_TUNE_MEMORY_LIMIT = 1024 ** 3
+
+_PBKDF2_ALGORITHMS = {
+    "pbkdf2-sha1": hashes.SHA1,
+    "pbkdf2-sha256": hashes.SHA256,
+    "pbkdf2-sha512": hashes.SHA512,
+}
+
+
+def _b64encode(data):
+    return base64.b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data):
+    if len(data) % 4 == 1:
+        raise ValueError("Invalid PHC string.")
+    return base64.b64decode(data + "=" * (-len(data) % 4))
+
+
+def _parse_int(params, name):
+    value = params.get(name)
+    if value is None or not value.isdigit() or len(value) > 10:
+        raise ValueError("Invalid PHC string.")
+    return int(value)
+
+
+def _parse(phc):
+    if isinstance(phc, bytes):
+        phc = phc.decode("ascii")
+    elif not isinstance(phc, six.text_type):
+        raise TypeError("phc must be a string")
+
+    match = _PHC_RE.match(phc)
+    if match is None:
+        raise ValueError("Invalid PHC string.")
+
+    params = {}
+    for param in match.group("params").split(","):
+        name, value = param.split("=", 1)
+        if name in params:
+            raise ValueError("Invalid PHC string.")
+        params[name] = value
+
+    identifier = match.group("id")
+    salt = _b64decode(match.group("salt"))
+    key = _b64decode(match.group("hash"))
+    if identifier == "scrypt":
+        if set(params) != {"ln", "r", "p"}:
+            raise ValueError("Invalid PHC string.")
+        cost = (
+            _parse_int(params, "ln"), _parse_int(params, "r"),
+            _parse_int(params, "p")
+        )
+    elif identifier in _PBKDF2_ALGORITHMS:
+        if set(params) != {"i"}:
+            raise ValueError("Invalid PHC string.")
+        cost = (_parse_int(params, "i"),)
+    else:
+        raise ValueError(
+            "Unsupported password hash: {}".format(identifier)
+        )
+
+    return identifier, cost, salt, key
+
+
+def _kdf(identifier, cost, salt, length, backend):
+    if identifier == "scrypt":
+        ln, r, p = cost
+        if not 1 <= ln < 64:
+            raise ValueError("Invalid PHC string.")
+        return Scrypt(salt, length, 1 << ln, r, p, backend)
+    else:
+        return PBKDF2HMAC(
+            _PBKDF2_ALGORITHMS[identifier](), length, salt, cost[0], backend
+        )
+
+
+def _check_salt_length(salt_length, length):
+    if not isinstance(salt_length, six.integer_types):
+        raise TypeError("salt_length must be an integer")
+    if salt_length < 8:
+        raise ValueError("salt_length must be at least 8")
+    if not isinstance(length, six.integer_types):
+        raise TypeError("length must be an integer")
+    if length < 16:
+        raise ValueError("length must be at least 16")
+
+
+def _time(kdf):
+    start = timeit.default_timer()
+    kdf.derive(b"password")
+    return timeit.default_timer() - start
+
+
+class _PasswordHasher(object):
+    def hash(self, password):
+        utils._check_byteslike("password", password)
+        salt = os.urandom(self._salt_length)
+        key = _kdf(
+            self._identifier, self._cost, salt, self._length, self._backend
+        ).derive(password)
+        return u"${}${}${}${}".format(
+            self._identifier, self._params(), _b64encode(salt),
+            _b64encode(key)
+        )
+
+    def verify(self, password, phc):
+        verify(password, phc, self._backend)
+
+    def needs_rehash(self, phc):
+        identifier, cost, salt, key = _parse(phc)
+        return (
+            identifier != self._identifier or
+            cost != self._cost or
+            len(salt) != self._salt_length or
+            len(key) != self._length
+        )
+
+
+class ScryptHasher(_PasswordHasher):
+    def __init__(self, n, r, p, backend, salt_length=16, length=32):
+        # Checks the parameters the same way Scrypt does.
+        Scrypt(b"\x00" * 8, length, n, r, p, backend)
+        _check_salt_length(salt_length, length)
+
+        self._identifier = "scrypt"
+        self._cost = (n.bit_length() - 1, r, p)
+        self._n = n
+        self._r = r
+        self._p = p
+        self._backend = backend
+        self._salt_length = salt_length
+        self._length = length
+
+    n = utils.read_only_property("_n")
+    r = utils.read_only_property("_r")
+    p = utils.read_only_property("_p")
+
+    def _params(self):
+        return "ln={},r={},p={}".format(*self._cost)
+
+    @classmethod
+    def tune(cls, duration, backend, r=8, p=1):
+        # The time scrypt takes is proportional to n, which is doubled until
+        # doubling it again would take longer than duration or need more
+        # memory, as OpenSSL computes it, than the limit.
+        n = 1 << 10
+        elapsed = _time(Scrypt(b"\x00" * 16, 32, n, r, p, backend))
+        while elapsed * 2 <= duration:
+            kdf = Scrypt(b"\x00" * 16, 32, n << 1, r, p, backend)
+            if kdf._memory_required() > _SCRYPT_TUNE_MEMORY_LIMIT:
+                break
+            n <<= 1
+            elapsed = _time(kdf)
+        return cls(n, r, p, backend)
+
+
+class PBKDF2Hasher(_PasswordHasher):
+    def __init__(self, algorithm, iterations, backend, salt_length=16,
+                 length=32):
+        if not isinstance(algorithm, hashes.HashAlgorithm):
+            raise TypeError("Expected instance of hashes.HashAlgorithm.")
+        identifier = "pbkdf2-{}".format(algorithm.name)
+        if identifier not in _PBKDF2_ALGORITHMS:
+            raise ValueError("algorithm must be SHA1, SHA256 or SHA512")
+        if not isinstance(iterations, six.integer_types):
+            raise TypeError("iterations must be an integer")
+        if iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        # Checks the backend the same way PBKDF2HMAC does.
+        PBKDF2HMAC(algorithm, length, b"\x00" * 8, iterations, backend)
+        _check_salt_length(salt_length, length)
+
+        self._identifier = identifier
+        self._cost = (iterations,)
+        self._algorithm = algorithm
+        self._iterations = iterations
+        self._backend = backend
+        self._salt_length = salt_length
+        self._length = length
+
+    algorithm = utils.read_only_property("_algorithm")
+    iterations = utils.read_only_property("_iterations")
+
+    def _params(self):
+        return "i={}".format(self._iterations)
+
+    @classmethod
+    def tune(cls, algorithm, duration, backend):
+        # PBKDF2 takes time proportional to the iteration count, so one
+        # measurement is scaled to the target duration.
+        iterations = 10000
+        elapsed = _time(
+            PBKDF2HMAC(algorithm, 32, b"\x00" * 16, iterations, backend)
+        )
+        return cls(
+            algorithm, max(int(iterations * duration / elapsed), 1), backend
+        )
+
+
+def verify(password, phc, backend):
+    utils._check_byteslike("password", password)
+    identifier, cost, salt, key = _parse(phc)
+    _kdf(identifier, cost, salt, len(key), backend).verify(password, key)
+
+
+def verify_many(pairs, backend, max_workers=None):
+    max_workers = utils._check_max_workers(max_workers)
+
+    # Everything is parsed up front so that a malformed hash is reported
+    # before any work is done.
+    kdfs = []
+    for password, phc in pairs:
+        utils._check_byteslike("password", password)
+        identifier, cost, salt, key = _parse(phc)
+        kdfs.append(
+            (_kdf(identifier, cost, salt, len(key), backend), password, key)
+        )
+
+    def verify_one(item):
+        kdf, password, key = item
+        try:
+            kdf.verify(password, key)
+        except InvalidKey:
+            return False
+        return True
+
+    return utils._thread_map(verify_one, kdfs, max_workers)
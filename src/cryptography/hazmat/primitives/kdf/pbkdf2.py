@@ -11,6 +11,9 @@ from cryptography.exceptions import (
 from cryptography.hazmat.backends.interfaces import PBKDF2HMACBackend
 from cryptography.hazmat.primitives import constant_time
 from cryptography.hazmat.primitives.kdf import KeyDerivationFunction
+from cryptography.hazmat.primitives.kdf.executor import (
+    _derive_async, _verify_async
+)
 
 
 @utils.register_interface(KeyDerivationFunction)
@@ -36,16 +39,31 @@ class PBKDF2HMAC(object):
         self._iterations = iterations
         self._backend = backend
 
-    def derive(self, key_material):
+    def _use(self):
         if self._used:
             raise AlreadyFinalized("PBKDF2 instances can only be used once.")
         self._used = True
 
+    def derive(self, key_material):
+        self._use()
+        return self.derive_with(key_material)
+
+    def derive_async(self, key_material, executor=None):
+        self._use()
+        utils._check_byteslike("key_material", key_material)
+        return _derive_async(executor, 0, self.derive_with, key_material)
+
+    def derive_with(self, key_material, salt=None):
         utils._check_byteslike("key_material", key_material)
+        if salt is None:
+            salt = self._salt
+        else:
+            utils._check_bytes("salt", salt)
+
         return self._backend.derive_pbkdf2_hmac(
             self._algorithm,
             self._length,
-            self._salt,
+            salt,
             self._iterations,
             key_material
         )
@@ -54,3 +72,10 @@ class PBKDF2HMAC(object):
         derived_key = self.derive(key_material)
         if not constant_time.bytes_eq(derived_key, expected_key):
             raise InvalidKey("Keys do not match.")
+
+    def verify_async(self, key_material, expected_key, executor=None):
+        self._use()
+        utils._check_byteslike("key_material", key_material)
+        return _verify_async(
+            executor, 0, self.derive_with, key_material, expected_key
+        )
@@ -13,6 +13,9 @@ from cryptography.exceptions import (
 from cryptography.hazmat.backends.interfaces import ScryptBackend
 from cryptography.hazmat.primitives import constant_time
 from cryptography.hazmat.primitives.kdf import KeyDerivationFunction
+from cryptography.hazmat.primitives.kdf.executor import (
+    _derive_async, _verify_async
+)
 
 
 # This is used by the scrypt tests to skip tests that require more memory
@@ -47,17 +50,47 @@ class Scrypt(object):
         self._p = p
         self._backend = backend
 
-    def derive(self, key_material):
+    def _use(self):
         if self._used:
             raise AlreadyFinalized("Scrypt instances can only be used once.")
         self._used = True
 
+    def _memory_required(self):
+        # The same calculation OpenSSL uses to check maxmem, see
+        # crypto/evp/pbe_scrypt.c.
+        return 128 * self._r * (self._n + 2 + self._p)
+
+    def derive(self, key_material):
+        self._use()
+        return self.derive_with(key_material)
+
+    def derive_async(self, key_material, executor=None):
+        self._use()
+        utils._check_byteslike("key_material", key_material)
+        return _derive_async(
+            executor, self._memory_required(), self.derive_with, key_material
+        )
+
+    def derive_with(self, key_material, salt=None):
         utils._check_byteslike("key_material", key_material)
+        if salt is None:
+            salt = self._salt
+        else:
+            utils._check_bytes("salt", salt)
+
         return self._backend.derive_scrypt(
-            key_material, self._salt, self._length, self._n, self._r, self._p
+            key_material, salt, self._length, self._n, self._r, self._p
         )
 
     def verify(self, key_material, expected_key):
         derived_key = self.derive(key_material)
         if not constant_time.bytes_eq(derived_key, expected_key):
             raise InvalidKey("Keys do not match.")
+
+    def verify_async(self, key_material, expected_key, executor=None):
+        self._use()
+        utils._check_byteslike("key_material", key_material)
+        return _verify_async(
+            executor, self._memory_required(), self.derive_with, key_material,
+            expected_key
+        )
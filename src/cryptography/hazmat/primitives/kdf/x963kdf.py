@@ -11,7 +11,7 @@ from cryptography.exceptions import (
     AlreadyFinalized, InvalidKey, UnsupportedAlgorithm, _Reasons
 )
 from cryptography.hazmat.backends.interfaces import HashBackend
-from cryptography.hazmat.primitives import constant_time, hashes
+from cryptography.hazmat.primitives import constant_time
 from cryptography.hazmat.primitives.kdf import KeyDerivationFunction
 
 
@@ -46,20 +46,33 @@ class X963KDF(object):
         if self._used:
             raise AlreadyFinalized
         self._used = True
+        return self.derive_with(key_material)
+
+    def derive_with(self, key_material, sharedinfo=None):
         utils._check_byteslike("key_material", key_material)
-        output = [b""]
-        outlen = 0
-        counter = 1
-
-        while self._length > outlen:
-            h = hashes.Hash(self._algorithm, self._backend)
-            h.update(key_material)
-            h.update(_int_to_u32be(counter))
-            if self._sharedinfo is not None:
-                h.update(self._sharedinfo)
-            output.append(h.finalize())
-            outlen += len(output[-1])
-            counter += 1
+        if sharedinfo is None:
+            sharedinfo = self._sharedinfo
+        else:
+            utils._check_bytes("sharedinfo", sharedinfo)
+
+        # Every block is H(key_material || counter || sharedinfo), so
+        # key_material is hashed once and each block starts from a copy of
+        # that state.
+        h = self._backend.create_hash_ctx(self._algorithm)
+        h.update(key_material)
+        suffix = sharedinfo if sharedinfo is not None else b""
+        count = -(-self._length // self._algorithm.digest_size)
+
+        counter_digest = getattr(h, "_counter_digest", None)
+        if counter_digest is not None:
+            return counter_digest(suffix, count)[:self._length]
+
+        output = []
+        for counter in range(1, count + 1):
+            block = h.copy()
+            block.update(_int_to_u32be(counter))
+            block.update(suffix)
+            output.append(block.finalize())
 
         return b"".join(output)[:self._length]
 
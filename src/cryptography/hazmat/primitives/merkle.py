@@ -0,0 +1,305 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import six
+
+from cryptography import utils
+from cryptography.exceptions import (
+    InvalidSignature, UnsupportedAlgorithm, _Reasons
+)
+from cryptography.hazmat.backends.interfaces import HashBackend
+from cryptography.hazmat.primitives import hashes
+
+
+# RFC 6962 section 2.1 domain separates leaves from interior nodes so that a
+# leaf can't be passed off as a subtree.
+_LEAF_PREFIX = b"\x00"
+_NODE_PREFIX = b"\x01"
+
+
+def _check_args(algorithm, backend):
+    if not isinstance(backend, HashBackend):
+        raise UnsupportedAlgorithm(
+            "Backend object does not implement HashBackend.",
+            _Reasons.BACKEND_MISSING_INTERFACE
+        )
+
+    if not isinstance(algorithm, hashes.HashAlgorithm):
+        raise TypeError("Expected instance of hashes.HashAlgorithm.")
+
+
+def _check_size(name, value):
+    if not isinstance(value, six.integer_types):
+        raise TypeError("{} must be an integer".format(name))
+    if value < 0:
+        raise ValueError("{} must not be negative".format(name))
+
+
+def _leaf_hashes(algorithm, leaves, backend):
+    leaves = list(leaves)
+    for leaf in leaves:
+        utils._check_bytes("leaf", leaf)
+    digests = hashes.digest_many(
+        algorithm, [_LEAF_PREFIX + leaf for leaf in leaves], backend
+    )
+    size = algorithm.digest_size
+    return [
+        digests[i:i + size] for i in six.moves.range(0, len(digests), size)
+    ]
+
+
+def _node_hash(algorithm, left, right, backend):
+    return hashes.digest(algorithm, _NODE_PREFIX + left + right, backend)
+
+
+def _largest_power_of_two_below(n):
+    k = 1
+    while k << 1 < n:
+        k <<= 1
+    return k
+
+
+class MerkleTreeHash(object):
+    def __init__(self, algorithm, backend):
+        _check_args(algorithm, backend)
+        self._algorithm = algorithm
+        self._backend = backend
+        self._tree_size = 0
+        # The roots of the complete subtrees that make up the tree so far,
+        # largest first, one for each bit set in the tree size.
+        self._subtrees = []
+
+    algorithm = utils.read_only_property("_algorithm")
+    tree_size = utils.read_only_property("_tree_size")
+
+    def append(self, leaf):
+        self.extend([leaf])
+
+    def extend(self, leaves):
+        for leaf_hash in _leaf_hashes(self._algorithm, leaves, self._backend):
+            self._append_leaf_hash(leaf_hash)
+
+    def _append_leaf_hash(self, leaf_hash):
+        size = self._tree_size
+        # Merge equal sized subtrees, as when incrementing a binary counter.
+        while size & 1:
+            leaf_hash = _node_hash(
+                self._algorithm, self._subtrees.pop(), leaf_hash,
+                self._backend
+            )
+            size >>= 1
+        self._subtrees.append(leaf_hash)
+        self._tree_size += 1
+
+    def root(self):
+        if not self._subtrees:
+            return hashes.digest(self._algorithm, b"", self._backend)
+
+        root = self._subtrees[-1]
+        for subtree in reversed(self._subtrees[:-1]):
+            root = _node_hash(self._algorithm, subtree, root, self._backend)
+        return root
+
+
+class MerkleTree(object):
+    def __init__(self, algorithm, backend):
+        _check_args(algorithm, backend)
+        self._algorithm = algorithm
+        self._backend = backend
+        # _levels[h][i] is the root of the complete subtree over the 2 ** h
+        # leaves starting at leaf i * 2 ** h, so any subtree root that a
+        # proof needs takes O(log n) hashes to compute.
+        self._levels = [[]]
+
+    algorithm = utils.read_only_property("_algorithm")
+
+    @property
+    def tree_size(self):
+        return len(self._levels[0])
+
+    def append(self, leaf):
+        self.extend([leaf])
+
+    def extend(self, leaves):
+        for leaf_hash in _leaf_hashes(self._algorithm, leaves, self._backend):
+            self._append_leaf_hash(leaf_hash)
+
+    def _append_leaf_hash(self, leaf_hash):
+        index = len(self._levels[0])
+        self._levels[0].append(leaf_hash)
+        level = 0
+        while index & 1:
+            node = _node_hash(
+                self._algorithm, self._levels[level][index - 1],
+                self._levels[level][index], self._backend
+            )
+            level += 1
+            index >>= 1
+            if level == len(self._levels):
+                self._levels.append([])
+            self._levels[level].append(node)
+
+    def root(self, tree_size=None):
+        tree_size = self._check_tree_size(tree_size)
+        if tree_size == 0:
+            return hashes.digest(self._algorithm, b"", self._backend)
+        return self._subtree_root(0, tree_size)
+
+    def inclusion_proof(self, index, tree_size=None):
+        tree_size = self._check_tree_size(tree_size)
+        _check_size("index", index)
+        if index >= tree_size:
+            raise ValueError("index must be less than tree_size")
+        return self._inclusion_path(index, 0, tree_size)
+
+    def consistency_proof(self, old_size, tree_size=None):
+        tree_size = self._check_tree_size(tree_size)
+        _check_size("old_size", old_size)
+        if not 0 < old_size <= tree_size:
+            raise ValueError(
+                "old_size must be greater than 0 and at most tree_size"
+            )
+        return self._subproof(old_size, 0, tree_size, True)
+
+    def _check_tree_size(self, tree_size):
+        if tree_size is None:
+            return self.tree_size
+        _check_size("tree_size", tree_size)
+        if tree_size > self.tree_size:
+            raise ValueError("tree_size is larger than the tree")
+        return tree_size
+
+    def _subtree_root(self, start, end):
+        # The root of the subtree over the leaves [start, end).
+        size = end - start
+        if size & (size - 1) == 0:
+            level = size.bit_length() - 1
+            return self._levels[level][start >> level]
+        k = _largest_power_of_two_below(size)
+        return _node_hash(
+            self._algorithm,
+            self._subtree_root(start, start + k),
+            self._subtree_root(start + k, end),
+            self._backend
+        )
+
+    def _inclusion_path(self, index, start, end):
+        # PATH(m, D[n]) from RFC 6962 section 2.1.1.
+        if end - start == 1:
+            return []
+        k = _largest_power_of_two_below(end - start)
+        if index < k:
+            return self._inclusion_path(index, start, start + k) + [
+                self._subtree_root(start + k, end)
+            ]
+        else:
+            return self._inclusion_path(index - k, start + k, end) + [
+                self._subtree_root(start, start + k)
+            ]
+
+    def _subproof(self, old_size, start, end, complete):
+        # SUBPROOF(m, D[n], b) from RFC 6962 section 2.1.2.
+        if old_size == end - start:
+            return [] if complete else [self._subtree_root(start, end)]
+        k = _largest_power_of_two_below(end - start)
+        if old_size <= k:
+            return self._subproof(old_size, start, start + k, complete) + [
+                self._subtree_root(start + k, end)
+            ]
+        else:
+            return self._subproof(old_size - k, start + k, end, False) + [
+                self._subtree_root(start, start + k)
+            ]
+
+
+def _check_proof(proof):
+    proof = list(proof)
+    for node in proof:
+        utils._check_bytes("proof", node)
+    return proof
+
+
+def verify_inclusion(algorithm, leaf, index, tree_size, proof, root,
+                     backend):
+    # The verification algorithm from RFC 9162 section 2.1.3.2.
+    _check_args(algorithm, backend)
+    utils._check_bytes("leaf", leaf)
+    _check_size("index", index)
+    _check_size("tree_size", tree_size)
+    proof = _check_proof(proof)
+    utils._check_bytes("root", root)
+    if index >= tree_size:
+        raise InvalidSignature("Invalid inclusion proof.")
+
+    fn = index
+    sn = tree_size - 1
+    r = _leaf_hashes(algorithm, [leaf], backend)[0]
+    for p in proof:
+        if sn == 0:
+            raise InvalidSignature("Invalid inclusion proof.")
+        if fn & 1 or fn == sn:
+            r = _node_hash(algorithm, p, r, backend)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            r = _node_hash(algorithm, r, p, backend)
+        fn >>= 1
+        sn >>= 1
+
+    if sn != 0 or r != root:
+        raise InvalidSignature("Invalid inclusion proof.")
+
+
+def verify_consistency(algorithm, old_size, new_size, old_root, new_root,
+                       proof, backend):
+    # The verification algorithm from RFC 9162 section 2.1.4.2.
+    _check_args(algorithm, backend)
+    _check_size("old_size", old_size)
+    _check_size("new_size", new_size)
+    utils._check_bytes("old_root", old_root)
+    utils._check_bytes("new_root", new_root)
+    proof = _check_proof(proof)
+    if not 0 < old_size <= new_size:
+        raise ValueError(
+            "old_size must be greater than 0 and at most new_size"
+        )
+
+    if old_size == new_size:
+        if proof or old_root != new_root:
+            raise InvalidSignature("Invalid consistency proof.")
+        return
+
+    if old_size & (old_size - 1) == 0:
+        # The old tree is a complete subtree of the new one, so its root is
+        # the starting point and isn't included in the proof.
+        proof = [old_root] + proof
+    if not proof:
+        raise InvalidSignature("Invalid consistency proof.")
+
+    fn = old_size - 1
+    sn = new_size - 1
+    while fn & 1:
+        fn >>= 1
+        sn >>= 1
+
+    fr = sr = proof[0]
+    for c in proof[1:]:
+        if sn == 0:
+            raise InvalidSignature("Invalid consistency proof.")
+        if fn & 1 or fn == sn:
+            fr = _node_hash(algorithm, c, fr, backend)
+            sr = _node_hash(algorithm, c, sr, backend)
+            while not fn & 1 and fn != 0:
+                fn >>= 1
+                sn >>= 1
+        else:
+            sr = _node_hash(algorithm, sr, c, backend)
+        fn >>= 1
+        sn >>= 1
+
+    if sn != 0 or fr != old_root or sr != new_root:
+        raise InvalidSignature("Invalid consistency proof.")
@@ -7,9 +7,12 @@ from __future__ import absolute_import, division, print_function
 import abc
 import binascii
 import inspect
+import multiprocessing
 import sys
 import warnings
 
+import six
+
 
 # We use a UserWarning subclass, instead of DeprecationWarning, because CPython
 # decided deprecation warnings should be invisble by default.
@@ -38,6 +41,42 @@ def _check_byteslike(name, value):
         raise TypeError("{} must be bytes-like".format(name))
 
 
+def _check_max_workers(max_workers):
+    """
+    Validates a max_workers argument, returning the number of threads to use.
+    None means one thread per CPU.
+    """
+    if max_workers is None:
+        return multiprocessing.cpu_count()
+    if not isinstance(max_workers, six.integer_types):
+        raise TypeError("max_workers must be an integer")
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+    return max_workers
+
+
+def _thread_map(fn, items, max_workers):
+    """
+    Returns [fn(item) for item in items], spreading the calls over at most
+    max_workers threads. OpenSSL releases the GIL while it works, so calls
+    that spend most of their time in it run in parallel.
+    """
+    workers = min(max_workers, len(items))
+    if workers <= 1:
+        return [fn(item) for item in items]
+
+    # Imported here so that importing cryptography doesn't pull in
+    # multiprocessing.pool.
+    from multiprocessing.pool import ThreadPool
+
+    pool = ThreadPool(workers)
+    try:
+        return pool.map(fn, items, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+
 def read_only_property(name):
     return property(lambda self: getattr(self, name))
 
@@ -0,0 +1,75 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from cryptography.exceptions import UnsupportedAlgorithm
+from cryptography.hazmat.primitives.ciphers.aead import (
+    AESCCM, AESGCM, ChaCha20Poly1305
+)
+
+
+_KEY = b"\x00" * 32
+_NONCE = b"\x00" * 12
+_DATA = b"\x00" * 1024
+
+
+def _aead_supported(cls):
+    try:
+        cls(_KEY)
+        return True
+    except UnsupportedAlgorithm:
+        return False
+
+
+_AEADS = [
+    cls for cls in (AESGCM, AESCCM, ChaCha20Poly1305) if _aead_supported(cls)
+]
+
+
+# The "new_instance" benchmarks pay for the cipher lookup and key schedule on
+# every message, which is what every call cost before keyed contexts were
+# cached on the instance. Compare them with the "reused_instance" benchmarks.
+@pytest.mark.parametrize("cls", _AEADS)
+def test_encrypt_new_instance(benchmark, cls):
+    benchmark(lambda: cls(_KEY).encrypt(_NONCE, _DATA, None))
+
+
+@pytest.mark.parametrize("cls", _AEADS)
+def test_encrypt_reused_instance(benchmark, cls):
+    aead = cls(_KEY)
+    benchmark(aead.encrypt, _NONCE, _DATA, None)
+
+
+@pytest.mark.parametrize("cls", _AEADS)
+def test_decrypt_reused_instance(benchmark, cls):
+    aead = cls(_KEY)
+    ct = aead.encrypt(_NONCE, _DATA, None)
+    assert benchmark(aead.decrypt, _NONCE, ct, None) == _DATA
+
+
+_BATCH_AEADS = [cls for cls in (AESGCM, ChaCha20Poly1305) if cls in _AEADS]
+_BATCH_NONCES = [b"\x00" * 12] * 1000
+_BATCH_DATA = [b"\x00" * 256] * 1000
+
+
+# Compare with encrypt_loop to see the per-message call overhead saved by
+# encrypt_batch.
+@pytest.mark.parametrize("cls", _BATCH_AEADS)
+def test_encrypt_loop(benchmark, cls):
+    aead = cls(_KEY)
+    benchmark(
+        lambda: [
+            aead.encrypt(nonce, data, None)
+            for nonce, data in zip(_BATCH_NONCES, _BATCH_DATA)
+        ]
+    )
+
+
+@pytest.mark.parametrize("cls", _BATCH_AEADS)
+def test_encrypt_batch(benchmark, cls):
+    aead = cls(_KEY)
+    benchmark(aead.encrypt_batch, _BATCH_NONCES, _BATCH_DATA, None)
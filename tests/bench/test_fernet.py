@@ -0,0 +1,34 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.fernet import Fernet
+
+
+_FERNET = Fernet(b"cw_0x689RpI-jtRR7oE8h_eQsKImvJapLeSbXpwF4e4=")
+_MESSAGES = [b"\x00" * 64] * 1000
+_TOKENS = [_FERNET.encrypt(message) for message in _MESSAGES]
+
+
+# Compare with test_encrypt_many to see the per-token overhead it saves by
+# reading the clock and os.urandom once per batch.
+def test_encrypt_loop(benchmark):
+    benchmark(lambda: [_FERNET.encrypt(message) for message in _MESSAGES])
+
+
+def test_encrypt_many(benchmark):
+    benchmark(_FERNET.encrypt_many, _MESSAGES)
+
+
+# Compare with test_decrypt_many, which reads the clock once per batch.
+def test_decrypt_loop(benchmark):
+    results = benchmark(
+        lambda: [_FERNET.decrypt(token, ttl=60) for token in _TOKENS]
+    )
+    assert results == _MESSAGES
+
+
+def test_decrypt_many(benchmark):
+    assert benchmark(_FERNET.decrypt_many, _TOKENS, ttl=60) == _MESSAGES
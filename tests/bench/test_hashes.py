@@ -0,0 +1,44 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+
+
+_DATA = b"\x00" * 32
+
+
+def _hash_context_digest(data):
+    h = hashes.Hash(hashes.SHA256(), default_backend())
+    h.update(data)
+    return h.finalize()
+
+
+# Compare with test_digest to see the cost of setting up a hash context for
+# a small input.
+def test_hash_context(benchmark):
+    benchmark(_hash_context_digest, _DATA)
+
+
+def test_digest(benchmark):
+    benchmark(hashes.digest, hashes.SHA256(), _DATA, default_backend())
+
+
+_RECORDS = [b"\x00" * 128] * 1000
+
+
+# Compare with test_digest_many to see the per-item overhead it removes.
+def test_digest_loop(benchmark):
+    benchmark(
+        lambda: b"".join(
+            hashes.digest(hashes.SHA256(), record, default_backend())
+            for record in _RECORDS
+        )
+    )
+
+
+def test_digest_many(benchmark):
+    benchmark(hashes.digest_many, hashes.SHA256(), _RECORDS, default_backend())
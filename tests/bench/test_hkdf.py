@@ -0,0 +1,39 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf import hkdf
+
+
+_IKM = b"\x00" * 32
+_SALT = b"\x01" * 32
+# The traffic keys and IVs of a TLS-like handshake.
+_OUTPUTS = [
+    (b"c hs key", 16), (b"c hs iv", 12), (b"s hs key", 16), (b"s hs iv", 12),
+    (b"c ap key", 16), (b"c ap iv", 12), (b"s ap key", 16), (b"s ap iv", 12),
+    (b"exporter", 32), (b"resumption", 32),
+]
+
+
+def _derive_each():
+    return [
+        hkdf.HKDF(
+            hashes.SHA256(), length, _SALT, info, default_backend()
+        ).derive(_IKM)
+        for info, length in _OUTPUTS
+    ]
+
+
+def test_hkdf_derive_each(benchmark):
+    benchmark(_derive_each)
+
+
+def test_hkdf_derive_many(benchmark):
+    benchmark(
+        hkdf.derive_many, hashes.SHA256(), _IKM, _SALT, _OUTPUTS,
+        default_backend()
+    )
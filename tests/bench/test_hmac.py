@@ -0,0 +1,29 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, hmac
+
+
+_KEY = b"\x00" * 32
+_DATA = b"\x00" * 64
+
+
+def _hmac(data):
+    h = hmac.HMAC(_KEY, hashes.SHA256(), default_backend())
+    h.update(data)
+    return h.finalize()
+
+
+# Compare with test_hmac_key_sign to see the cost of setting up the key for
+# every message.
+def test_hmac(benchmark):
+    benchmark(_hmac, _DATA)
+
+
+def test_hmac_key_sign(benchmark):
+    key = hmac.HMACKey(_KEY, hashes.SHA256(), default_backend())
+    benchmark(key.sign, _DATA)
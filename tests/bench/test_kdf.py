@@ -0,0 +1,33 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import pytest
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.concatkdf import ConcatKDFHash
+from cryptography.hazmat.primitives.kdf.x963kdf import X963KDF
+
+
+# An ECDH shared secret on P-256 and an ECIES-style sharedinfo.
+_SHARED_SECRET = b"\x00" * 32
+_SHAREDINFO = b"\x04" + b"\x01" * 64
+
+_LENGTHS = [32, 1024, 64 * 1024, 1024 * 1024]
+
+
+@pytest.mark.parametrize("length", _LENGTHS)
+def test_x963kdf(benchmark, length):
+    kdf = X963KDF(hashes.SHA256(), length, _SHAREDINFO, default_backend())
+    benchmark(kdf.derive_with, _SHARED_SECRET)
+
+
+@pytest.mark.parametrize("length", _LENGTHS)
+def test_concatkdf_hash(benchmark, length):
+    kdf = ConcatKDFHash(
+        hashes.SHA256(), length, _SHAREDINFO, default_backend()
+    )
+    benchmark(kdf.derive_with, _SHARED_SECRET)
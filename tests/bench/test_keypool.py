@@ -0,0 +1,28 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.keypool import KeyPool
+
+
+def _generate():
+    return rsa.generate_private_key(65537, 2048, default_backend())
+
+
+def test_rsa_generate(benchmark):
+    benchmark(_generate)
+
+
+def test_rsa_key_pool_get(benchmark):
+    with KeyPool(_generate, size=8) as pool:
+        # Refilling happens in setup, outside the timed call, so this
+        # measures a get() that finds a key waiting, as it would in a pool
+        # sized for its request rate.
+        def setup():
+            pool.fill()
+
+        benchmark.pedantic(pool.get, setup=setup, rounds=20)
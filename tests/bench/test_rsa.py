@@ -0,0 +1,87 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+
+from ..hazmat.primitives.fixtures_rsa import RSA_KEY_2048
+
+
+_MESSAGE = b"\x00" * 256
+_PRIVATE_KEY = RSA_KEY_2048.private_key(default_backend())
+_PUBLIC_KEY = _PRIVATE_KEY.public_key()
+_SIGNATURE = _PRIVATE_KEY.sign(_MESSAGE, padding.PKCS1v15(), hashes.SHA256())
+
+
+def _openssl_verify(verifier, digest):
+    # The cost of the RSA operation alone: the digest is computed once up
+    # front and the configured context is used without duplicating it.
+    backend = verifier._backend
+    res = backend._lib.EVP_PKEY_verify(
+        verifier._pkey_ctx, _SIGNATURE, len(_SIGNATURE), digest, len(digest)
+    )
+    assert res == 1
+
+
+def _openssl_sign(signer, digest):
+    backend = signer._backend
+    buflen = backend._ffi.new("size_t *", signer._sig_size)
+    buf = backend._ffi.new("unsigned char[]", signer._sig_size)
+    res = backend._lib.EVP_PKEY_sign(
+        signer._pkey_ctx, buf, buflen, digest, len(digest)
+    )
+    assert res == 1
+
+
+# Compare test_verify, test_prepared_verify and test_openssl_verify to see
+# the per-call setup cost that a prepared verifier removes and how close it
+# gets to calling OpenSSL directly.
+def test_verify(benchmark):
+    benchmark(
+        _PUBLIC_KEY.verify, _SIGNATURE, _MESSAGE, padding.PKCS1v15(),
+        hashes.SHA256()
+    )
+
+
+def test_prepared_verify(benchmark):
+    verifier = _PUBLIC_KEY.prepare_verifier(
+        padding.PKCS1v15(), hashes.SHA256()
+    )
+    benchmark(verifier.verify, _SIGNATURE, _MESSAGE)
+
+
+def test_openssl_verify(benchmark):
+    verifier = _PUBLIC_KEY.prepare_verifier(
+        padding.PKCS1v15(), hashes.SHA256()
+    )
+    digest = hashes.digest(hashes.SHA256(), _MESSAGE, default_backend())
+    benchmark(_openssl_verify, verifier, digest)
+
+
+def test_sign(benchmark):
+    benchmark(
+        _PRIVATE_KEY.sign, _MESSAGE, padding.PKCS1v15(), hashes.SHA256()
+    )
+
+
+def test_prepared_sign(benchmark):
+    signer = _PRIVATE_KEY.prepare_signer(padding.PKCS1v15(), hashes.SHA256())
+    benchmark(signer.sign, _MESSAGE)
+
+
+def test_openssl_sign(benchmark):
+    signer = _PRIVATE_KEY.prepare_signer(padding.PKCS1v15(), hashes.SHA256())
+    digest = hashes.digest(hashes.SHA256(), _MESSAGE, default_backend())
+    benchmark(_openssl_sign, signer, digest)
+
+
+def test_load_private_numbers(benchmark):
+    benchmark(RSA_KEY_2048.private_key, default_backend())
+
+
+def test_load_public_numbers(benchmark):
+    benchmark(RSA_KEY_2048.public_numbers.public_key, default_backend())
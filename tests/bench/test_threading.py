@@ -0,0 +1,117 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+
+import pytest
+
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes, hmac
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers.parallel import ParallelCipher
+
+
+_CHUNK = b"\x00" * (1024 * 1024)
+_CHUNKS_PER_THREAD = 8
+
+
+def _encrypt_stream():
+    encryptor = Cipher(
+        algorithms.AES(b"\x00" * 32), modes.CTR(b"\x00" * 16),
+        default_backend()
+    ).encryptor()
+    buf = bytearray(len(_CHUNK) + 15)
+    for _ in range(_CHUNKS_PER_THREAD):
+        encryptor.update_into(_CHUNK, buf)
+
+
+def _hash_stream():
+    h = hashes.Hash(hashes.SHA256(), default_backend())
+    for _ in range(_CHUNKS_PER_THREAD):
+        h.update(_CHUNK)
+    h.finalize()
+
+
+def _hmac_stream():
+    h = hmac.HMAC(b"\x00" * 32, hashes.SHA256(), default_backend())
+    for _ in range(_CHUNKS_PER_THREAD):
+        h.update(_CHUNK)
+    h.finalize()
+
+
+_RSA_OPERATIONS_PER_THREAD = 20
+_rsa_keys = {}
+
+
+def _rsa_key():
+    # Generated on first use so that collecting the benchmarks stays fast.
+    if "key" not in _rsa_keys:
+        _rsa_keys["key"] = rsa.generate_private_key(
+            65537, 3072, default_backend()
+        )
+    return _rsa_keys["key"]
+
+
+def _rsa_sign_stream():
+    key = _rsa_key()
+    for _ in range(_RSA_OPERATIONS_PER_THREAD):
+        key.sign(b"\x00" * 32, padding.PKCS1v15(), hashes.SHA256())
+
+
+def _rsa_decrypt_stream():
+    key = _rsa_key()
+    ciphertext = key.public_key().encrypt(b"\x00" * 32, padding.PKCS1v15())
+    for _ in range(_RSA_OPERATIONS_PER_THREAD):
+        key.decrypt(ciphertext, padding.PKCS1v15())
+
+
+def _rsa_generate():
+    rsa.generate_private_key(65537, 2048, default_backend())
+
+
+def _run_threads(target, thread_count):
+    threads = [threading.Thread(target=target) for _ in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+# Every thread processes the same amount of data, so on a machine with at
+# least as many cores as threads the time per round should stay roughly
+# flat as thread_count grows. That only holds because OpenSSL calls made
+# through cffi release the GIL while they run.
+@pytest.mark.parametrize("thread_count", [1, 2, 4])
+@pytest.mark.parametrize(
+    "target", [_encrypt_stream, _hash_stream, _hmac_stream],
+    ids=["cipher", "hash", "hmac"]
+)
+def test_independent_streams(benchmark, target, thread_count):
+    benchmark(_run_threads, target, thread_count)
+
+
+# All threads share one 3072-bit key, as a signing service would. RSA key
+# generation takes a variable amount of time, so expect more noise there.
+@pytest.mark.parametrize("thread_count", [1, 2, 4])
+@pytest.mark.parametrize(
+    "target", [_rsa_sign_stream, _rsa_decrypt_stream, _rsa_generate],
+    ids=["rsa-sign", "rsa-decrypt", "rsa-generate"]
+)
+def test_rsa_private_operations(benchmark, target, thread_count):
+    _rsa_key()
+    benchmark(_run_threads, target, thread_count)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2, 4])
+def test_parallel_cipher_ctr(benchmark, max_workers):
+    pc = ParallelCipher(
+        algorithms.AES(b"\x00" * 32), modes.CTR(b"\x00" * 16),
+        default_backend(), max_workers=max_workers
+    )
+    data = _CHUNK * _CHUNKS_PER_THREAD
+    buf = bytearray(len(data))
+    benchmark(pc.encrypt_into, data, buf)
@@ -0,0 +1,77 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import os
+
+import pytest
+
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, ed25519, padding
+
+from ..hazmat.primitives.fixtures_rsa import RSA_KEY_2048
+
+
+_COUNT = 1000
+_MESSAGES = [os.urandom(16) for _ in range(_COUNT)]
+
+
+def _rsa_key():
+    key = RSA_KEY_2048.private_key(default_backend())
+    return key, (padding.PKCS1v15(), hashes.SHA256())
+
+
+def _ec_key():
+    key = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    return key, (ec.ECDSA(hashes.SHA256()),)
+
+
+def _ed25519_key():
+    return ed25519.Ed25519PrivateKey.generate(), ()
+
+
+def _signed_items(key, args):
+    # Every tenth signature is for the wrong message.
+    items = [(key.sign(message, *args), message) for message in _MESSAGES]
+    return [
+        (signature, b"wrong" if i % 10 == 0 else message)
+        for i, (signature, message) in enumerate(items)
+    ]
+
+
+def _verify_loop(public_key, items, args):
+    results = []
+    for signature, message in items:
+        try:
+            public_key.verify(signature, message, *args)
+            results.append(True)
+        except InvalidSignature:
+            results.append(False)
+    return results
+
+
+_KEYS = [_rsa_key, _ec_key, _ed25519_key]
+_IDS = ["rsa", "ecdsa", "ed25519"]
+
+
+# Compare with test_verify_batch to see the per-signature overhead of
+# calling verify and catching InvalidSignature.
+@pytest.mark.parametrize("make_key", _KEYS, ids=_IDS)
+def test_verify_loop(benchmark, make_key):
+    key, args = make_key()
+    items = _signed_items(key, args)
+    benchmark(_verify_loop, key.public_key(), items, args)
+
+
+@pytest.mark.parametrize("max_workers", [1, 4])
+@pytest.mark.parametrize("make_key", _KEYS, ids=_IDS)
+def test_verify_batch(benchmark, make_key, max_workers):
+    key, args = make_key()
+    items = _signed_items(key, args)
+    benchmark(
+        key.public_key().verify_batch, items, *args, max_workers=max_workers
+    )
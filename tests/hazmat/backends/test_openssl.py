@@ -167,6 +167,20 @@ class TestOpenSSL(object):
         bn = backend._int_to_bn(0)
         assert backend._bn_to_int(bn) == 0
 
+    def test_ints_to_bns(self):
+        values = [0, 1, 2 ** 8, (2 ** 4242) - 4242, None, 65537]
+        bns = backend._ints_to_bns(*values)
+        assert len(bns) == len(values)
+        assert bns[4] == backend._ffi.NULL
+        for value, bn in zip(values, bns):
+            if value is not None:
+                bn = backend._ffi.gc(bn, backend._lib.BN_clear_free)
+                assert backend._bn_to_int(bn) == value
+
+    def test_ints_to_bns_empty(self):
+        assert backend._ints_to_bns() == []
+        assert backend._ints_to_bns(None) == [backend._ffi.NULL]
+
 
 @pytest.mark.skipif(
     backend._lib.Cryptography_HAS_ENGINE == 0,
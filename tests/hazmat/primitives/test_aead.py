@@ -5,15 +5,22 @@
 from __future__ import absolute_import, division, print_function
 
 import binascii
+import io
 import os
 
 import pytest
 
-from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm, _Reasons
+import six
+
+from cryptography.exceptions import (
+    AlreadyFinalized, InvalidTag, UnsupportedAlgorithm, _Reasons
+)
 from cryptography.hazmat.backends.interfaces import CipherBackend
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.ciphers.aead import (
-    AESCCM, AESGCM, ChaCha20Poly1305
+    AESCCM, AESGCM, ChaCha20Poly1305, StreamingAEAD
 )
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from .utils import _load_all_params
 from ...utils import (
@@ -27,6 +34,94 @@ class FakeData(object):
         return 2 ** 32 + 1
 
 
+def _check_instance_reuse(cls, key, nonce_lengths):
+    # A single instance reuses keyed contexts between calls, so interleave
+    # nonce lengths and failed decryptions and compare with fresh instances.
+    cipher = cls(key)
+    for i, nonce_length in enumerate(nonce_lengths * 2):
+        nonce = os.urandom(nonce_length)
+        data = os.urandom(i * 7)
+        ad = os.urandom(i)
+        ct = cipher.encrypt(nonce, data, ad)
+        assert ct == cls(key).encrypt(nonce, data, ad)
+        tampered = bytearray(ct)
+        tampered[-1] ^= 1
+        with pytest.raises(InvalidTag):
+            cipher.decrypt(nonce, bytes(tampered), ad)
+        assert cipher.decrypt(nonce, ct, ad) == data
+
+
+def _check_into(cipher, nonce, tag_length):
+    pt = b"encrypt me"
+    ad = b"additional"
+    ct = cipher.encrypt(nonce, pt, ad)
+
+    buf = bytearray(len(pt) + tag_length + 5)
+    assert cipher.encrypt_into(nonce, pt, ad, buf) == len(ct)
+    assert bytes(buf[:len(ct)]) == ct
+    buf = bytearray(len(ct))
+    assert cipher.encrypt_into(nonce, pt, None, memoryview(buf)) == len(ct)
+    assert bytes(buf) == cipher.encrypt(nonce, pt, None)
+    with pytest.raises(ValueError):
+        cipher.encrypt_into(nonce, pt, ad, bytearray(len(ct) - 1))
+
+    buf = bytearray(len(pt) + 5)
+    assert cipher.decrypt_into(nonce, ct, ad, buf) == len(pt)
+    assert bytes(buf[:len(pt)]) == pt
+    with pytest.raises(ValueError):
+        cipher.decrypt_into(nonce, ct, ad, bytearray(len(pt) - 1))
+    with pytest.raises(InvalidTag):
+        cipher.decrypt_into(nonce, ct[:tag_length - 1], ad, buf)
+
+    buf = bytearray(b"\xff" * len(pt))
+    with pytest.raises(InvalidTag):
+        cipher.decrypt_into(nonce, ct, b"wrong", buf)
+    assert buf == bytearray(len(pt))
+
+    # Read-only buffers are rejected rather than written to.
+    readonly = bytes(len(ct))
+    with pytest.raises(TypeError):
+        cipher.encrypt_into(nonce, pt, ad, readonly)
+    with pytest.raises(TypeError):
+        cipher.encrypt_into(nonce, pt, ad, memoryview(readonly))
+    with pytest.raises(TypeError):
+        cipher.decrypt_into(nonce, ct, ad, readonly)
+    assert readonly == bytes(len(ct))
+
+
+def _check_batch(cipher, nonce_length):
+    nonces = [os.urandom(nonce_length) for _ in range(5)]
+    data = [b"", b"a", b"encrypt me" * 50, b"b" * 17, b"c"]
+    ads = [None, b"additional", b"", b"d", None]
+    cts = cipher.encrypt_batch(nonces, data, ads)
+    assert cts == [
+        cipher.encrypt(nonce, pt, ad)
+        for nonce, pt, ad in zip(nonces, data, ads)
+    ]
+    assert cipher.decrypt_batch(nonces, cts, ads) == data
+    assert cipher.encrypt_batch(iter(nonces[:2]), data[:2], None) == [
+        cipher.encrypt(nonce, pt, None)
+        for nonce, pt in zip(nonces[:2], data[:2])
+    ]
+
+    cts[2] = cts[2][:-1] + six.int2byte(six.indexbytes(cts[2], -1) ^ 1)
+    cts[3] = cts[3][:15]
+    results = cipher.decrypt_batch(nonces, cts, ads)
+    assert [type(result) for result in results[2:4]] == [InvalidTag] * 2
+    assert results[:2] + results[4:] == data[:2] + data[4:]
+
+    assert cipher.encrypt_batch([], [], None) == []
+    assert cipher.decrypt_batch([], [], None) == []
+    with pytest.raises(ValueError):
+        cipher.encrypt_batch(nonces, data[:4], None)
+    with pytest.raises(ValueError):
+        cipher.decrypt_batch(nonces, cts, ads[:4])
+    with pytest.raises(TypeError):
+        cipher.encrypt_batch(nonces, data[:4] + [u"text"], None)
+    with pytest.raises(OverflowError):
+        cipher.encrypt_batch(nonces[:1], [FakeData()], None)
+
+
 def _aead_supported(cls):
     try:
         cls(b"0" * 32)
@@ -182,6 +277,21 @@ class TestChaCha20Poly1305(object):
         computed_pt2 = chacha2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
 
+    def test_instance_reuse(self, backend):
+        _check_instance_reuse(
+            ChaCha20Poly1305, ChaCha20Poly1305.generate_key(), [12]
+        )
+
+    def test_encrypt_into_decrypt_into(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        _check_into(chacha, os.urandom(12), 16)
+
+    def test_encrypt_batch_decrypt_batch(self, backend):
+        chacha = ChaCha20Poly1305(ChaCha20Poly1305.generate_key())
+        _check_batch(chacha, 12)
+        with pytest.raises(ValueError):
+            chacha.encrypt_batch([b"0" * 11], [b"data"], None)
+
 
 @pytest.mark.skipif(
     _aead_supported(AESCCM),
@@ -347,6 +457,23 @@ class TestAESCCM(object):
         computed_pt2 = aesccm2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
 
+    def test_instance_reuse(self, backend):
+        key = AESCCM.generate_key(128)
+        _check_instance_reuse(
+            lambda key: AESCCM(key, tag_length=8), key, [7, 13, 12]
+        )
+
+    def test_encrypt_into_decrypt_into(self, backend):
+        aesccm = AESCCM(AESCCM.generate_key(128), tag_length=12)
+        _check_into(aesccm, os.urandom(12), 12)
+
+    def test_encrypt_into_nonce_too_long(self, backend):
+        aesccm = AESCCM(AESCCM.generate_key(128))
+        pt = b"encrypt me" * 6600
+        buf = bytearray(len(pt) + 16)
+        with pytest.raises(ValueError):
+            aesccm.encrypt_into(os.urandom(13), pt, None, buf)
+
 
 def _load_gcm_vectors():
     vectors = _load_all_params(
@@ -458,3 +585,200 @@ class TestAESGCM(object):
         assert ct2 == ct
         computed_pt2 = aesgcm2.decrypt(bytearray(nonce), ct2, ad)
         assert computed_pt2 == pt
+
+    def test_instance_reuse(self, backend):
+        _check_instance_reuse(
+            AESGCM, AESGCM.generate_key(256), [12, 8, 16, 12]
+        )
+
+    def test_encrypt_into_decrypt_into(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        _check_into(aesgcm, os.urandom(12), 16)
+
+    def test_encrypt_batch_decrypt_batch(self, backend):
+        aesgcm = AESGCM(AESGCM.generate_key(128))
+        _check_batch(aesgcm, 12)
+        _check_batch(aesgcm, 8)
+        with pytest.raises(ValueError):
+            aesgcm.encrypt_batch(
+                [b"0" * 12, b"0" * 8], [b"data", b"data"], None
+            )
+
+
+def _streaming_aeads():
+    aeads = [AESGCM(AESGCM.generate_key(128))]
+    if _aead_supported(ChaCha20Poly1305):
+        aeads.append(ChaCha20Poly1305(ChaCha20Poly1305.generate_key()))
+    return aeads
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+@pytest.mark.parametrize("aead", _streaming_aeads())
+class TestStreamingAEAD(object):
+    @pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 48, 100])
+    @pytest.mark.parametrize("chunk_size", [1, 16, 33, 1000])
+    def test_roundtrip(self, aead, size, chunk_size, backend):
+        stream = StreamingAEAD(aead, segment_size=16)
+        pt = os.urandom(size)
+        encryptor = stream.encryptor(b"ad")
+        ct = b"".join(
+            encryptor.update(pt[i:i + chunk_size])
+            for i in range(0, size, chunk_size)
+        )
+        ct += encryptor.finalize()
+        segments = max((size + 15) // 16, 1)
+        assert len(ct) == 27 + size + segments * 16
+
+        decryptor = stream.decryptor(b"ad")
+        computed_pt = b"".join(
+            decryptor.update(ct[i:i + chunk_size])
+            for i in range(0, len(ct), chunk_size)
+        )
+        computed_pt += decryptor.finalize()
+        assert computed_pt == pt
+
+    def test_segment_format(self, aead, backend):
+        stream = StreamingAEAD(aead, segment_size=4)
+        encryptor = stream.encryptor()
+        ct = encryptor.update(b"abcdefgh") + encryptor.finalize()
+        assert ct[:4] == b"\x00\x00\x00\x03"
+        salt = ct[4:20]
+        key = HKDF(
+            hashes.SHA256(), len(aead._key), salt,
+            b"cryptography StreamingAEAD\x00\x00\x00\x03", backend
+        ).derive(aead._key)
+        stream_aead = type(aead)(key)
+        first_nonce = ct[20:27] + b"\x00\x00\x00\x00\x00"
+        last_nonce = ct[20:27] + b"\x00\x00\x00\x01\x01"
+        assert stream_aead.decrypt(first_nonce, ct[27:47], None) == b"abcd"
+        assert stream_aead.decrypt(last_nonce, ct[47:], None) == b"efgh"
+
+    def test_streams_use_separate_keys(self, aead, backend):
+        # Even with the same nonce prefix, two streams must not seal their
+        # segments under the same key and nonce.
+        stream = StreamingAEAD(aead, segment_size=16)
+        first = stream.encryptor()
+        second = stream.encryptor()
+        second._nonce_prefix = first._nonce_prefix
+        first_ct = first.update(b"\x00" * 16) + first.finalize()
+        second_ct = second.update(b"\x00" * 16) + second.finalize()
+        assert first_ct[27:] != second_ct[27:]
+
+    def test_tampered_header(self, aead, backend):
+        stream = StreamingAEAD(aead, segment_size=16)
+        encryptor = stream.encryptor()
+        ct = bytearray(encryptor.update(b"\x00" * 10) + encryptor.finalize())
+        for i in [0, 3, 4, 19, 20, 26]:
+            tampered = bytearray(ct)
+            tampered[i] ^= 1
+            decryptor = stream.decryptor()
+            with pytest.raises(InvalidTag):
+                decryptor.update(bytes(tampered))
+                decryptor.finalize()
+
+    def test_wrong_segment_size(self, aead, backend):
+        encryptor = StreamingAEAD(aead, segment_size=16).encryptor()
+        ct = encryptor.update(b"\x00" * 10) + encryptor.finalize()
+        decryptor = StreamingAEAD(aead, segment_size=32).decryptor()
+        with pytest.raises(InvalidTag):
+            decryptor.update(ct)
+
+    def test_truncated(self, aead, backend):
+        stream = StreamingAEAD(aead, segment_size=16)
+        encryptor = stream.encryptor()
+        ct = encryptor.update(b"\x00" * 40) + encryptor.finalize()
+        for truncated in [ct[:27 + 32], ct[:-1], ct[:27], ct[:3], b""]:
+            decryptor = stream.decryptor()
+            decryptor.update(truncated)
+            with pytest.raises(InvalidTag):
+                decryptor.finalize()
+
+    def test_reordered_segments(self, aead, backend):
+        stream = StreamingAEAD(aead, segment_size=16)
+        encryptor = stream.encryptor()
+        ct = encryptor.update(b"\x00" * 40) + encryptor.finalize()
+        reordered = ct[:27] + ct[59:91] + ct[27:59] + ct[91:]
+        with pytest.raises(InvalidTag):
+            stream.decryptor().update(reordered)
+
+    def test_wrong_associated_data(self, aead, backend):
+        stream = StreamingAEAD(aead, segment_size=16)
+        encryptor = stream.encryptor(b"ad")
+        ct = encryptor.update(b"\x00" * 10) + encryptor.finalize()
+        decryptor = stream.decryptor(b"other")
+        decryptor.update(ct)
+        with pytest.raises(InvalidTag):
+            decryptor.finalize()
+
+    def test_files(self, aead, backend):
+        stream = StreamingAEAD(aead, segment_size=100)
+        pt = os.urandom(1000)
+        ct = io.BytesIO()
+        stream.encrypt_file(io.BytesIO(pt), ct, b"ad")
+        assert len(ct.getvalue()) == 27 + 1000 + 10 * 16
+
+        ct.seek(0)
+        computed_pt = io.BytesIO()
+        stream.decrypt_file(ct, computed_pt, b"ad")
+        assert computed_pt.getvalue() == pt
+
+    @pytest.mark.parametrize("size", [1, 99, 100, 101, 1000])
+    def test_decrypt_segment(self, aead, size, backend):
+        stream = StreamingAEAD(aead, segment_size=100)
+        pt = os.urandom(size)
+        ct = io.BytesIO()
+        stream.encrypt_file(io.BytesIO(pt), ct, b"ad")
+        segments = (size + 99) // 100
+        for i in reversed(range(segments)):
+            segment = stream.decrypt_segment(ct, i, b"ad")
+            assert segment == pt[i * 100:i * 100 + 100]
+
+        with pytest.raises(IndexError):
+            stream.decrypt_segment(ct, segments, b"ad")
+        with pytest.raises(IndexError):
+            stream.decrypt_segment(ct, -1, b"ad")
+        with pytest.raises(TypeError):
+            stream.decrypt_segment(ct, "0", b"ad")
+        with pytest.raises(InvalidTag):
+            stream.decrypt_segment(ct, 0, b"other")
+
+    def test_already_finalized(self, aead, backend):
+        stream = StreamingAEAD(aead)
+        encryptor = stream.encryptor()
+        ct = encryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update(b"")
+        with pytest.raises(AlreadyFinalized):
+            encryptor.finalize()
+
+        decryptor = stream.decryptor()
+        decryptor.update(ct)
+        assert decryptor.finalize() == b""
+        with pytest.raises(AlreadyFinalized):
+            decryptor.update(b"")
+        with pytest.raises(AlreadyFinalized):
+            decryptor.finalize()
+
+    def test_invalid_arguments(self, aead, backend):
+        with pytest.raises(TypeError):
+            StreamingAEAD(aead, segment_size=1.5)
+        with pytest.raises(ValueError):
+            StreamingAEAD(aead, segment_size=0)
+        with pytest.raises(ValueError):
+            StreamingAEAD(aead, segment_size=2 ** 32 + 1)
+
+        stream = StreamingAEAD(aead)
+        assert stream.segment_size == 65536
+        with pytest.raises(TypeError):
+            stream.encryptor(u"ad")
+        with pytest.raises(TypeError):
+            stream.encryptor().update(u"data")
+        with pytest.raises(TypeError):
+            stream.decryptor().update(u"data")
+
+
+def test_streaming_aead_requires_aesgcm_or_chacha20poly1305():
+    with pytest.raises(TypeError):
+        StreamingAEAD(AESCCM(AESCCM.generate_key(128)))
+    with pytest.raises(TypeError):
+        StreamingAEAD(object())
@@ -618,6 +618,89 @@ class TestECDSAVectors(object):
                 b"\x00" * 32, data, ec.ECDSA(Prehashed(hashes.SHA256()))
             )
 
+    @pytest.mark.parametrize("max_workers", [1, 2, None])
+    def test_verify_batch(self, backend, max_workers):
+        _skip_curve_unsupported(backend, ec.SECP256R1())
+        algorithm = ec.ECDSA(hashes.SHA256())
+        private_key = ec.generate_private_key(ec.SECP256R1(), backend)
+        messages = [os.urandom(16) for _ in range(5)]
+        items = [
+            (private_key.sign(message, algorithm), message)
+            for message in messages
+        ]
+        items.append((items[0][0], b"wrong message"))
+        items.append((b"\x00" * 8, b"not a DER signature"))
+        items.append((items[1][0], bytearray(messages[1])))
+        public_key = private_key.public_key()
+        assert public_key.verify_batch(
+            items, algorithm, max_workers=max_workers
+        ) == [True] * 5 + [False, False, True]
+        assert public_key.verify_batch([], algorithm) == []
+        assert backend._consume_errors() == []
+
+    def test_verify_batch_prehashed(self, backend):
+        _skip_curve_unsupported(backend, ec.SECP256R1())
+        private_key = ec.generate_private_key(ec.SECP256R1(), backend)
+        signature = private_key.sign(b"message", ec.ECDSA(hashes.SHA1()))
+        digest = hashes.digest(hashes.SHA1(), b"message", backend)
+        public_key = private_key.public_key()
+        algorithm = ec.ECDSA(Prehashed(hashes.SHA1()))
+        assert public_key.verify_batch(
+            [(signature, digest), (signature, b"\x00" * 20)], algorithm
+        ) == [True, False]
+        with pytest.raises(ValueError):
+            public_key.verify_batch([(signature, b"message")], algorithm)
+
+    def test_verify_batch_default(self, backend):
+        # Keys that don't implement verify_batch call verify for every pair.
+        class PublicKey(ec.EllipticCurvePublicKey):
+            def __init__(self, key):
+                self._key = key
+
+            curve = property(lambda self: self._key.curve)
+            key_size = property(lambda self: self._key.key_size)
+
+            def verifier(self, signature, signature_algorithm):
+                return self._key.verifier(signature, signature_algorithm)
+
+            def public_numbers(self):
+                return self._key.public_numbers()
+
+            def public_bytes(self, encoding, format):
+                return self._key.public_bytes(encoding, format)
+
+            def verify(self, signature, data, signature_algorithm):
+                self._key.verify(signature, data, signature_algorithm)
+
+        _skip_curve_unsupported(backend, ec.SECP256R1())
+        algorithm = ec.ECDSA(hashes.SHA256())
+        private_key = ec.generate_private_key(ec.SECP256R1(), backend)
+        signature = private_key.sign(b"message", algorithm)
+        public_key = PublicKey(private_key.public_key())
+        assert public_key.verify_batch(
+            [(signature, b"message"), (signature, b"wrong message")],
+            algorithm, max_workers=2
+        ) == [True, False]
+
+    def test_verify_batch_invalid_args(self, backend):
+        _skip_curve_unsupported(backend, ec.SECP256R1())
+        algorithm = ec.ECDSA(hashes.SHA256())
+        public_key = ec.generate_private_key(
+            ec.SECP256R1(), backend
+        ).public_key()
+        with raises_unsupported_algorithm(
+            exceptions._Reasons.UNSUPPORTED_PUBLIC_KEY_ALGORITHM
+        ):
+            public_key.verify_batch([], DummySignatureAlgorithm())
+        with pytest.raises(TypeError):
+            public_key.verify_batch([(u"signature", b"data")], algorithm)
+        with pytest.raises(TypeError):
+            public_key.verify_batch([(b"signature", u"data")], algorithm)
+        with pytest.raises(TypeError):
+            public_key.verify_batch([], algorithm, max_workers="2")
+        with pytest.raises(ValueError):
+            public_key.verify_batch([], algorithm, max_workers=0)
+
     def test_prehashed_unsupported_in_signer_ctx(self, backend):
         _skip_curve_unsupported(backend, ec.SECP256R1())
         private_key = ec.generate_private_key(ec.SECP256R1(), backend)
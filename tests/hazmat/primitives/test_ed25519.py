@@ -98,6 +98,51 @@ class TestEd25519Signing(object):
         with pytest.raises(InvalidSignature):
             key.public_key().verify(b"0" * 64, b"test data")
 
+    @pytest.mark.parametrize("max_workers", [1, 2, None])
+    def test_verify_batch(self, backend, max_workers):
+        key = Ed25519PrivateKey.generate()
+        messages = [os.urandom(16) for _ in range(5)]
+        items = [(key.sign(message), message) for message in messages]
+        items.append((items[0][0], b"wrong data"))
+        items.append((b"0" * 64, b"test data"))
+        items.append((b"0" * 3, b"test data"))
+        assert key.public_key().verify_batch(
+            items, max_workers=max_workers
+        ) == [True] * 5 + [False] * 3
+        assert key.public_key().verify_batch([]) == []
+        assert backend._consume_errors() == []
+
+    def test_verify_batch_default(self, backend):
+        # Keys that don't implement verify_batch call verify for every pair.
+        class PublicKey(Ed25519PublicKey):
+            def __init__(self, key):
+                self._key = key
+
+            def public_bytes(self, encoding, format):
+                return self._key.public_bytes(encoding, format)
+
+            def verify(self, signature, data):
+                self._key.verify(signature, data)
+
+        key = Ed25519PrivateKey.generate()
+        signature = key.sign(b"test data")
+        public_key = PublicKey(key.public_key())
+        assert public_key.verify_batch(
+            [(signature, b"test data"), (signature, b"wrong data")],
+            max_workers=2
+        ) == [True, False]
+        with pytest.raises(ValueError):
+            public_key.verify_batch([], max_workers=0)
+
+    def test_verify_batch_invalid_args(self, backend):
+        public_key = Ed25519PrivateKey.generate().public_key()
+        with pytest.raises(TypeError):
+            public_key.verify_batch([(u"signature", b"data")])
+        with pytest.raises(TypeError):
+            public_key.verify_batch([(b"signature", u"data")])
+        with pytest.raises(ValueError):
+            public_key.verify_batch([], max_workers=0)
+
     def test_generate(self, backend):
         key = Ed25519PrivateKey.generate()
         assert key
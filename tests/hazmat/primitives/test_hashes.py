@@ -5,9 +5,12 @@
 from __future__ import absolute_import, division, print_function
 
 import binascii
+import io
+import os
 
 import pytest
 
+from cryptography import utils
 from cryptography.exceptions import AlreadyFinalized, _Reasons
 from cryptography.hazmat.backends.interfaces import HashBackend
 from cryptography.hazmat.primitives import hashes
@@ -181,6 +184,174 @@ def test_buffer_protocol_hash(backend):
     )
 
 
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestDigest(object):
+    def test_digest(self, backend):
+        h = hashes.Hash(hashes.SHA256(), backend)
+        h.update(b"abc")
+        assert hashes.digest(hashes.SHA256(), b"abc", backend) == h.finalize()
+
+    def test_buffer_protocol(self, backend):
+        assert hashes.digest(
+            hashes.SHA256(), bytearray(b"abc"), backend
+        ) == hashes.digest(hashes.SHA256(), memoryview(b"abc"), backend)
+
+    def test_xof(self, backend):
+        if not backend.hash_supported(hashes.SHAKE128(digest_size=48)):
+            pytest.skip("Does not support SHAKE128")
+        h = hashes.Hash(hashes.SHAKE128(digest_size=48), backend)
+        h.update(b"abc")
+        assert hashes.digest(
+            hashes.SHAKE128(digest_size=48), b"abc", backend
+        ) == h.finalize()
+
+    def test_backend_without_one_shot(self, backend):
+        @utils.register_interface(HashBackend)
+        class ContextOnlyBackend(object):
+            def hash_supported(self, algorithm):
+                return backend.hash_supported(algorithm)
+
+            def create_hash_ctx(self, algorithm):
+                return backend.create_hash_ctx(algorithm)
+
+        assert hashes.digest(
+            hashes.SHA256(), b"abc", ContextOnlyBackend()
+        ) == hashes.digest(hashes.SHA256(), b"abc", backend)
+
+    def test_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA256(), u"\u00FC", backend)
+
+    def test_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest(hashes.SHA256, b"abc", backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest(DummyHashAlgorithm(), b"abc", backend)
+
+    def test_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hashes.digest(hashes.SHA256(), b"abc", object())
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestDigestMany(object):
+    def test_digest_many(self, backend):
+        data = [b"", b"abc", bytearray(b"a" * 600), memoryview(b"b" * 64)]
+        assert hashes.digest_many(
+            hashes.SHA256(), iter(data), backend
+        ) == b"".join(
+            hashes.digest(hashes.SHA256(), item, backend) for item in data
+        )
+
+    def test_empty(self, backend):
+        assert hashes.digest_many(hashes.SHA256(), [], backend) == b""
+
+    def test_xof(self, backend):
+        if not backend.hash_supported(hashes.SHAKE128(digest_size=5)):
+            pytest.skip("Does not support SHAKE128")
+        assert hashes.digest_many(
+            hashes.SHAKE128(digest_size=5), [b"a", b"b"], backend
+        ) == b"".join(
+            hashes.digest(hashes.SHAKE128(digest_size=5), item, backend)
+            for item in [b"a", b"b"]
+        )
+
+    def test_backend_without_batch(self, backend):
+        @utils.register_interface(HashBackend)
+        class ContextOnlyBackend(object):
+            def hash_supported(self, algorithm):
+                return backend.hash_supported(algorithm)
+
+            def create_hash_ctx(self, algorithm):
+                return backend.create_hash_ctx(algorithm)
+
+        data = [b"abc", b"def"]
+        assert hashes.digest_many(
+            hashes.SHA256(), data, ContextOnlyBackend()
+        ) == hashes.digest_many(hashes.SHA256(), data, backend)
+
+    def test_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest_many(hashes.SHA256(), [b"abc", u"\u00FC"], backend)
+
+    def test_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hashes.digest_many(hashes.SHA256, [b"abc"], backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hashes.digest_many(DummyHashAlgorithm(), [b"abc"], backend)
+
+    def test_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hashes.digest_many(hashes.SHA256(), [b"abc"], object())
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestHashFile(object):
+    @pytest.mark.parametrize("size", [0, 1, 4096, 100001])
+    def test_path(self, backend, tmpdir, size):
+        data = os.urandom(size)
+        path = tmpdir.join("data")
+        path.write(data, mode="wb")
+        expected = hashes.digest(hashes.SHA256(), data, backend)
+        assert hashes.hash_file(
+            hashes.SHA256(), str(path), backend
+        ) == expected
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+    def test_fileobj(self, backend, chunk_size):
+        data = os.urandom(10000)
+        assert hashes.hash_file(
+            hashes.SHA256(), io.BytesIO(data), backend, chunk_size
+        ) == hashes.digest(hashes.SHA256(), data, backend)
+
+    def test_invalid_chunk_size(self, backend):
+        with pytest.raises(TypeError):
+            hashes.hash_file(
+                hashes.SHA256(), io.BytesIO(b""), backend, chunk_size="1"
+            )
+        with pytest.raises(ValueError):
+            hashes.hash_file(
+                hashes.SHA256(), io.BytesIO(b""), backend, chunk_size=0
+            )
+
+    def test_missing_file(self, backend, tmpdir):
+        with pytest.raises(IOError):
+            hashes.hash_file(
+                hashes.SHA256(), str(tmpdir.join("missing")), backend
+            )
+
+    @pytest.mark.parametrize("max_workers", [None, 1, 3])
+    def test_hash_files(self, backend, tmpdir, max_workers):
+        srcs = []
+        expected = []
+        for i, size in enumerate([0, 100, 5000, 70000]):
+            data = os.urandom(size)
+            path = tmpdir.join(str(i))
+            path.write(data, mode="wb")
+            srcs.append(str(path))
+            expected.append(hashes.digest(hashes.SHA256(), data, backend))
+        srcs.append(io.BytesIO(b"abc"))
+        expected.append(hashes.digest(hashes.SHA256(), b"abc", backend))
+        assert hashes.hash_files(
+            hashes.SHA256(), iter(srcs), backend, max_workers=max_workers
+        ) == expected
+        assert hashes.hash_files(hashes.SHA256(), [], backend) == []
+
+    def test_hash_files_invalid_max_workers(self, backend):
+        with pytest.raises(TypeError):
+            hashes.hash_files(hashes.SHA256(), [], backend, max_workers="2")
+        with pytest.raises(ValueError):
+            hashes.hash_files(hashes.SHA256(), [], backend, max_workers=0)
+
+
 class TestSHAKE(object):
     @pytest.mark.parametrize(
         "xof",
@@ -14,6 +14,7 @@ from cryptography.exceptions import (
 )
 from cryptography.hazmat.backends.interfaces import HMACBackend
 from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf import hkdf
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF, HKDFExpand
 
 from ...utils import (
@@ -256,6 +257,80 @@ class TestHKDFExpand(object):
             hkdf.derive(u"first")
 
 
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestDeriveWith(object):
+    def test_hkdf(self, backend):
+        ikm = os.urandom(32)
+        kdf = HKDF(hashes.SHA256(), 48, b"salt", b"info", backend)
+        key = kdf.derive_with(ikm)
+        assert kdf.derive_with(bytearray(ikm)) == key
+        assert kdf.derive_with(ikm, b"other") == HKDF(
+            hashes.SHA256(), 48, b"salt", b"other", backend
+        ).derive(ikm)
+        assert kdf.derive(ikm) == key
+        assert kdf.derive_with(ikm) == key
+        with pytest.raises(TypeError):
+            kdf.derive_with(ikm, u"other")
+        with pytest.raises(TypeError):
+            kdf.derive_with(u"ikm")
+
+    def test_hkdf_expand(self, backend):
+        prk = os.urandom(32)
+        kdf = HKDFExpand(hashes.SHA256(), 48, b"info", backend)
+        key = kdf.derive_with(prk)
+        assert kdf.derive_with(prk, b"other") == HKDFExpand(
+            hashes.SHA256(), 48, b"other", backend
+        ).derive(prk)
+        assert kdf.derive(prk) == key
+        assert kdf.derive_with(prk) == key
+        with pytest.raises(TypeError):
+            kdf.derive_with(prk, u"other")
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestDeriveMany(object):
+    _outputs = [
+        (b"client key", 16), (b"server key", 16),
+        (b"client iv", 12), (None, 100),
+    ]
+
+    def test_derive_many(self, backend):
+        ikm = os.urandom(32)
+        salt = os.urandom(32)
+        keys = hkdf.derive_many(
+            hashes.SHA256(), ikm, salt, self._outputs, backend
+        )
+        assert keys == [
+            HKDF(hashes.SHA256(), length, salt, info, backend).derive(ikm)
+            for info, length in self._outputs
+        ]
+
+    def test_expand_many(self, backend):
+        prk = bytearray(os.urandom(32))
+        keys = hkdf.expand_many(hashes.SHA256(), prk, self._outputs, backend)
+        assert keys == [
+            HKDFExpand(hashes.SHA256(), length, info, backend).derive(prk)
+            for info, length in self._outputs
+        ]
+
+    def test_no_outputs(self, backend):
+        assert hkdf.derive_many(
+            hashes.SHA256(), b"ikm", None, [], backend
+        ) == []
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(ValueError):
+            hkdf.expand_many(
+                hashes.SHA256(), b"prk", [(b"", 255 * 32 + 1)], backend
+            )
+        with pytest.raises(TypeError):
+            hkdf.expand_many(hashes.SHA256(), b"prk", [(u"info", 16)], backend)
+        with pytest.raises(TypeError):
+            hkdf.derive_many(hashes.SHA256(), u"ikm", None, [], backend)
+        with pytest.raises(TypeError):
+            hkdf.derive_many(hashes.SHA256(), b"ikm", u"salt", [], backend)
+
+
 def test_invalid_backend():
     pretend_backend = object()
 
@@ -264,3 +339,9 @@ def test_invalid_backend():
 
     with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
         HKDFExpand(hashes.SHA256(), 16, None, pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        hkdf.derive_many(hashes.SHA256(), b"ikm", None, [], pretend_backend)
+
+    with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+        hkdf.expand_many(hashes.SHA256(), b"prk", [], pretend_backend)
@@ -6,8 +6,11 @@ from __future__ import absolute_import, division, print_function
 
 import binascii
 
+import pretend
+
 import pytest
 
+from cryptography import utils
 from cryptography.exceptions import (
     AlreadyFinalized, InvalidSignature, _Reasons
 )
@@ -90,6 +93,117 @@ class TestHMAC(object):
         )
 
 
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestHMACKey(object):
+    def _hmac(self, backend, data):
+        h = hmac.HMAC(b"key", hashes.SHA256(), backend)
+        h.update(data)
+        return h.finalize()
+
+    def test_sign(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        assert key.algorithm.name == "sha256"
+        for data in [b"", b"abc", bytearray(b"abc"), b"a" * 1000, b"abc"]:
+            assert key.sign(data) == self._hmac(backend, data)
+
+    def test_new(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        h = key.new()
+        h.update(b"ab")
+        h2 = key.new()
+        h.update(b"c")
+        assert h.finalize() == self._hmac(backend, b"abc")
+        assert h2.finalize() == self._hmac(backend, b"")
+
+    def test_verify(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        key.verify(b"abc", self._hmac(backend, b"abc"))
+        with pytest.raises(InvalidSignature):
+            key.verify(b"abd", self._hmac(backend, b"abc"))
+        with pytest.raises(TypeError):
+            key.verify(b"abc", u"signature")
+
+    def test_backend_without_copy_digest(self, backend):
+        @utils.register_interface(HMACBackend)
+        class ContextOnlyBackend(object):
+            def hmac_supported(self, algorithm):
+                return backend.hmac_supported(algorithm)
+
+            def create_hmac_ctx(self, key, algorithm):
+                return pretend.stub(
+                    copy=backend.create_hmac_ctx(key, algorithm).copy
+                )
+
+        key = hmac.HMACKey(b"key", hashes.SHA256(), ContextOnlyBackend())
+        assert key.sign(b"abc") == self._hmac(backend, b"abc")
+
+    def test_reject_unicode(self, backend):
+        key = hmac.HMACKey(b"key", hashes.SHA256(), backend)
+        with pytest.raises(TypeError):
+            key.sign(u"\u00FC")
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            hmac.HMACKey(b"key", hashes.SHA256, backend)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hmac.HMACKey(b"key", DummyHashAlgorithm(), backend)
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hmac.HMACKey(b"key", hashes.SHA256(), object())
+
+
+@pytest.mark.requires_backend_interface(interface=HMACBackend)
+class TestDigestMany(object):
+    def test_digest_many(self, backend):
+        data = [b"", b"abc", bytearray(b"a" * 600), memoryview(b"b" * 64)]
+        expected = []
+        for item in data:
+            h = hmac.HMAC(b"key", hashes.SHA256(), backend)
+            h.update(item)
+            expected.append(h.finalize())
+        assert hmac.digest_many(
+            b"key", hashes.SHA256(), iter(data), backend
+        ) == b"".join(expected)
+
+    def test_empty(self, backend):
+        assert hmac.digest_many(b"key", hashes.SHA256(), [], backend) == b""
+
+    def test_backend_without_batch(self, backend):
+        @utils.register_interface(HMACBackend)
+        class ContextOnlyBackend(object):
+            def hmac_supported(self, algorithm):
+                return backend.hmac_supported(algorithm)
+
+            def create_hmac_ctx(self, key, algorithm):
+                return backend.create_hmac_ctx(key, algorithm)
+
+        data = [b"abc", b"def"]
+        assert hmac.digest_many(
+            b"key", hashes.SHA256(), data, ContextOnlyBackend()
+        ) == hmac.digest_many(b"key", hashes.SHA256(), data, backend)
+
+    def test_reject_unicode(self, backend):
+        with pytest.raises(TypeError):
+            hmac.digest_many(
+                b"key", hashes.SHA256(), [b"abc", u"\u00FC"], backend
+            )
+
+    def test_algorithm_instance(self, backend):
+        with pytest.raises(TypeError):
+            hmac.digest_many(b"key", hashes.SHA256, [b"abc"], backend)
+
+    def test_unsupported_hash(self, backend):
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_HASH):
+            hmac.digest_many(b"key", DummyHashAlgorithm(), [b"abc"], backend)
+
+    def test_invalid_backend(self):
+        with raises_unsupported_algorithm(
+            _Reasons.BACKEND_MISSING_INTERFACE
+        ):
+            hmac.digest_many(b"key", hashes.SHA256(), [b"abc"], object())
+
+
 def test_invalid_backend():
     pretend_backend = object()
 
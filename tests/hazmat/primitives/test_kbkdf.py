@@ -156,3 +156,36 @@ class TestKBKDFHMAC(object):
 
         key = kdf.derive(bytearray(b"material"))
         assert key == b'\xb7\x01\x05\x98\xf5\x1a\x12L\xc7.'
+
+    def test_derive_with(self, backend):
+        kdf = KBKDFHMAC(hashes.SHA256(), Mode.CounterMode, 10, 4, 4,
+                        CounterLocation.BeforeFixed, b'label', b'context',
+                        None, backend=backend)
+
+        key = b'\xb7\x01\x05\x98\xf5\x1a\x12L\xc7.'
+        assert kdf.derive_with(b"material") == key
+        assert kdf.derive_with(b"material", context=b"other") == KBKDFHMAC(
+            hashes.SHA256(), Mode.CounterMode, 10, 4, 4,
+            CounterLocation.BeforeFixed, b'label', b'other', None,
+            backend=backend
+        ).derive(b"material")
+        assert kdf.derive_with(b"material", label=b"other") == KBKDFHMAC(
+            hashes.SHA256(), Mode.CounterMode, 10, 4, 4,
+            CounterLocation.BeforeFixed, b'other', b'context', None,
+            backend=backend
+        ).derive(b"material")
+        assert kdf.derive(b"material") == key
+        assert kdf.derive_with(b"material") == key
+        with pytest.raises(TypeError):
+            kdf.derive_with(b"material", label=u"label")
+        with pytest.raises(TypeError):
+            kdf.derive_with(b"material", context=u"context")
+
+    def test_derive_with_fixed(self, backend):
+        kdf = KBKDFHMAC(hashes.SHA256(), Mode.CounterMode, 10, 4, 4,
+                        CounterLocation.BeforeFixed, None, None,
+                        b'fixed', backend=backend)
+
+        assert kdf.derive_with(b"material") == kdf.derive(b"material")
+        with pytest.raises(ValueError):
+            kdf.derive_with(b"material", label=b"label")
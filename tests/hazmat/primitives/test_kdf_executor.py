@@ -0,0 +1,222 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import threading
+import time
+
+import pytest
+
+from cryptography.exceptions import AlreadyFinalized, InvalidKey
+from cryptography.hazmat.backends.interfaces import (
+    PBKDF2HMACBackend, ScryptBackend
+)
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.executor import KDFExecutor
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.scrypt import Scrypt
+
+asyncio = pytest.importorskip("asyncio")
+
+
+@pytest.fixture
+def executor():
+    executor = KDFExecutor(max_workers=4)
+    yield executor
+    executor.shutdown()
+
+
+def _run(fn, *args):
+    # Calls fn from inside a new event loop, as a coroutine would, and waits
+    # for the future it returns.
+    loop = asyncio.new_event_loop()
+    try:
+        # A derivation that is never resolved should fail, not hang.
+        return loop.run_until_complete(
+            asyncio.wait_for(_call_in_loop(loop, fn, *args), 60)
+        )
+    finally:
+        loop.close()
+
+
+def _call_in_loop(loop, fn, *args):
+    result = loop.create_future()
+
+    def copy(inner):
+        if inner.exception() is not None:
+            result.set_exception(inner.exception())
+        else:
+            result.set_result(inner.result())
+
+    def call():
+        try:
+            inner = fn(*args)
+        except Exception as e:
+            result.set_exception(e)
+        else:
+            inner.add_done_callback(copy)
+
+    loop.call_soon(call)
+    return result
+
+
+def _gather(*fns):
+    return _run(lambda: asyncio.gather(*[fn() for fn in fns]))
+
+
+class TestKDFExecutor(object):
+    def test_invalid_arguments(self):
+        with pytest.raises(TypeError):
+            KDFExecutor(max_workers="4")
+        with pytest.raises(ValueError):
+            KDFExecutor(max_workers=0)
+        with pytest.raises(TypeError):
+            KDFExecutor(memory_limit=1.5)
+        with pytest.raises(ValueError):
+            KDFExecutor(memory_limit=0)
+
+    def test_properties(self):
+        executor = KDFExecutor(max_workers=2, memory_limit=1024)
+        assert executor.max_workers == 2
+        assert executor.memory_limit == 1024
+        executor.shutdown()
+
+    def test_memory_limit(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def work(value):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.05)
+            with lock:
+                running[0] -= 1
+            return value
+
+        limited = KDFExecutor(max_workers=4, memory_limit=100)
+        try:
+            results = _gather(*[
+                lambda i=i: limited._submit(60, work, i) for i in range(4)
+            ])
+        finally:
+            limited.shutdown()
+        assert results == [0, 1, 2, 3]
+        assert peak[0] == 1
+
+        with pytest.raises(ValueError):
+            limited._submit(101, work, 0)
+
+    def test_loop_closed_while_pending(self):
+        # The first derivation finishes after its loop has been closed. The
+        # executor must drop that result and keep serving other loops.
+        executor = KDFExecutor(max_workers=1)
+        release = threading.Event()
+        try:
+            loop = asyncio.new_event_loop()
+            loop.call_soon(executor._submit, 0, release.wait)
+            loop.call_soon(loop.stop)
+            loop.run_forever()
+            loop.close()
+            release.set()
+
+            assert _run(executor._submit, 0, lambda: 42) == 42
+        finally:
+            release.set()
+            executor.shutdown()
+
+    def test_requires_running_loop(self, executor):
+        if not hasattr(asyncio, "get_running_loop"):
+            pytest.skip("Requires Python 3.7 or later")
+        with pytest.raises(RuntimeError):
+            executor._submit(0, lambda: 42)
+
+    def test_exception(self, executor):
+        def fail():
+            raise ValueError("fail")
+
+        with pytest.raises(ValueError):
+            _run(executor._submit, 0, fail)
+
+
+@pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+class TestPBKDF2HMACAsync(object):
+    def _kdf(self, backend):
+        return PBKDF2HMAC(hashes.SHA256(), 32, b"salt", 1000, backend)
+
+    def test_derive_async(self, backend, executor):
+        key = self._kdf(backend).derive(b"password")
+        kdfs = [self._kdf(backend) for _ in range(8)]
+        assert _gather(*[
+            lambda kdf=kdf: kdf.derive_async(b"password", executor)
+            for kdf in kdfs
+        ]) == [key] * 8
+
+    def test_default_executor(self, backend):
+        key = self._kdf(backend).derive(b"password")
+        assert _run(self._kdf(backend).derive_async, b"password") == key
+
+    def test_verify_async(self, backend, executor):
+        key = self._kdf(backend).derive(b"password")
+        assert _run(
+            self._kdf(backend).verify_async, b"password", key, executor
+        ) is None
+        with pytest.raises(InvalidKey):
+            _run(self._kdf(backend).verify_async, b"wrong", key, executor)
+
+    def test_already_finalized(self, backend, executor):
+        kdf = self._kdf(backend)
+        kdf.derive(b"password")
+        with pytest.raises(AlreadyFinalized):
+            kdf.derive_async(b"password", executor)
+        with pytest.raises(AlreadyFinalized):
+            kdf.verify_async(b"password", b"key", executor)
+
+    def test_invalid_arguments(self, backend, executor):
+        with pytest.raises(TypeError):
+            self._kdf(backend).derive_async(u"password", executor)
+        with pytest.raises(TypeError):
+            self._kdf(backend).derive_async(b"password", object())
+
+
+@pytest.mark.requires_backend_interface(interface=ScryptBackend)
+class TestScryptAsync(object):
+    def _kdf(self, backend):
+        return Scrypt(b"NaCl", 64, 1024, 8, 16, backend)
+
+    def test_derive_async(self, backend, executor):
+        key = self._kdf(backend).derive(b"password")
+        assert _run(
+            self._kdf(backend).derive_async, b"password", executor
+        ) == key
+
+    def test_verify_async(self, backend, executor):
+        key = self._kdf(backend).derive(b"password")
+        assert _run(
+            self._kdf(backend).verify_async, b"password", key, executor
+        ) is None
+        with pytest.raises(InvalidKey):
+            _run(self._kdf(backend).verify_async, b"wrong", key, executor)
+
+    def test_memory_limit(self, backend):
+        # n = 1024, r = 8 and p = 16 need a little over 1 MiB.
+        executor = KDFExecutor(max_workers=2, memory_limit=1024 * 1024)
+        try:
+            with pytest.raises(ValueError):
+                self._kdf(backend).derive_async(b"password", executor)
+        finally:
+            executor.shutdown()
+
+        executor = KDFExecutor(max_workers=4, memory_limit=2 * 1024 * 1024)
+        try:
+            key = self._kdf(backend).derive(b"password")
+            kdfs = [self._kdf(backend) for _ in range(4)]
+            assert _gather(*[
+                lambda kdf=kdf: kdf.derive_async(b"password", executor)
+                for kdf in kdfs
+            ]) == [key] * 4
+        finally:
+            executor.shutdown()
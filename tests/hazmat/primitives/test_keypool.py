@@ -0,0 +1,186 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import itertools
+import threading
+import warnings
+
+import pytest
+
+from cryptography.exceptions import AlreadyFinalized
+from cryptography.hazmat.backends.interfaces import RSABackend
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.asymmetric.keypool import KeyPool
+
+
+def _counter():
+    counter = itertools.count()
+    return lambda: next(counter)
+
+
+class TestKeyPool(object):
+    def test_invalid_arguments(self):
+        with pytest.raises(TypeError):
+            KeyPool(object(), 1)
+        with pytest.raises(TypeError):
+            KeyPool(_counter(), "1")
+        with pytest.raises(ValueError):
+            KeyPool(_counter(), 0)
+        with pytest.raises(TypeError):
+            KeyPool(_counter(), 1, max_workers="2")
+        with pytest.raises(ValueError):
+            KeyPool(_counter(), 1, max_workers=0)
+        with pytest.raises(TypeError):
+            KeyPool(_counter(), 1, on_refill=object())
+        with pytest.raises(TypeError):
+            KeyPool(_counter(), 1, on_get=object())
+
+    def test_fill_and_get(self):
+        with KeyPool(_counter(), 4, max_workers=2) as pool:
+            assert pool.size == 4
+            assert pool.max_workers == 2
+            assert pool.fill(timeout=10) is True
+            assert pool.available == 4
+            assert pool.generated == 4
+            keys = [pool.get() for _ in range(4)]
+            assert pool.hits == 4
+            assert pool.misses == 0
+            # Each key is handed out only once.
+            assert sorted(keys) == [0, 1, 2, 3]
+            assert pool.fill(timeout=10) is True
+            assert pool.generated == 8
+
+    def test_miss_generates_inline(self):
+        release = threading.Event()
+        calls = []
+
+        def generate():
+            calls.append(threading.current_thread())
+            if threading.current_thread() is not caller:
+                release.wait()
+            return len(calls)
+
+        caller = threading.current_thread()
+        pool = KeyPool(generate, 1)
+        try:
+            assert pool.get() is not None
+            assert pool.misses == 1
+            assert pool.hits == 0
+            assert caller in calls
+        finally:
+            release.set()
+            pool.close()
+
+    def test_hooks(self):
+        refills = []
+        gets = []
+        pool = KeyPool(
+            _counter(), 2,
+            on_refill=lambda p: refills.append(p),
+            on_get=lambda p, hit: gets.append((p, hit))
+        )
+        with pool:
+            assert pool.fill(timeout=10) is True
+            pool.get()
+            assert pool.fill(timeout=10) is True
+        assert refills == [pool] * 3
+        assert gets == [(pool, True)]
+
+    def test_generate_error(self):
+        def generate():
+            raise ValueError("fail")
+
+        with KeyPool(generate, 2) as pool:
+            with pytest.raises(ValueError):
+                pool.fill()
+            assert pool.available == 0
+            # An empty pool always falls back to generating in the caller's
+            # thread, which raises the same error.
+            with pytest.raises(ValueError):
+                pool.get()
+
+    def test_generate_error_then_get(self):
+        calls = _counter()
+
+        def generate():
+            if calls() == 0:
+                raise ValueError("fail")
+            return "key"
+
+        with KeyPool(generate, 2) as pool:
+            with pytest.raises(ValueError):
+                pool.fill()
+            assert pool.get() == "key"
+            assert pool.misses == 1
+
+    def test_on_refill_error(self):
+        def on_refill(pool):
+            raise ValueError("fail")
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            pool = KeyPool(_counter(), 2, on_refill=on_refill)
+            # The hook failing doesn't stop the pool from filling up.
+            assert pool.fill(timeout=10) is True
+            assert pool.get() in (0, 1)
+            assert pool.fill(timeout=10) is True
+            # Once the workers have been joined every hook call has finished.
+            pool.close()
+        assert pool.generated == 3
+        assert pool.hook_errors == 3
+
+    def test_close_from_on_refill(self):
+        closed = threading.Event()
+
+        def on_refill(pool):
+            pool.close()
+            closed.set()
+
+        pool = KeyPool(_counter(), 2, on_refill=on_refill)
+        assert closed.wait(10)
+        assert pool.available == 0
+        with pytest.raises(AlreadyFinalized):
+            pool.get()
+        pool.close()
+
+    def test_fill_timeout(self):
+        release = threading.Event()
+
+        def generate():
+            release.wait()
+            return 0
+
+        pool = KeyPool(generate, 1)
+        try:
+            assert pool.fill(timeout=0.05) is False
+        finally:
+            release.set()
+            pool.close()
+
+    def test_close(self):
+        pool = KeyPool(_counter(), 2)
+        assert pool.fill(timeout=10) is True
+        pool.close()
+        assert pool.available == 0
+        assert pool.fill() is False
+        with pytest.raises(AlreadyFinalized):
+            pool.get()
+
+
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+def test_rsa_key_pool(backend):
+    def generate():
+        return rsa.generate_private_key(65537, 1024, backend)
+
+    with KeyPool(generate, 2, max_workers=2) as pool:
+        assert pool.fill(timeout=60) is True
+        first = pool.get()
+        second = pool.get()
+        assert isinstance(first, rsa.RSAPrivateKey)
+        assert first.key_size == 1024
+        assert (
+            first.private_numbers().p != second.private_numbers().p
+        )
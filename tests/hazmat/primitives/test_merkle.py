@@ -0,0 +1,197 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+import os
+
+import pytest
+
+from cryptography.exceptions import InvalidSignature, _Reasons
+from cryptography.hazmat.backends.interfaces import HashBackend
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.merkle import (
+    MerkleTree, MerkleTreeHash, verify_consistency, verify_inclusion
+)
+
+from ...utils import raises_unsupported_algorithm
+
+
+# The test data and roots from the certificate-transparency reference
+# implementation's merkle_tree_test.
+_LEAVES = [
+    b"", b"\x00", b"\x10", b"\x20\x21", b"\x30\x31", b"\x40\x41\x42\x43",
+    b"\x50\x51\x52\x53\x54\x55\x56\x57",
+    b"\x60\x61\x62\x63\x64\x65\x66\x67\x68\x69\x6a\x6b\x6c\x6d\x6e\x6f",
+]
+_ROOTS = [
+    b"e3b0c44298fc1c149afbf4c8996fb92427ae41e4649b934ca495991b7852b855",
+    b"6e340b9cffb37a989ca544e6bb780a2c78901d3fb33738768511a30617afa01d",
+    b"fac54203e7cc696cf0dfcb42c92a1d9dbaf70ad9e621f4bd8d98662f00e3c125",
+    b"aeb6bcfe274b70a14fb067a5e5578264db0fa9b51af5e0ba159158f329e06e77",
+    b"d37ee418976dd95753c1c73862b9398fa2a2cf9b4ff0fdfe8b30cd95209614b7",
+    b"4e3bbb1f7b478dcfe71fb631631519a3bca12c9aefca1612bfce4c13a86264d4",
+    b"76e67dadbcdf1e10e1b74ddc608abd2f98dfb16fbce75277b5232a127f2087ef",
+    b"ddb89be403809e325750d3d263cd78929c2942b7942a34b77e122c9594a74c8c",
+    b"5dc9da79a70659a9ad559cb701ded9a2ab9d823aad2f4960cfe370eff4604328",
+]
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestMerkleTreeHash(object):
+    def test_roots(self, backend):
+        tree_hash = MerkleTreeHash(hashes.SHA256(), backend)
+        assert tree_hash.root() == binascii.unhexlify(_ROOTS[0])
+        for size, leaf in enumerate(_LEAVES, 1):
+            tree_hash.append(leaf)
+            assert tree_hash.tree_size == size
+            assert tree_hash.root() == binascii.unhexlify(_ROOTS[size])
+
+    def test_extend(self, backend):
+        tree_hash = MerkleTreeHash(hashes.SHA256(), backend)
+        tree_hash.extend(iter(_LEAVES[:3]))
+        tree_hash.extend(_LEAVES[3:])
+        assert tree_hash.root() == binascii.unhexlify(_ROOTS[-1])
+        assert tree_hash.algorithm.name == "sha256"
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            MerkleTreeHash(hashes.SHA256, backend)
+        with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+            MerkleTreeHash(hashes.SHA256(), object())
+        with pytest.raises(TypeError):
+            MerkleTreeHash(hashes.SHA256(), backend).append(u"leaf")
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestMerkleTree(object):
+    def test_roots(self, backend):
+        tree = MerkleTree(hashes.SHA256(), backend)
+        tree.extend(_LEAVES)
+        assert tree.tree_size == len(_LEAVES)
+        for size, root in enumerate(_ROOTS):
+            assert tree.root(size) == binascii.unhexlify(root)
+        assert tree.root() == binascii.unhexlify(_ROOTS[-1])
+
+    def test_proofs(self, backend):
+        leaves = [os.urandom(4) for _ in range(33)]
+        tree = MerkleTree(hashes.SHA256(), backend)
+        tree.extend(leaves)
+        for size in range(1, len(leaves) + 1):
+            root = tree.root(size)
+            for index in range(size):
+                proof = tree.inclusion_proof(index, size)
+                verify_inclusion(
+                    hashes.SHA256(), leaves[index], index, size, proof, root,
+                    backend
+                )
+                with pytest.raises(InvalidSignature):
+                    verify_inclusion(
+                        hashes.SHA256(), leaves[index] + b"\x00", index,
+                        size, proof, root, backend
+                    )
+
+            for old_size in range(1, size + 1):
+                proof = tree.consistency_proof(old_size, size)
+                old_root = tree.root(old_size)
+                verify_consistency(
+                    hashes.SHA256(), old_size, size, old_root, root, proof,
+                    backend
+                )
+                if old_size < size:
+                    with pytest.raises(InvalidSignature):
+                        verify_consistency(
+                            hashes.SHA256(), old_size, size, old_root, root,
+                            proof[:-1], backend
+                        )
+                    with pytest.raises(InvalidSignature):
+                        verify_consistency(
+                            hashes.SHA256(), old_size, size, root, root,
+                            proof, backend
+                        )
+
+    def test_proof_sizes(self, backend):
+        tree = MerkleTree(hashes.SHA256(), backend)
+        tree.extend(_LEAVES[:7])
+        assert len(tree.inclusion_proof(0)) == 3
+        assert len(tree.inclusion_proof(6)) == 2
+        assert tree.inclusion_proof(0, 1) == []
+        assert tree.consistency_proof(7) == []
+        assert len(tree.consistency_proof(4)) == 1
+        assert len(tree.consistency_proof(3)) == 4
+        assert len(tree.consistency_proof(1, 2)) == 1
+
+    def test_invalid_sizes(self, backend):
+        tree = MerkleTree(hashes.SHA256(), backend)
+        tree.extend(_LEAVES[:4])
+        with pytest.raises(ValueError):
+            tree.root(5)
+        with pytest.raises(ValueError):
+            tree.inclusion_proof(4)
+        with pytest.raises(ValueError):
+            tree.inclusion_proof(2, 2)
+        with pytest.raises(ValueError):
+            tree.inclusion_proof(-1)
+        with pytest.raises(TypeError):
+            tree.inclusion_proof(0, "4")
+        with pytest.raises(ValueError):
+            tree.consistency_proof(0)
+        with pytest.raises(ValueError):
+            tree.consistency_proof(3, 2)
+
+
+@pytest.mark.requires_backend_interface(interface=HashBackend)
+class TestVerify(object):
+    def test_inclusion_wrong_position(self, backend):
+        tree = MerkleTree(hashes.SHA256(), backend)
+        tree.extend(_LEAVES)
+        proof = tree.inclusion_proof(2)
+        root = tree.root()
+        for index, size in [(3, 8), (2, 4), (2, 9), (8, 8)]:
+            with pytest.raises(InvalidSignature):
+                verify_inclusion(
+                    hashes.SHA256(), _LEAVES[2], index, size, proof, root,
+                    backend
+                )
+        with pytest.raises(InvalidSignature):
+            verify_inclusion(
+                hashes.SHA256(), _LEAVES[2], 2, 8, proof + [root], root,
+                backend
+            )
+
+    def test_consistency_same_size(self, backend):
+        root = binascii.unhexlify(_ROOTS[3])
+        verify_consistency(hashes.SHA256(), 3, 3, root, root, [], backend)
+        with pytest.raises(InvalidSignature):
+            verify_consistency(
+                hashes.SHA256(), 3, 3, root, root, [root], backend
+            )
+        with pytest.raises(InvalidSignature):
+            verify_consistency(
+                hashes.SHA256(), 3, 3, root, binascii.unhexlify(_ROOTS[4]),
+                [], backend
+            )
+
+    def test_consistency_empty_proof(self, backend):
+        with pytest.raises(InvalidSignature):
+            verify_consistency(
+                hashes.SHA256(), 3, 4, binascii.unhexlify(_ROOTS[3]),
+                binascii.unhexlify(_ROOTS[4]), [], backend
+            )
+
+    def test_invalid_arguments(self, backend):
+        root = binascii.unhexlify(_ROOTS[1])
+        with pytest.raises(ValueError):
+            verify_consistency(hashes.SHA256(), 0, 1, root, root, [], backend)
+        with pytest.raises(ValueError):
+            verify_consistency(hashes.SHA256(), 2, 1, root, root, [], backend)
+        with pytest.raises(TypeError):
+            verify_inclusion(
+                hashes.SHA256(), b"", 0, 1, [u"node"], root, backend
+            )
+        with pytest.raises(TypeError):
+            verify_inclusion(hashes.SHA256(), b"", 0, 1, [], u"root", backend)
+        with raises_unsupported_algorithm(_Reasons.BACKEND_MISSING_INTERFACE):
+            verify_inclusion(hashes.SHA256(), b"", 0, 1, [], root, object())
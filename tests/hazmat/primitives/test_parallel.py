@@ -0,0 +1,136 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import binascii
+import os
+
+import pytest
+
+from cryptography.hazmat.backends.interfaces import CipherBackend
+from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives.ciphers import parallel
+from cryptography.hazmat.primitives.ciphers.parallel import ParallelCipher
+
+
+@pytest.fixture
+def small_tasks(monkeypatch):
+    # Small tasks so that short inputs are still split across workers.
+    monkeypatch.setattr(parallel, "_TASK_SIZE", 4096)
+
+
+def _xts_tweak(tweak, index):
+    value = int(binascii.hexlify(tweak[::-1]), 16) + index
+    return binascii.unhexlify("{:032x}".format(value % 2 ** 128))[::-1]
+
+
+@pytest.mark.requires_backend_interface(interface=CipherBackend)
+@pytest.mark.usefixtures("small_tasks")
+class TestParallelCipher(object):
+    @pytest.mark.parametrize("size", [0, 1, 4095, 4096, 4097, 50007])
+    @pytest.mark.parametrize("nonce", [
+        b"\x00" * 16,
+        # Wraps around from the largest counter value to zero.
+        b"\xff" * 15 + b"\xfd",
+    ])
+    def test_ctr_matches_serial(self, backend, size, nonce):
+        key = os.urandom(32)
+        data = os.urandom(size)
+        pc = ParallelCipher(
+            algorithms.AES(key), modes.CTR(nonce), backend, max_workers=4
+        )
+        ct = Cipher(
+            algorithms.AES(key), modes.CTR(nonce), backend
+        ).encryptor().update(data)
+        assert pc.encrypt(data) == ct
+        assert pc.decrypt(ct) == data
+
+    @pytest.mark.parametrize(
+        "size", [512, 8192, 512 * 21 + 16, 512 * 21 + 511]
+    )
+    def test_xts_matches_serial(self, backend, size):
+        key = os.urandom(64)
+        tweak = b"\xff" * 4 + os.urandom(12)
+        data = os.urandom(size)
+        pc = ParallelCipher(
+            algorithms.AES(key), modes.XTS(tweak), backend,
+            data_unit_size=512, max_workers=3
+        )
+        ct = b"".join(
+            Cipher(
+                algorithms.AES(key), modes.XTS(_xts_tweak(tweak, i)), backend
+            ).encryptor().update(data[offset:offset + 512])
+            for i, offset in enumerate(range(0, size, 512))
+        )
+        assert pc.encrypt(data) == ct
+        assert pc.decrypt(ct) == data
+
+    def test_xts_without_batch(self, backend, monkeypatch):
+        # Backends without the batch helper are driven one data unit at a
+        # time.
+        ctx = backend.create_symmetric_encryption_ctx(
+            algorithms.AES(os.urandom(32)), modes.XTS(os.urandom(16))
+        )
+        monkeypatch.delattr(type(ctx), "_update_xts_units")
+        key = os.urandom(64)
+        tweak = os.urandom(16)
+        data = os.urandom(512 * 9 + 100)
+        pc = ParallelCipher(
+            algorithms.AES(key), modes.XTS(tweak), backend,
+            data_unit_size=512, max_workers=2
+        )
+        ct = b"".join(
+            Cipher(
+                algorithms.AES(key), modes.XTS(_xts_tweak(tweak, i)), backend
+            ).encryptor().update(data[offset:offset + 512])
+            for i, offset in enumerate(range(0, len(data), 512))
+        )
+        assert pc.encrypt(data) == ct
+        assert pc.decrypt(ct) == data
+
+    def test_encrypt_into(self, backend):
+        key = os.urandom(16)
+        nonce = os.urandom(16)
+        data = os.urandom(10000)
+        pc = ParallelCipher(algorithms.AES(key), modes.CTR(nonce), backend)
+        buf = bytearray(len(data) + 3)
+        assert pc.encrypt_into(memoryview(data), buf) == len(data)
+        assert bytes(buf[:len(data)]) == pc.encrypt(data)
+        assert buf[len(data):] == bytearray(3)
+        out = bytearray(len(data))
+        assert pc.decrypt_into(bytes(buf[:len(data)]), out) == len(data)
+        assert bytes(out) == data
+        with pytest.raises(ValueError):
+            pc.encrypt_into(data, bytearray(len(data) - 1))
+
+    def test_xts_short_final_unit(self, backend):
+        pc = ParallelCipher(
+            algorithms.AES(os.urandom(64)), modes.XTS(os.urandom(16)),
+            backend, data_unit_size=512
+        )
+        with pytest.raises(ValueError):
+            pc.encrypt(b"\x00" * (512 + 15))
+
+    def test_invalid_arguments(self, backend):
+        aes = algorithms.AES(os.urandom(32))
+        ctr = modes.CTR(os.urandom(16))
+        xts = modes.XTS(os.urandom(16))
+        with pytest.raises(TypeError):
+            ParallelCipher(aes, modes.CBC(os.urandom(16)), backend)
+        with pytest.raises(ValueError):
+            ParallelCipher(aes, ctr, backend, data_unit_size=512)
+        with pytest.raises(TypeError):
+            ParallelCipher(aes, xts, backend)
+        with pytest.raises(ValueError):
+            ParallelCipher(aes, xts, backend, data_unit_size=15)
+        with pytest.raises(TypeError):
+            ParallelCipher(aes, ctr, backend, max_workers="4")
+        with pytest.raises(ValueError):
+            ParallelCipher(aes, ctr, backend, max_workers=0)
+        with pytest.raises(ValueError):
+            ParallelCipher(algorithms.AES(os.urandom(16)), xts, backend,
+                           data_unit_size=512)
+        with pytest.raises(TypeError):
+            ParallelCipher(aes, ctr, backend).encrypt(u"text")
@@ -0,0 +1,190 @@
+# This file is dual licensed under the terms of the Apache License, Version
+# 2.0, and the BSD License. See the LICENSE file in the root of this repository
+# for complete details.
+
+from __future__ import absolute_import, division, print_function
+
+import base64
+import binascii
+
+import pytest
+
+from cryptography.exceptions import InvalidKey
+from cryptography.hazmat.backends.interfaces import (
+    PBKDF2HMACBackend, ScryptBackend
+)
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf import passwords
+from cryptography.hazmat.primitives.kdf.passwords import (
+    PBKDF2Hasher, ScryptHasher
+)
+
+
+def _b64(hexdata):
+    return base64.b64encode(
+        binascii.unhexlify(hexdata)
+    ).rstrip(b"=").decode("ascii")
+
+
+# RFC 7914 section 12.
+SCRYPT_PHC = u"$scrypt$ln=10,r=8,p=16$TmFDbA${}".format(_b64(
+    b"fdbabe1c9d3472007856e7190d01e9fe7c6ad7cbc8237830e77376634b373162"
+    b"2eaf30d92e22a3886ff109279d9830dac727afb94a83ee6d8360cbdfa2cc0640"
+))
+# RFC 6070.
+PBKDF2_PHC = u"$pbkdf2-sha1$i=2$c2FsdA${}".format(
+    _b64(b"ea6c014dc72d6f8ccd1ed92ace1d41f0d8de8957")
+)
+
+
+@pytest.mark.requires_backend_interface(interface=ScryptBackend)
+class TestScryptHasher(object):
+    def test_verify_vector(self, backend):
+        passwords.verify(b"password", SCRYPT_PHC, backend)
+        with pytest.raises(InvalidKey):
+            passwords.verify(b"wrong", SCRYPT_PHC, backend)
+
+    def test_hash(self, backend):
+        hasher = ScryptHasher(1024, 8, 1, backend)
+        phc = hasher.hash(b"password")
+        assert phc.startswith(u"$scrypt$ln=10,r=8,p=1$")
+        assert phc != hasher.hash(b"password")
+        hasher.verify(b"password", phc)
+        hasher.verify(bytearray(b"password"), phc.encode("ascii"))
+        with pytest.raises(InvalidKey):
+            hasher.verify(b"wrong", phc)
+
+    def test_needs_rehash(self, backend):
+        hasher = ScryptHasher(1024, 8, 1, backend)
+        assert not hasher.needs_rehash(hasher.hash(b"password"))
+        assert hasher.needs_rehash(
+            ScryptHasher(2048, 8, 1, backend).hash(b"password")
+        )
+        assert hasher.needs_rehash(
+            ScryptHasher(1024, 8, 1, backend, salt_length=32).hash(b"pw")
+        )
+        assert hasher.needs_rehash(SCRYPT_PHC)
+        assert hasher.needs_rehash(PBKDF2_PHC)
+
+    def test_tune(self, backend):
+        hasher = ScryptHasher.tune(0.001, backend, r=4)
+        assert hasher.n >= 1024
+        assert hasher.r == 4
+        assert hasher.p == 1
+
+    def test_tune_memory_limit(self, backend, monkeypatch):
+        # However fast the machine, tune stops at the largest n that fits
+        # in the 1 GiB limit: 128 * 8 * (2 ** 19 + 1 + 2) bytes.
+        monkeypatch.setattr(passwords, "_time", lambda kdf: 0.0)
+        hasher = ScryptHasher.tune(1.0, backend)
+        assert hasher.n == 2 ** 19
+        assert hasher.r == 8
+        assert hasher.p == 1
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(ValueError):
+            ScryptHasher(1000, 8, 1, backend)
+        with pytest.raises(ValueError):
+            ScryptHasher(1024, 8, 1, backend, salt_length=4)
+        with pytest.raises(ValueError):
+            ScryptHasher(1024, 8, 1, backend, length=8)
+        with pytest.raises(TypeError):
+            ScryptHasher(1024, 8, 1, backend).hash(u"password")
+
+
+@pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+class TestPBKDF2Hasher(object):
+    def test_verify_vector(self, backend):
+        passwords.verify(b"password", PBKDF2_PHC, backend)
+        with pytest.raises(InvalidKey):
+            passwords.verify(b"wrong", PBKDF2_PHC, backend)
+
+    def test_hash(self, backend):
+        hasher = PBKDF2Hasher(hashes.SHA256(), 1000, backend)
+        phc = hasher.hash(b"password")
+        assert phc.startswith(u"$pbkdf2-sha256$i=1000$")
+        hasher.verify(b"password", phc)
+        with pytest.raises(InvalidKey):
+            hasher.verify(b"wrong", phc)
+
+    def test_needs_rehash(self, backend):
+        hasher = PBKDF2Hasher(hashes.SHA256(), 1000, backend)
+        assert not hasher.needs_rehash(hasher.hash(b"password"))
+        assert hasher.needs_rehash(
+            PBKDF2Hasher(hashes.SHA256(), 2000, backend).hash(b"password")
+        )
+        assert hasher.needs_rehash(
+            PBKDF2Hasher(hashes.SHA512(), 1000, backend).hash(b"password")
+        )
+        assert hasher.needs_rehash(PBKDF2_PHC)
+
+    def test_tune(self, backend):
+        hasher = PBKDF2Hasher.tune(hashes.SHA256(), 0.001, backend)
+        assert hasher.iterations >= 1
+        assert isinstance(hasher.algorithm, hashes.SHA256)
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            PBKDF2Hasher(object(), 1000, backend)
+        with pytest.raises(ValueError):
+            PBKDF2Hasher(hashes.MD5(), 1000, backend)
+        with pytest.raises(TypeError):
+            PBKDF2Hasher(hashes.SHA256(), 1000.0, backend)
+        with pytest.raises(ValueError):
+            PBKDF2Hasher(hashes.SHA256(), 0, backend)
+
+
+@pytest.mark.requires_backend_interface(interface=PBKDF2HMACBackend)
+@pytest.mark.requires_backend_interface(interface=ScryptBackend)
+class TestVerifyMany(object):
+    @pytest.mark.parametrize("max_workers", [None, 1, 3])
+    def test_verify_many(self, backend, max_workers):
+        pbkdf2 = PBKDF2Hasher(hashes.SHA256(), 1000, backend)
+        phc = pbkdf2.hash(b"other")
+        pairs = [
+            (b"password", SCRYPT_PHC), (b"wrong", SCRYPT_PHC),
+            (b"password", PBKDF2_PHC), (b"wrong", PBKDF2_PHC),
+            (b"other", phc),
+        ]
+        assert passwords.verify_many(
+            pairs, backend, max_workers=max_workers
+        ) == [True, False, True, False, True]
+
+    def test_empty(self, backend):
+        assert passwords.verify_many([], backend) == []
+
+    def test_invalid_arguments(self, backend):
+        with pytest.raises(TypeError):
+            passwords.verify_many([], backend, max_workers="2")
+        with pytest.raises(ValueError):
+            passwords.verify_many([], backend, max_workers=0)
+        with pytest.raises(ValueError):
+            passwords.verify_many(
+                [(b"password", PBKDF2_PHC), (b"password", u"$md5$x")],
+                backend
+            )
+
+
+@pytest.mark.parametrize("phc", [
+    u"",
+    u"password",
+    u"$scrypt$ln=10,r=8$c2FsdA$aGFzaA",
+    u"$scrypt$ln=10,r=8,p=1,x=1$c2FsdA$aGFzaA",
+    u"$scrypt$ln=10,r=8,r=8$c2FsdA$aGFzaA",
+    u"$scrypt$ln=0,r=8,p=1$c2FsdA$aGFzaA",
+    u"$scrypt$ln=64,r=8,p=1$c2FsdA$aGFzaA",
+    u"$scrypt$ln=a,r=8,p=1$c2FsdA$aGFzaA",
+    u"$scrypt$ln=10,r=8,p=1$c2FsdA$a",
+    u"$scrypt$ln=10,r=8,p=1$c2Fsd=$aGFzaA",
+    u"$pbkdf2-sha256$i=1000,l=32$c2FsdA$aGFzaA",
+    u"$pbkdf2-md5$i=1000$c2FsdA$aGFzaA",
+    u"$argon2id$v=19$c2FsdA$aGFzaA",
+])
+def test_invalid_phc(backend, phc):
+    with pytest.raises(ValueError):
+        passwords.verify(b"password", phc, backend)
+
+
+def test_phc_type(backend):
+    with pytest.raises(TypeError):
+        passwords.verify(b"password", None, backend)
@@ -62,6 +62,21 @@ class TestPBKDF2HMAC(object):
         data = bytearray(b"data")
         assert kdf.derive(data) == b"\xe9n\xaa\x81\xbbt\xa4\xf6\x08\xce"
 
+    def test_derive_with(self, backend):
+        kdf = PBKDF2HMAC(hashes.SHA1(), 10, b"salt", 10, backend)
+        key = b"\xe9n\xaa\x81\xbbt\xa4\xf6\x08\xce"
+        assert kdf.derive_with(b"data") == key
+        assert kdf.derive_with(bytearray(b"data")) == key
+        assert kdf.derive_with(b"data", salt=b"other") == PBKDF2HMAC(
+            hashes.SHA1(), 10, b"other", 10, backend
+        ).derive(b"data")
+        assert kdf.derive(b"data") == key
+        assert kdf.derive_with(b"data") == key
+        with pytest.raises(TypeError):
+            kdf.derive_with(b"data", salt=u"other")
+        with pytest.raises(TypeError):
+            kdf.derive_with(u"data")
+
 
 def test_invalid_backend():
     pretend_backend = object()
@@ -8,6 +8,7 @@ import binascii
 import itertools
 import math
 import os
+import threading
 
 import pytest
 
@@ -1115,6 +1116,277 @@ class TestRSAVerification(object):
             public_key.verify(b"\x00" * 64, data, pkcs, prehashed_alg)
 
 
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+class TestRSAPreparedSignerVerifier(object):
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PKCS1v15()
+        ),
+        skip_message="Does not support PKCS1v1.5."
+    )
+    def test_pkcs1v15(self, backend):
+        private_key = RSA_KEY_2048.private_key(backend)
+        public_key = private_key.public_key()
+        pkcs = padding.PKCS1v15()
+        signer = private_key.prepare_signer(pkcs, hashes.SHA256())
+        verifier = public_key.prepare_verifier(pkcs, hashes.SHA256())
+        assert isinstance(signer, rsa.RSAPreparedSigner)
+        assert isinstance(verifier, rsa.RSAPreparedVerifier)
+        for message in [b"", b"one little message", bytearray(b"another")]:
+            signature = signer.sign(message)
+            assert signature == private_key.sign(
+                message, pkcs, hashes.SHA256()
+            )
+            verifier.verify(signature, message)
+            with pytest.raises(InvalidSignature):
+                verifier.verify(signature, b"wrong message")
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA1()),
+                salt_length=padding.PSS.MAX_LENGTH
+            )
+        ),
+        skip_message="Does not support PSS."
+    )
+    def test_pss(self, backend):
+        private_key = RSA_KEY_2048.private_key(backend)
+        public_key = private_key.public_key()
+        pss = padding.PSS(
+            mgf=padding.MGF1(hashes.SHA1()),
+            salt_length=padding.PSS.MAX_LENGTH
+        )
+        signer = private_key.prepare_signer(pss, hashes.SHA256())
+        verifier = public_key.prepare_verifier(pss, hashes.SHA256())
+        message = b"one little message"
+        signature = signer.sign(message)
+        # PSS signatures are randomized, so the template context must not
+        # be reused.
+        assert signer.sign(message) != signature
+        verifier.verify(signature, message)
+        public_key.verify(signature, message, pss, hashes.SHA256())
+        verifier.verify(
+            private_key.sign(message, pss, hashes.SHA256()), message
+        )
+        with pytest.raises(InvalidSignature):
+            verifier.verify(signature, b"wrong message")
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PKCS1v15()
+        ),
+        skip_message="Does not support PKCS1v1.5."
+    )
+    def test_wrong_key(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        public_key = RSA_KEY_512_ALT.private_key(backend).public_key()
+        pkcs = padding.PKCS1v15()
+        signature = private_key.prepare_signer(pkcs, hashes.SHA1()).sign(
+            b"message"
+        )
+        verifier = public_key.prepare_verifier(pkcs, hashes.SHA1())
+        with pytest.raises(InvalidSignature):
+            verifier.verify(signature, b"message")
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PKCS1v15()
+        ),
+        skip_message="Does not support PKCS1v1.5."
+    )
+    def test_prehashed(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        public_key = private_key.public_key()
+        pkcs = padding.PKCS1v15()
+        prehashed_alg = asym_utils.Prehashed(hashes.SHA1())
+        digest = hashes.digest(hashes.SHA1(), b"message", backend)
+        signature = private_key.prepare_signer(pkcs, prehashed_alg).sign(
+            digest
+        )
+        public_key.verify(signature, b"message", pkcs, hashes.SHA1())
+        verifier = public_key.prepare_verifier(pkcs, prehashed_alg)
+        verifier.verify(signature, digest)
+        with pytest.raises(ValueError):
+            verifier.verify(signature, b"message")
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA1()),
+                salt_length=padding.PSS.MAX_LENGTH
+            )
+        ),
+        skip_message="Does not support PSS."
+    )
+    @pytest.mark.parametrize("max_workers", [1, 2, None])
+    def test_verify_batch(self, backend, max_workers):
+        private_key = RSA_KEY_2048.private_key(backend)
+        public_key = private_key.public_key()
+        pss = padding.PSS(
+            mgf=padding.MGF1(hashes.SHA1()),
+            salt_length=padding.PSS.MAX_LENGTH
+        )
+        messages = [os.urandom(16) for _ in range(5)]
+        items = [
+            (private_key.sign(message, pss, hashes.SHA256()), message)
+            for message in messages
+        ]
+        items.append((items[0][0], b"wrong message"))
+        items.append((b"\x00" * 256, b"message"))
+        items.append((b"\x00" * 3, b"message"))
+        expected = [True] * 5 + [False] * 3
+        assert public_key.verify_batch(
+            items, pss, hashes.SHA256(), max_workers=max_workers
+        ) == expected
+        verifier = public_key.prepare_verifier(pss, hashes.SHA256())
+        assert verifier.verify_batch(items, max_workers) == expected
+        assert verifier.verify_batch([]) == []
+        assert backend._consume_errors() == []
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PKCS1v15()
+        ),
+        skip_message="Does not support PKCS1v1.5."
+    )
+    def test_verify_batch_prehashed(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        pkcs = padding.PKCS1v15()
+        signature = private_key.sign(b"message", pkcs, hashes.SHA1())
+        digest = hashes.digest(hashes.SHA1(), b"message", backend)
+        verifier = private_key.public_key().prepare_verifier(
+            pkcs, asym_utils.Prehashed(hashes.SHA1())
+        )
+        assert verifier.verify_batch(
+            [(signature, digest), (signature, b"\x00" * 20)]
+        ) == [True, False]
+        with pytest.raises(ValueError):
+            verifier.verify_batch([(signature, b"message")])
+
+    def test_unsupported_padding(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_PADDING):
+            private_key.prepare_signer(
+                DummyAsymmetricPadding(), hashes.SHA1()
+            )
+        with raises_unsupported_algorithm(_Reasons.UNSUPPORTED_PADDING):
+            private_key.public_key().prepare_verifier(
+                DummyAsymmetricPadding(), hashes.SHA1()
+            )
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA1()),
+                salt_length=padding.PSS.MAX_LENGTH
+            )
+        ),
+        skip_message="Does not support PSS."
+    )
+    def test_pss_salt_length_too_long(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        signer = private_key.prepare_signer(
+            padding.PSS(
+                mgf=padding.MGF1(hashes.SHA1()),
+                salt_length=1000000
+            ),
+            hashes.SHA1()
+        )
+        with pytest.raises(ValueError):
+            signer.sign(b"failure coming")
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PKCS1v15()
+        ),
+        skip_message="Does not support PKCS1v1.5."
+    )
+    def test_invalid_types(self, backend):
+        private_key = RSA_KEY_512.private_key(backend)
+        signer = private_key.prepare_signer(padding.PKCS1v15(), hashes.SHA1())
+        verifier = private_key.public_key().prepare_verifier(
+            padding.PKCS1v15(), hashes.SHA1()
+        )
+        signature = signer.sign(b"message")
+        with pytest.raises(TypeError):
+            signer.sign(u"message")
+        with pytest.raises(TypeError):
+            verifier.verify(signature, u"message")
+        with pytest.raises(TypeError):
+            verifier.verify(bytearray(signature), b"message")
+
+    @pytest.mark.supported(
+        only_if=lambda backend: backend.rsa_padding_supported(
+            padding.PKCS1v15()
+        ),
+        skip_message="Does not support PKCS1v1.5."
+    )
+    def test_default_implementation(self, backend):
+        # Keys that don't prepare signing and verification themselves get
+        # defaults that call sign and verify for every message.
+        class PrivateKey(rsa.RSAPrivateKey):
+            def __init__(self, key):
+                self._key = key
+
+            key_size = property(lambda self: self._key.key_size)
+
+            def signer(self, padding, algorithm):
+                return self._key.signer(padding, algorithm)
+
+            def decrypt(self, ciphertext, padding):
+                return self._key.decrypt(ciphertext, padding)
+
+            def public_key(self):
+                return PublicKey(self._key.public_key())
+
+            def sign(self, data, padding, algorithm):
+                return self._key.sign(data, padding, algorithm)
+
+        class PublicKey(rsa.RSAPublicKey):
+            def __init__(self, key):
+                self._key = key
+
+            key_size = property(lambda self: self._key.key_size)
+
+            def verifier(self, signature, padding, algorithm):
+                return self._key.verifier(signature, padding, algorithm)
+
+            def encrypt(self, plaintext, padding):
+                return self._key.encrypt(plaintext, padding)
+
+            def public_numbers(self):
+                return self._key.public_numbers()
+
+            def public_bytes(self, encoding, format):
+                return self._key.public_bytes(encoding, format)
+
+            def verify(self, signature, data, padding, algorithm):
+                self._key.verify(signature, data, padding, algorithm)
+
+        private_key = PrivateKey(RSA_KEY_512.private_key(backend))
+        pkcs = padding.PKCS1v15()
+        signer = private_key.prepare_signer(pkcs, hashes.SHA1())
+        verifier = private_key.public_key().prepare_verifier(
+            pkcs, hashes.SHA1()
+        )
+        assert isinstance(signer, rsa.RSAPreparedSigner)
+        assert isinstance(verifier, rsa.RSAPreparedVerifier)
+        signature = signer.sign(b"message")
+        assert signature == private_key.sign(b"message", pkcs, hashes.SHA1())
+        verifier.verify(signature, b"message")
+        with pytest.raises(InvalidSignature):
+            verifier.verify(signature, b"other message")
+        assert verifier.verify_batch(
+            [(signature, b"message"), (signature, b"other message")],
+            max_workers=2
+        ) == [True, False]
+        assert private_key.public_key().verify_batch(
+            [(signature, b"other message"), (signature, b"message")],
+            pkcs, hashes.SHA1()
+        ) == [False, True]
+
+
 @pytest.mark.requires_backend_interface(interface=RSABackend)
 class TestRSAPSSMGF1Verification(object):
     test_rsa_pss_mgf1_sha1 = pytest.mark.supported(
@@ -1397,6 +1669,36 @@ class TestOAEP(object):
             )
 
 
+@pytest.mark.requires_backend_interface(interface=RSABackend)
+@pytest.mark.supported(
+    only_if=lambda backend: backend.rsa_padding_supported(padding.PKCS1v15()),
+    skip_message="Does not support PKCS1v1.5."
+)
+def test_private_key_shared_between_threads(backend):
+    # The GIL is released during the RSA operations, so the threads really
+    # do use the key (and its blinding state) at the same time.
+    private_key = RSA_KEY_2048.private_key(backend)
+    public_key = private_key.public_key()
+    pkcs = padding.PKCS1v15()
+    results = []
+
+    def work():
+        for _ in range(10):
+            message = os.urandom(16)
+            signature = private_key.sign(message, pkcs, hashes.SHA256())
+            public_key.verify(signature, message, pkcs, hashes.SHA256())
+            ciphertext = public_key.encrypt(message, pkcs)
+            assert private_key.decrypt(ciphertext, pkcs) == message
+        results.append(True)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == [True] * 4
+
+
 @pytest.mark.requires_backend_interface(interface=RSABackend)
 class TestRSADecryption(object):
     @pytest.mark.supported(
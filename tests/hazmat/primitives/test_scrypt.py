@@ -165,6 +165,18 @@ class TestScrypt(object):
         with pytest.raises(AlreadyFinalized):
             scrypt.derive(password)
 
+    def test_derive_with(self, backend):
+        scrypt = Scrypt(b"NaCl", 64, 1024, 8, 16, backend)
+        key = scrypt.derive_with(b"password")
+        assert scrypt.derive_with(bytearray(b"password")) == key
+        assert scrypt.derive_with(b"password", salt=b"salt") == Scrypt(
+            b"salt", 64, 1024, 8, 16, backend
+        ).derive(b"password")
+        assert scrypt.derive(b"password") == key
+        assert scrypt.derive_with(b"password") == key
+        with pytest.raises(TypeError):
+            scrypt.derive_with(b"password", salt=u"salt")
+
     def test_invalid_n(self, backend):
         # n is less than 2
         with pytest.raises(ValueError):
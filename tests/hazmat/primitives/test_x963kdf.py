@@ -5,6 +5,7 @@
 from __future__ import absolute_import, division, print_function
 
 import binascii
+import struct
 
 import pytest
 
@@ -45,6 +46,14 @@ class TestX963KDF(object):
 
         assert xkdf.derive(key) == derivedkey
 
+    def test_backend_without_counter_digest(self, backend, monkeypatch):
+        # Hash contexts without the batch helper are copied for each block.
+        args = (hashes.SHA256(), 100, b"info", backend)
+        expected = X963KDF(*args).derive(b"key")
+        ctx = backend.create_hash_ctx(hashes.SHA256())
+        monkeypatch.delattr(type(ctx), "_counter_digest", raising=False)
+        assert X963KDF(*args).derive(b"key") == expected
+
     def test_buffer_protocol(self, backend):
         key = bytearray(binascii.unhexlify(
             b"96c05619d56c328ab95fe84b18264b08725b85e33fd34f08"
@@ -56,6 +65,24 @@ class TestX963KDF(object):
 
         assert xkdf.derive(key) == derivedkey
 
+    def test_derive_with(self, backend):
+        key = binascii.unhexlify(
+            b"96c05619d56c328ab95fe84b18264b08725b85e33fd34f08"
+        )
+
+        derivedkey = binascii.unhexlify(b"443024c3dae66b95e6f5670601558f71")
+
+        xkdf = X963KDF(hashes.SHA256(), 16, None, backend)
+
+        assert xkdf.derive_with(key) == derivedkey
+        assert xkdf.derive_with(key, b"info") == X963KDF(
+            hashes.SHA256(), 16, b"info", backend
+        ).derive(key)
+        assert xkdf.derive(key) == derivedkey
+        assert xkdf.derive_with(key) == derivedkey
+        with pytest.raises(TypeError):
+            xkdf.derive_with(key, u"info")
+
     def test_verify(self, backend):
         key = binascii.unhexlify(
             b"22518b10e70f2a3f243810ae3254139efbee04aa57c7af7d"
@@ -123,6 +150,21 @@ class TestX963KDF(object):
 
             xkdf.verify(b"foo", u"bar")
 
+    @pytest.mark.parametrize("sharedinfo", [None, b"sharedinfo"])
+    @pytest.mark.parametrize("length", [0, 1, 32, 33, 100])
+    def test_derive_multiple_blocks(self, backend, sharedinfo, length):
+        # Long enough to span more than one SHA-256 block.
+        key = b"\x01" * 100
+        expected = b""
+        for counter in range(1, 5):
+            h = hashes.Hash(hashes.SHA256(), backend)
+            h.update(key + struct.pack(">I", counter) + (sharedinfo or b""))
+            expected += h.finalize()
+
+        xkdf = X963KDF(hashes.SHA256(), length, sharedinfo, backend)
+
+        assert xkdf.derive(key) == expected[:length]
+
 
 def test_invalid_backend():
     pretend_backend = object()
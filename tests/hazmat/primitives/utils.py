@@ -166,6 +166,14 @@ def hash_test(backend, algorithm, params):
     m.update(binascii.unhexlify(msg))
     expected_md = md.replace(" ", "").lower().encode("ascii")
     assert m.finalize() == binascii.unhexlify(expected_md)
+    assert hashes.digest(
+        algorithm, binascii.unhexlify(msg), backend
+    ) == binascii.unhexlify(expected_md)
+    assert hashes.digest_many(
+        algorithm, [b"", binascii.unhexlify(msg)], backend
+    ) == hashes.digest(algorithm, b"", backend) + binascii.unhexlify(
+        expected_md
+    )
 
 
 def generate_base_hash_test(algorithm, digest_size):
@@ -216,6 +224,10 @@ def hmac_test(backend, algorithm, params):
     h = hmac.HMAC(binascii.unhexlify(key), algorithm, backend=backend)
     h.update(binascii.unhexlify(msg))
     assert h.finalize() == binascii.unhexlify(md.encode("ascii"))
+    assert hmac.digest_many(
+        binascii.unhexlify(key), algorithm, [binascii.unhexlify(msg)] * 2,
+        backend
+    ) == binascii.unhexlify(md.encode("ascii")) * 2
 
 
 def generate_pbkdf2_test(param_loader, path, file_names, algorithm):
@@ -63,3 +63,27 @@ class TestCachedProperty(object):
 def test_bit_length():
     assert utils.bit_length(1) == 1
     assert utils.bit_length(11) == 4
+
+
+class TestThreadMap(object):
+    def test_check_max_workers(self):
+        assert utils._check_max_workers(None) >= 1
+        assert utils._check_max_workers(3) == 3
+        with pytest.raises(TypeError):
+            utils._check_max_workers("2")
+        with pytest.raises(ValueError):
+            utils._check_max_workers(0)
+
+    @pytest.mark.parametrize("max_workers", [1, 2, 8])
+    def test_preserves_order(self, max_workers):
+        assert utils._thread_map(
+            lambda x: x * 2, list(range(20)), max_workers
+        ) == [x * 2 for x in range(20)]
+        assert utils._thread_map(lambda x: x, [], max_workers) == []
+
+    def test_raises(self):
+        def fail(x):
+            raise ValueError(x)
+
+        with pytest.raises(ValueError):
+            utils._thread_map(fail, [1, 2, 3], 2)
@@ -7,16 +7,20 @@ from __future__ import absolute_import, division, print_function
 import base64
 import calendar
 import datetime
+import io
 import json
 import os
 import time
 
 import iso8601
 
+import pretend
+
 import pytest
 
 import six
 
+from cryptography.exceptions import AlreadyFinalized
 from cryptography.fernet import Fernet, InvalidToken, MultiFernet
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.backends.interfaces import CipherBackend, HMACBackend
@@ -63,6 +67,22 @@ class TestFernet(object):
         )
         assert actual_token == token.encode("ascii")
 
+    @json_parametrize(
+        ("secret", "now", "iv", "src", "token"), "generate.json",
+    )
+    def test_generate_streaming(self, secret, now, iv, src, token, backend):
+        f = Fernet(secret.encode("ascii"), backend=backend)
+        encryptor = f._encryptor_from_parts(
+            calendar.timegm(iso8601.parse_date(now).utctimetuple()),
+            b"".join(map(six.int2byte, iv))
+        )
+        src = src.encode("ascii")
+        actual_token = b"".join(
+            encryptor.update(src[i:i + 5]) for i in range(0, len(src), 5)
+        )
+        actual_token += encryptor.finalize()
+        assert actual_token == token.encode("ascii")
+
     @json_parametrize(
         ("secret", "now", "src", "ttl_sec", "token"), "verify.json",
     )
@@ -82,6 +102,31 @@ class TestFernet(object):
         with pytest.raises(InvalidToken):
             f.decrypt(token.encode("ascii"), ttl=ttl_sec)
 
+    @json_parametrize(
+        ("secret", "now", "src", "ttl_sec", "token"), "verify.json",
+    )
+    def test_verify_file(self, secret, now, src, ttl_sec, token, backend,
+                         monkeypatch):
+        f = Fernet(secret.encode("ascii"), backend=backend)
+        current_time = calendar.timegm(iso8601.parse_date(now).utctimetuple())
+        monkeypatch.setattr(time, "time", lambda: current_time)
+        dst = io.BytesIO()
+        f.decrypt_file(io.BytesIO(token.encode("ascii")), dst, ttl=ttl_sec)
+        assert dst.getvalue() == src.encode("ascii")
+
+    @json_parametrize(("secret", "token", "now", "ttl_sec"), "invalid.json")
+    def test_invalid_file(self, secret, token, now, ttl_sec, backend,
+                          monkeypatch):
+        f = Fernet(secret.encode("ascii"), backend=backend)
+        current_time = calendar.timegm(iso8601.parse_date(now).utctimetuple())
+        monkeypatch.setattr(time, "time", lambda: current_time)
+        dst = io.BytesIO()
+        with pytest.raises(InvalidToken):
+            f.decrypt_file(
+                io.BytesIO(token.encode("ascii")), dst, ttl=ttl_sec
+            )
+        assert dst.getvalue() == b""
+
     def test_invalid_start_byte(self, backend):
         f = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
         with pytest.raises(InvalidToken):
@@ -118,6 +163,120 @@ class TestFernet(object):
         f = Fernet(Fernet.generate_key(), backend=backend)
         assert f.decrypt(f.encrypt(message)) == message
 
+    @pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 1000, 70000])
+    @pytest.mark.parametrize("chunk_size", [1, 7, 16, 4096])
+    def test_file_roundtrips(self, size, chunk_size, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        message = os.urandom(size)
+        token = io.BytesIO()
+        f.encrypt_file(io.BytesIO(message), token, chunk_size=chunk_size)
+        assert f.decrypt(token.getvalue()) == message
+
+        token.seek(0)
+        dst = io.BytesIO()
+        f.decrypt_file(token, dst, chunk_size=chunk_size)
+        assert dst.getvalue() == message
+
+    def test_decrypt_file_tampered(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        data = bytearray(base64.urlsafe_b64decode(f.encrypt(b"\x00" * 100)))
+        data[40] ^= 1
+        dst = io.BytesIO()
+        with pytest.raises(InvalidToken):
+            f.decrypt_file(
+                io.BytesIO(base64.urlsafe_b64encode(bytes(data))), dst
+            )
+        assert dst.getvalue() == b""
+
+    def test_decrypt_file_reads_once(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        message = os.urandom(100000)
+        token = f.encrypt(message)
+
+        class UnseekableFile(io.BytesIO):
+            def seekable(self):
+                return False
+
+            def seek(self, *args):
+                raise io.UnsupportedOperation("seek")
+
+            def tell(self):
+                raise io.UnsupportedOperation("tell")
+
+        dst = io.BytesIO()
+        f.decrypt_file(UnseekableFile(token), dst, chunk_size=1024)
+        assert dst.getvalue() == message
+
+    def test_decrypt_file_truncated(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        token = f.encrypt(b"abc")
+        with pytest.raises(InvalidToken):
+            f.decrypt_file(io.BytesIO(token[:-4]), io.BytesIO())
+        with pytest.raises(InvalidToken):
+            f.decrypt_file(io.BytesIO(token[:-1]), io.BytesIO())
+        with pytest.raises(InvalidToken):
+            f.decrypt_file(io.BytesIO(b""), io.BytesIO())
+
+    def test_encryptor_already_finalized(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        encryptor = f.encryptor()
+        encryptor.update(b"abc")
+        encryptor.finalize()
+        with pytest.raises(AlreadyFinalized):
+            encryptor.update(b"abc")
+        with pytest.raises(AlreadyFinalized):
+            encryptor.finalize()
+
+    def test_encryptor_unicode(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        with pytest.raises(TypeError):
+            f.encryptor().update(u"abc")
+        with pytest.raises(TypeError):
+            f.decrypt_file(io.StringIO(u"abc"), io.BytesIO())
+
+    def test_encrypt_many(self, backend, monkeypatch):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        current_time = 1526138327
+        monkeypatch.setattr(time, "time", lambda: current_time)
+        messages = [b"", b"abc", b"\x00" * 100]
+        tokens = f.encrypt_many(iter(messages))
+        assert len(tokens) == 3
+        assert len(set(tokens)) == 3
+        for message, token in zip(messages, tokens):
+            assert f.decrypt(token) == message
+            assert f.extract_timestamp(token) == current_time
+
+        assert f.encrypt_many([]) == []
+        with pytest.raises(TypeError):
+            f.encrypt_many([b"abc", u"abc"])
+
+    def test_decrypt_many(self, backend):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        other = Fernet(Fernet.generate_key(), backend=backend)
+        tokens = [
+            f.encrypt(b"abc"), other.encrypt(b"abc"), b"\x00", f.encrypt(b"")
+        ]
+        results = f.decrypt_many(tokens)
+        assert results[0] == b"abc"
+        assert isinstance(results[1], InvalidToken)
+        assert isinstance(results[2], InvalidToken)
+        assert results[3] == b""
+
+        assert f.decrypt_many([]) == []
+        with pytest.raises(TypeError):
+            f.decrypt_many([u"abc"])
+
+    def test_decrypt_many_ttl(self, backend, monkeypatch):
+        f = Fernet(Fernet.generate_key(), backend=backend)
+        monkeypatch.setattr(time, "time", lambda: 1000)
+        old = f.encrypt(b"old")
+        monkeypatch.setattr(time, "time", lambda: 2000)
+        new = f.encrypt(b"new")
+        results = f.decrypt_many([old, new], ttl=500)
+        assert isinstance(results[0], InvalidToken)
+        assert results[1] == b"new"
+        assert f.decrypt_many([old, new]) == [b"old", b"new"]
+
     def test_bad_key(self, backend):
         with pytest.raises(ValueError):
             Fernet(base64.urlsafe_b64encode(b"abc"), backend=backend)
@@ -159,6 +318,58 @@ class TestMultiFernet(object):
         with pytest.raises(InvalidToken):
             f.decrypt(b"\x00" * 16)
 
+    def test_encrypt_many(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f = MultiFernet([f1, f2])
+
+        tokens = f.encrypt_many([b"abc", b"def"])
+        assert [f1.decrypt(t) for t in tokens] == [b"abc", b"def"]
+
+    def test_decrypt_many(self, backend):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f3 = Fernet(base64.urlsafe_b64encode(b"\x02" * 32), backend=backend)
+        f = MultiFernet([f1, f2])
+
+        results = f.decrypt_many([
+            f1.encrypt(b"abc"), f2.encrypt(b"def"), f3.encrypt(b"ghi"),
+            b"\x00" * 16
+        ])
+        assert results[:2] == [b"abc", b"def"]
+        assert isinstance(results[2], InvalidToken)
+        assert isinstance(results[3], InvalidToken)
+
+    def test_decrypt_tries_last_used_key_first(self, backend, monkeypatch):
+        fernets = [
+            Fernet(base64.urlsafe_b64encode(six.int2byte(i) * 32), backend)
+            for i in range(5)
+        ]
+        f = MultiFernet(fernets)
+        token = fernets[3].encrypt(b"abc")
+        assert f.decrypt(token) == b"abc"
+        assert f._last_index == 3
+
+        for fernet in fernets:
+            monkeypatch.setattr(
+                fernet, "_verify_signature",
+                pretend.call_recorder(fernet._verify_signature)
+            )
+
+        def verify_counts():
+            return [len(fernet._verify_signature.calls) for fernet in fernets]
+
+        assert f.decrypt(fernets[3].encrypt(b"def")) == b"def"
+        assert verify_counts() == [0, 0, 0, 1, 0]
+
+        assert f.decrypt(fernets[1].encrypt(b"ghi")) == b"ghi"
+        assert verify_counts() == [1, 1, 0, 2, 0]
+        assert f._last_index == 1
+
+        with pytest.raises(InvalidToken):
+            f.decrypt(fernets[1].encrypt(b"ghi"), ttl=-100)
+        assert verify_counts() == [1, 1, 0, 2, 0]
+
     def test_no_fernets(self, backend):
         with pytest.raises(ValueError):
             MultiFernet([])
@@ -209,6 +420,23 @@ class TestMultiFernet(object):
         assert later_time != rotated_time
         assert original_time == rotated_time
 
+    def test_rotate_many(self, backend, monkeypatch):
+        f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
+        f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)
+        f3 = Fernet(base64.urlsafe_b64encode(b"\x02" * 32), backend=backend)
+        mf = MultiFernet([f3, f2, f1])
+
+        monkeypatch.setattr(time, "time", lambda: 1000)
+        tokens = [f1.encrypt(b"abc"), f2.encrypt(b"def"), b"\x00" * 16]
+        monkeypatch.setattr(time, "time", lambda: 2000)
+        rotated = mf.rotate_many(tokens)
+
+        assert f3.decrypt(rotated[0]) == b"abc"
+        assert f3.decrypt(rotated[1]) == b"def"
+        assert f3.extract_timestamp(rotated[0]) == 1000
+        assert isinstance(rotated[2], InvalidToken)
+        assert rotated[0] != rotated[1]
+
     def test_rotate_decrypt_no_shared_keys(self, backend):
         f1 = Fernet(base64.urlsafe_b64encode(b"\x00" * 32), backend=backend)
         f2 = Fernet(base64.urlsafe_b64encode(b"\x01" * 32), backend=backend)